@@ -0,0 +1,43 @@
+"""
+Benchmarks the pipelined CSV export against computing and writing every chunk one
+after the other, and checks that both files hold the same rows.
+
+    python -m benchmarks.bench_export --loans 100000 --months 360
+"""
+from debt_repayment.storage.export import export_schedules
+from debt_repayment.tools.payments_utils import calculate_payments
+import argparse
+import tempfile
+import numpy as np
+
+
+def main(n_loans, n_months, engine, n_workers, seed):
+    rng = np.random.default_rng(seed)
+    balances = np.round(rng.uniform(1_000, 500_000, n_loans), 2)
+    rates = np.round(rng.uniform(1, 12, n_loans), 3)
+    payments = calculate_payments(balances, rates, n_months)
+
+    with tempfile.TemporaryDirectory() as folder:
+        sequential = export_schedules("sequential", balances, rates, payments, engine=engine,
+                                      n_workers=0, root=folder)
+        pipelined = export_schedules("pipelined", balances, rates, payments, engine=engine,
+                                     n_workers=n_workers, root=folder)
+
+        for label, stats in (("sequential", sequential), ("pipelined", pipelined)):
+            print(f"{label + ':':12} {stats.total_seconds:7.2f} s total, {stats.compute_seconds:7.2f} s computing, "
+                  f"{stats.write_seconds:7.2f} s writing, {stats.n_rows / stats.total_seconds:12,.0f} rows/s")
+
+        same = sequential.path.read_bytes() == pipelined.path.read_bytes()
+        print(f"identical files: {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=100_000)
+    parser.add_argument("--months", type=int, default=360)
+    parser.add_argument("--engine", default="cents_exact")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.loans, args.months, args.engine, args.workers, args.seed)
@@ -0,0 +1,57 @@
+"""
+Benchmarks payments and batch schedules computed from shared factor tables against the
+closed forms on a book with many loans and few distinct rates (0.125% steps), and
+checks that both give the same results.
+
+    python -m benchmarks.bench_factor_tables --loans 1000000 --rates 64 --months 360
+"""
+from debt_repayment.amortization_table.batch import amortize
+from debt_repayment.tools.factor_tables import get_factor_table
+from debt_repayment.tools.payments_utils import calculate_payments
+import argparse
+import time
+import numpy as np
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(n_loans, n_rates, n_months, n_schedules, seed):
+    rng = np.random.default_rng(seed)
+    rate_grid = 2 + 0.125 * np.arange(n_rates)
+    balances = np.round(rng.uniform(1_000, 500_000, n_loans), 2)
+    rates = rng.choice(rate_grid, n_loans)
+    terms = rng.choice([60, 120, 180, 240, n_months], n_loans)
+
+    factors, build_seconds = timed(get_factor_table, rates, n_months)
+    print(f"factor table:   {build_seconds * 1000:8.2f} ms to build {len(factors.rates)} rates x "
+          f"{factors.max_term + 1} periods ({factors.growth.nbytes / 2**20:.1f} MB)")
+
+    payments, closed_seconds = timed(calculate_payments, balances, rates, terms)
+    looked_up, table_seconds = timed(calculate_payments, balances, rates, terms, factors=factors)
+    print(f"payments:       {closed_seconds * 1000:8.2f} ms closed form, {table_seconds * 1000:8.2f} ms "
+          f"from the table ({closed_seconds / table_seconds:.1f}x), "
+          f"{np.count_nonzero(payments != looked_up)} of {n_loans} differ")
+
+    n_schedules = min(n_schedules, n_loans)
+    chunk = slice(0, n_schedules)
+    schedule, closed_seconds = timed(amortize, balances[chunk], rates[chunk], terms[chunk])
+    looked_up, table_seconds = timed(amortize, balances[chunk], rates[chunk], terms[chunk], factors=factors)
+    print(f"schedules:      {closed_seconds * 1000:8.2f} ms closed form, {table_seconds * 1000:8.2f} ms "
+          f"from the table ({closed_seconds / table_seconds:.1f}x) for {n_schedules} loans, "
+          f"largest balance difference {np.abs(schedule.balance - looked_up.balance).max():.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=1_000_000)
+    parser.add_argument("--rates", type=int, default=64, help="number of distinct rates, 0.125%% apart")
+    parser.add_argument("--months", type=int, default=360)
+    parser.add_argument("--schedules", type=int, default=50_000, help="number of loans amortized")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.loans, args.rates, args.months, args.schedules, args.seed)
@@ -0,0 +1,75 @@
+"""
+Benchmarks the cents-exact batch kernels against the AmortizationTable._payment_split loop
+and checks that they give the same principal, interest and balance to the cent.
+
+    python -m benchmarks.bench_kernels --loans 100000 --months 360
+"""
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.amortization_table.kernels import cents_exact_schedules, numba
+from debt_repayment.tools.payments_utils import calculate_payments
+import argparse
+import time
+import numpy as np
+
+
+def reference_split(balance, rate, payment):
+    """Runs the existing _payment_split loop without building or saving a table."""
+    table = AmortizationTable.__new__(AmortizationTable)
+    table.loan_balance = balance
+    table.interest_rate = rate
+    table.monthly_payments = payment
+    table.period_rate = rate / 1200
+    table.period_rates = None
+    table.num_months = 0
+    return table._payment_split()
+
+
+def main(n_loans, n_months, n_reference, seed):
+    rng = np.random.default_rng(seed)
+    balances = np.round(rng.uniform(1_000, 500_000, n_loans), 2)
+    rates = np.round(rng.uniform(1, 12, n_loans), 3)
+    payments = calculate_payments(balances, rates, n_months)
+
+    #The reference loop is timed on a subset and scaled to the whole batch:
+    n_reference = min(n_reference, n_loans)
+    start = time.perf_counter()
+    reference = [reference_split(*loan) for loan in zip(balances[:n_reference].tolist(),
+                                                         rates[:n_reference].tolist(),
+                                                         payments[:n_reference].tolist())]
+    reference_seconds = (time.perf_counter() - start) * n_loans / n_reference
+    print(f"reference loop:   {reference_seconds:8.2f} s (extrapolated from {n_reference} loans)")
+
+    kernels = [("numpy fallback", False)]
+    if numba is not None:
+        cents_exact_schedules(balances[:10], rates[:10], payments[:10], compiled=True)  # compile
+        kernels.append(("numba kernel", True))
+    else:
+        print("numba kernel:     skipped, numba is not installed")
+
+    for name, compiled in kernels:
+        start = time.perf_counter()
+        schedule = cents_exact_schedules(balances, rates, payments, compiled=compiled)
+        seconds = time.perf_counter() - start
+
+        mismatches = 0
+        for i, (principal, interest, loan) in enumerate(reference):
+            n = schedule.num_periods[i]
+            mismatches += (n != len(principal)
+                           or not np.array_equal(schedule.principal[i, :n], principal)
+                           or not np.array_equal(schedule.interest[i, :n], interest)
+                           or not np.array_equal(schedule.balance[i, :n], loan))
+
+        print(f"{name + ':':17} {seconds:8.2f} s ({reference_seconds / seconds:6.1f}x), "
+              f"{mismatches} of {n_reference} loans differ from the reference")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loans", type=int, default=100_000)
+    parser.add_argument("--months", type=int, default=360)
+    parser.add_argument("--reference-loans", type=int, default=5_000,
+                        help="number of loans run through the reference loop")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.loans, args.months, args.reference_loans, args.seed)
@@ -0,0 +1,63 @@
+"""
+Profiles the memory of a batch run: per-loan AmortizationTable generation, the batch
+engine on the same loans, and the budgeted loan-book cash flows. The report is written
+to MEMORY_REPORT_DIR; the tables are saved into a temporary folder.
+
+    python -m benchmarks.profile_memory --tables 200 --loans 200000 --budget-mb 256
+"""
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.amortization_table.batch import amortize
+from debt_repayment.analysis.portfolio import book_cash_flows
+from debt_repayment.tools.memory_profiler import MemoryProfiler
+from debt_repayment.tools.payments_utils import calculate_payments
+import argparse
+import os
+import tempfile
+import numpy as np
+
+
+def main(n_tables, n_loans, n_months, budget_mb, seed):
+    rng = np.random.default_rng(seed)
+    balances = np.round(rng.uniform(1_000, 500_000, n_loans), 2)
+    rates = np.round(rng.uniform(1, 12, n_loans), 3)
+    payments = calculate_payments(balances, rates, n_months)
+    starts = np.datetime64("2025-01-01") + rng.integers(0, 3650, n_loans).astype("timedelta64[D]")
+    budget = None if budget_mb is None else budget_mb * 2**20
+
+    report_dir = os.path.abspath(MemoryProfiler().report_dir)
+    with MemoryProfiler(enabled=True, report_dir=report_dir) as profiler, \
+         tempfile.TemporaryDirectory() as folder:
+        cwd = os.getcwd()
+        os.chdir(folder)
+        try:
+            with profiler.stage(f"{n_tables} AmortizationTables"):
+                tables = [AmortizationTable("Profile", balance, rate, n_months, payment)
+                          for balance, rate, payment in zip(balances[:n_tables].tolist(),
+                                                            rates[:n_tables].tolist(), payments[:n_tables].tolist())]
+
+            with profiler.stage(f"batch engine, {n_tables} loans"):
+                schedule = amortize(balances[:n_tables], rates[:n_tables], n_months)
+
+            with profiler.stage(f"book cash flows, {n_loans} loans, budget {budget_mb} MB"):
+                cash_flows = book_cash_flows(balances, rates, n_months, starts, memory_budget=budget)
+
+            del tables, schedule, cash_flows
+        finally:
+            #Leave the temporary folder before it is removed:
+            os.chdir(cwd)
+
+    print(f"report written to {profiler.report_path}")
+    for stage in profiler.stages:
+        print(f"{stage['name']:45} traced peak {stage['traced_peak'] / 2**20:9.2f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--loans", type=int, default=200_000)
+    parser.add_argument("--months", type=int, default=360)
+    parser.add_argument("--budget-mb", type=int, default=256, help="memory budget of the book run in MB")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args.tables, args.loans, args.months, args.budget_mb, args.seed)
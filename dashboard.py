@@ -1,7 +1,27 @@
 from debt_repayment.GUI import DebtAPP
 from debt_repayment.tools.logger_utils import my_log
-from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.amortization_table.engines import ENGINES, check_conformance, engine_table
+from debt_repayment.config import ENGINE, LATENCY_MONITOR
+import argparse
+import sys
 
 
 if __name__=="__main__":
-    DebtAPP(AmortizationTable)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Loan repayment calculator")
+    parser.add_argument("--engine", default=ENGINE, choices=["auto", *ENGINES],
+                        help="schedule engine, auto picks the fastest one at startup")
+    parser.add_argument("--monitor-latency", action="store_true", default=LATENCY_MONITOR,
+                        help="log event-loop lag and slow callbacks, with a summary on exit")
+    parser.add_argument("--check-engines", action="store_true",
+                        help="check that the engines give the same schedules as the reference and exit")
+    args = parser.parse_args()
+
+    if args.check_engines:
+        failed = False
+        for name, (mismatches, largest) in check_conformance().items():
+            failed |= mismatches > 0
+            status = "FAIL" if mismatches else "ok"
+            print(f"{name:12} {status:12} {mismatches} loans differ, largest balance difference ${largest:,.2f}")
+        sys.exit(1 if failed else 0)
+
+    DebtAPP(engine_table(args.engine), args.monitor_latency)
@@ -611,12 +611,19 @@
 #         self.principal_label.grid(row=4, column=2, sticky='nsew', padx=10, pady=10)
 
 
-from .config import TEXTSIZE
+from .config import TEXTSIZE, TABLE_ROWS, CHART_HEIGHT, LATENCY_MONITOR, HEARTBEAT_MS, SLOW_FRAME_MS
+from .amortization_table.batch import amortize
+from .amortization_table.history import ScenarioHistory
+from .analysis.constants import DISCOUNT_RATES, INFLATION_RATES
+from .analysis.present_value import cost_scenarios, table_cash_flows
+from .analysis.refinance import compare_refinance
 from .tools.payments_utils import calculate_payments, calculate_total_interest, calculate_total_paid
+from .tools.downsampling import min_max_indices
 from .tools.logger_utils import my_log
 import tkinter as tk
 import ttkbootstrap as ttk
 import numpy as np
+import time
 from dataclasses import dataclass
 
 
@@ -636,7 +643,7 @@ class LoanOutputs:
 
 
 class DebtAPP(tk.Tk):
-    def __init__(self, amortization_cls):
+    def __init__(self, amortization_cls, monitor_latency=LATENCY_MONITOR):
         super().__init__()
         self.title('Loan Repayment Calculator')
         self.geometry('1200x800')
@@ -661,10 +668,40 @@ class DebtAPP(tk.Tk):
         # Layout setup
         self.top_window = TopWindow(self, self.inputs)
         self.input_field = InputField(self.top_window, self.inputs, self.outputs)
-        self.payment_output = PaymentOutput(self.top_window, self.inputs, self.outputs, self.amortization_cls)
+        self.table_viewer = AmortizationViewer(self)
+        self.balance_chart = BalanceChart(self, self.inputs)
+        self.present_value_panel = PresentValuePanel(self)
+        self.refinance_panel = RefinancePanel(self, self.inputs)
+        self.scenario_panel = ScenarioPanel(self, self.inputs, self.outputs,
+                                            (self.table_viewer, self.balance_chart, self.present_value_panel))
+        self.payment_output = PaymentOutput(self.top_window, self.inputs, self.outputs, self.amortization_cls,
+                                            (self.table_viewer, self.balance_chart, self.present_value_panel,
+                                             self.refinance_panel, self.scenario_panel))
+
+        self.latency_monitor = LatencyMonitor(self) if monitor_latency else None
+        if self.latency_monitor:
+            self.instrument(self.latency_monitor)
 
         self.mainloop()
 
+        if self.latency_monitor:
+            self.latency_monitor.summary()
+
+    def instrument(self, monitor):
+        # Button commands are re-bound and scheduled callbacks are wrapped on the instance
+        self.input_field.payment_button.configure(
+            command=monitor.timed("calculate_all", self.input_field.calculate_all))
+        self.payment_output.amortization_button.configure(
+            command=monitor.timed("generate_amortization", self.payment_output.generate_amortization))
+        for name in ("apply", "undo", "redo"):
+            button = getattr(self.scenario_panel, f"{name}_button")
+            button.configure(command=monitor.timed(f"scenario {name}", getattr(self.scenario_panel, name)))
+        self.refinance_panel.compare_button.configure(
+            command=monitor.timed("refinance compare", self.refinance_panel.compare))
+        self.balance_chart.preview = monitor.timed("chart preview", self.balance_chart.preview)
+        self.balance_chart.redraw = monitor.timed("chart redraw", self.balance_chart.redraw)
+        self.table_viewer.refresh = monitor.timed("table refresh", self.table_viewer.refresh)
+
 
 class TopWindow(ttk.Frame):
     def __init__(self, parent, inputs: LoanInputs):
@@ -740,11 +777,13 @@ class InputField(ttk.Frame):
 
 
 class PaymentOutput(ttk.Frame):
-    def __init__(self, parent, inputs: LoanInputs, outputs: LoanOutputs, amortization_cls):
+    def __init__(self, parent, inputs: LoanInputs, outputs: LoanOutputs, amortization_cls, viewers=()):
         super().__init__(parent)
         self.inputs = inputs
         self.outputs = outputs
         self.amortization_cls = amortization_cls
+        self.viewers = viewers
+        self.a_table = None
 
         self.pack(side='left', expand=True, fill='both', pady=10)
         self.create_widgets()
@@ -794,7 +833,7 @@ class PaymentOutput(ttk.Frame):
         self.amortization_button.grid(row=3, columnspan=2, sticky='nsew', padx=10, pady=10)
 
     def generate_amortization(self):
-        a_table = self.amortization_cls(
+        self.a_table = self.amortization_cls(
             self.inputs.loan_type.get(),
             self.inputs.loan_balance.get(),
             self.inputs.interest_rate.get(),
@@ -803,6 +842,447 @@ class PaymentOutput(ttk.Frame):
         )
         my_log.info("Amortization table generated.")
 
+        for viewer in self.viewers:
+            viewer.show(self.a_table.amortization_df)
+
+
+class AmortizationViewer(ttk.Frame):
+    """
+    Displays an amortization table with virtual scrolling: the Treeview only holds
+    as many items as fit on screen, and scrolling rewrites their values from the
+    table arrays instead of creating one item per payment.
+    """
+    COLUMNS = ("Pmt #", "Due date", "Payment_amount", "Principal_paid", "Interest_paid", "Remaining_balance")
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.pack(side='bottom', expand=True, fill='both', padx=10, pady=10)
+
+        self.columns = {}
+        self.n_rows = 0
+        self.offset = 0
+        self.visible_rows = TABLE_ROWS
+        self.row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+
+        self.create_widgets()
+        self.create_layout()
+
+    def create_widgets(self):
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show='headings', height=self.visible_rows)
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column.replace('_', ' '))
+            self.tree.column(column, anchor='e', width=120)
+
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.on_scrollbar)
+
+        # The Treeview never scrolls by itself, every scroll moves the row offset instead
+        self.tree.bind('<MouseWheel>', lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-1))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(1))
+        self.tree.bind('<Configure>', self.on_resize)
+
+    def create_layout(self):
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', expand=True, fill='both')
+
+    def show(self, amortization_df):
+        self.columns = {column: amortization_df[column].to_numpy() for column in self.COLUMNS
+                        if column != "Due date"}
+        self.columns["Due date"] = np.datetime_as_string(
+            amortization_df["Due date"].dt.tz_localize(None).to_numpy(), unit='D'
+        )
+        self.n_rows = len(amortization_df)
+        self.offset = 0
+        self.refresh()
+
+    def scroll(self, rows):
+        self.offset = max(0, min(self.offset + rows, self.n_rows - self.visible_rows))
+        self.refresh()
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self.offset = 0
+            self.scroll(int(float(value) * self.n_rows))
+        elif unit == 'pages':
+            self.scroll(int(value) * self.visible_rows)
+        else:
+            self.scroll(int(value))
+
+    def on_resize(self, event):
+        # The heading takes about one row
+        visible_rows = max(1, event.height // self.row_height - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.scroll(0)
+
+    def refresh(self):
+        items = self.tree.get_children()
+        if len(items) > self.visible_rows:
+            self.tree.delete(*items[self.visible_rows:])
+        for _ in range(len(items), self.visible_rows):
+            self.tree.insert('', 'end', values=())
+        items = self.tree.get_children()
+
+        for i, item in enumerate(items):
+            row = self.offset + i
+            values = [self.columns[column][row] for column in self.COLUMNS] if row < self.n_rows else ()
+            self.tree.item(item, values=values)
+
+        if self.n_rows:
+            self.scrollbar.set(self.offset / self.n_rows, min(1, (self.offset + self.visible_rows) / self.n_rows))
+        else:
+            self.scrollbar.set(0, 1)
+
+
+
+class BalanceChart(ttk.Frame):
+    """
+    Plots the remaining balance, cumulative interest and principal share of a schedule.
+    Series are downsampled to the width of the canvas and each one is a single canvas
+    line whose coordinates are updated in place, so redraws stay well under a frame.
+    The chart previews the schedule while the loan inputs are being edited.
+    """
+    SERIES = {"balance": "#1f77b4", "interest": "#d62728", "principal_share": "#2ca02c"}
+    MARGIN = 40
+
+    def __init__(self, parent, inputs: LoanInputs):
+        super().__init__(parent)
+        self.pack(side='bottom', fill='x', padx=10)
+        self.inputs = inputs
+        self.series = {}
+        self.preview_pending = False
+
+        self.create_widgets()
+        self.create_layout()
+
+        for variable in (inputs.loan_balance, inputs.interest_rate, inputs.duration):
+            variable.trace_add('write', self.schedule_preview)
+
+    def create_widgets(self):
+        self.canvas = tk.Canvas(self, height=CHART_HEIGHT, background='white', highlightthickness=0)
+        self.lines = {name: self.canvas.create_line(0, 0, 0, 0, fill=color, width=2)
+                      for name, color in self.SERIES.items()}
+        self.max_label = self.canvas.create_text(5, 5, anchor='nw', font=f"Calibri {TEXTSIZE - 2}")
+        self.legend = self.canvas.create_text(
+            self.MARGIN, CHART_HEIGHT - 5, anchor='sw', font=f"Calibri {TEXTSIZE - 2}",
+            text="Blue: remaining balance   Red: cumulative interest   Green: principal share of payment"
+        )
+        self.canvas.bind('<Configure>', lambda event: self.redraw())
+
+    def create_layout(self):
+        self.canvas.pack(expand=True, fill='x')
+
+    def show(self, amortization_df):
+        self.set_series(amortization_df["Remaining_balance"].to_numpy(),
+                        amortization_df["Interest_paid"].to_numpy(),
+                        amortization_df["Principal_paid"].to_numpy())
+
+    def set_series(self, balance, interest, principal):
+        payment = principal + interest
+        self.series = {
+            "balance": balance,
+            "interest": np.cumsum(interest),
+            "principal_share": np.divide(principal, payment, out=np.zeros_like(payment), where=payment > 0)
+        }
+        self.redraw()
+
+    def schedule_preview(self, *args):
+        # Coalesce bursts of keystrokes into one preview once Tk is idle
+        if not self.preview_pending:
+            self.preview_pending = True
+            self.after_idle(self.preview)
+
+    def preview(self):
+        self.preview_pending = False
+        try:
+            balance = self.inputs.loan_balance.get()
+            rate = self.inputs.interest_rate.get()
+            duration = self.inputs.duration.get()
+        except tk.TclError:
+            return
+        if balance <= 0 or duration <= 0 or rate < 0:
+            return
+
+        schedule = amortize(balance, rate, duration)
+        _, principal, interest, remaining = schedule.loan(0)
+        self.set_series(remaining, interest, principal)
+
+    def redraw(self):
+        if not self.series:
+            return
+
+        width = max(self.canvas.winfo_width() - 2 * self.MARGIN, 1)
+        height = max(self.canvas.winfo_height() - 2 * self.MARGIN, 1)
+        n_points = len(self.series["balance"])
+        dollar_max = max(self.series["balance"].max(), self.series["interest"].max(), 1)
+
+        for name, values in self.series.items():
+            scale = 1 if name == "principal_share" else dollar_max
+            keep = min_max_indices(values, width)
+            x = self.MARGIN + keep * (width / max(n_points - 1, 1))
+            y = self.MARGIN + height * (1 - values[keep] / scale)
+            coords = np.column_stack([x, y]).ravel()
+            if len(coords) < 4:
+                coords = np.tile(coords, 2)
+            self.canvas.coords(self.lines[name], *coords.tolist())
+
+        self.canvas.itemconfigure(self.max_label, text=f"Max: ${dollar_max:,.2f}")
+
+
+class ScenarioPanel(ttk.Frame):
+    """
+    Layers lump sums and extra payments on the generated table, with undo and redo.
+    Every step is kept in a ScenarioHistory that stores only the part of the schedule
+    after the change, so stepping through the variants does not recompute anything.
+    """
+    def __init__(self, parent, inputs: LoanInputs, outputs: LoanOutputs, viewers=()):
+        super().__init__(parent)
+        self.pack(side='bottom', fill='x', padx=10)
+        self.inputs = inputs
+        self.outputs = outputs
+        self.viewers = viewers
+        self.history = None
+
+        self.lump_amount = tk.DoubleVar(value=0)
+        self.extra_amount = tk.DoubleVar(value=0)
+        self.start_month = tk.IntVar(value=1)
+        self.summary = tk.StringVar(value="Generate an amortization table to try scenarios.")
+
+        self.create_widgets()
+        self.create_layout()
+
+    def create_widgets(self):
+        self.lump_label = ttk.Label(self, text="Make single lump-sum payment of $", font=f"Calibri {TEXTSIZE}")
+        self.lump_entry = ttk.Entry(self, textvariable=self.lump_amount, width=10)
+
+        self.extra_label = ttk.Label(self, text="and pay an additional $", font=f"Calibri {TEXTSIZE}")
+        self.extra_entry = ttk.Entry(self, textvariable=self.extra_amount, width=10)
+
+        self.start_label = ttk.Label(self, text="per month from payment #", font=f"Calibri {TEXTSIZE}")
+        self.start_entry = ttk.Entry(self, textvariable=self.start_month, width=6)
+
+        self.apply_button = ttk.Button(self, text="Apply", command=self.apply, state='disabled')
+        self.undo_button = ttk.Button(self, text="Undo", command=self.undo, state='disabled')
+        self.redo_button = ttk.Button(self, text="Redo", command=self.redo, state='disabled')
+
+        self.summary_label = ttk.Label(self, textvariable=self.summary, font=f"Calibri {TEXTSIZE}")
+
+    def create_layout(self):
+        widgets = (self.lump_label, self.lump_entry, self.extra_label, self.extra_entry,
+                   self.start_label, self.start_entry, self.apply_button, self.undo_button, self.redo_button)
+        for column, widget in enumerate(widgets):
+            widget.grid(row=0, column=column, padx=5, pady=5)
+        self.summary_label.grid(row=1, column=0, columnspan=len(widgets), sticky='w', padx=5)
+
+    def show(self, amortization_df):
+        self.history = ScenarioHistory(
+            self.inputs.loan_balance.get(),
+            self.inputs.interest_rate.get(),
+            self.outputs.monthly_payment.get(),
+            amortization_df
+        )
+        self.apply_button.configure(state='normal')
+        self.update_summary()
+
+    def apply(self):
+        try:
+            self.history.apply(self.lump_amount.get(), self.extra_amount.get(), self.start_month.get())
+        except (ValueError, tk.TclError) as error:
+            self.summary.set(f"Could not apply scenario: {error}")
+            return
+        my_log.info("Scenario applied.")
+        self.display()
+
+    def undo(self):
+        self.history.undo()
+        self.display()
+
+    def redo(self):
+        self.history.redo()
+        self.display()
+
+    def display(self):
+        amortization_df = self.history.to_frame()
+        for viewer in self.viewers:
+            viewer.show(amortization_df)
+        self.update_summary()
+
+    def update_summary(self):
+        version = self.history.current
+        total_interest = self.history.total_interest()
+        saved = self.history.total_interest(self.history.base) - total_interest
+        self.summary.set(
+            f"Step {self.history.position} of {len(self.history.versions) - 1}, {version.label}: "
+            f"paid off in {version.num_periods} payments, total interest ${total_interest:,.2f}, "
+            f"saves ${saved:,.2f}"
+        )
+        self.undo_button.configure(state='normal' if self.history.can_undo else 'disabled')
+        self.redo_button.configure(state='normal' if self.history.can_redo else 'disabled')
+
+
+class PresentValuePanel(ttk.Frame):
+    """
+    Shows what the loan costs in today's dollars under a few discount and inflation
+    rates combined, next to the nominal total interest.
+    """
+    COLUMNS = ("Discount_rate", "Inflation_rate", "Combined_rate", "Present_value", "Cost")
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.pack(side='bottom', fill='x', padx=10)
+
+        self.create_widgets()
+        self.create_layout()
+
+    def create_widgets(self):
+        n_rows = len(DISCOUNT_RATES) * len(INFLATION_RATES)
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show='headings', height=n_rows)
+        headings = ("Discount %", "Inflation %", "Combined rate %", "Payments in today's $", "Cost in today's $")
+        for column, heading in zip(self.COLUMNS, headings):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, anchor='e', width=150)
+
+    def create_layout(self):
+        self.tree.pack(expand=True, fill='x')
+
+    def show(self, amortization_df):
+        # The balance comes from the table shown, not from the inputs, which may have changed since
+        paid, balance = table_cash_flows(amortization_df)
+
+        costs = cost_scenarios(paid, balance)
+        self.tree.delete(*self.tree.get_children())
+        for discount, inflation, combined, value, cost in costs.itertuples(index=False):
+            self.tree.insert('', 'end', values=(f"{discount:g}", f"{inflation:g}", f"{combined:.2f}",
+                                                f"{value:,.2f}", f"{cost:,.2f}"))
+
+
+class RefinancePanel(ttk.Frame):
+    """
+    Ranks refinance offers against keeping the generated loan. Offers are typed as
+    "rate term fee" triples separated by semicolons, e.g. "3.9 120 1500; 4.5 84 0".
+    """
+    COLUMNS = ("Offer", "Monthly_payment", "Break_even_month", "Lifetime_savings")
+
+    def __init__(self, parent, inputs: LoanInputs):
+        super().__init__(parent)
+        self.pack(side='bottom', fill='x', padx=10)
+        self.inputs = inputs
+        self.loan = None
+
+        self.offers = tk.StringVar()
+        self.roll_in_fees = tk.BooleanVar(value=False)
+        self.summary = tk.StringVar(value="Generate an amortization table to compare refinance offers.")
+
+        self.create_widgets()
+        self.create_layout()
+
+    def create_widgets(self):
+        self.offers_label = ttk.Label(self, text="Refinance offers (rate term fee; ...):",
+                                      font=f"Calibri {TEXTSIZE}")
+        self.offers_entry = ttk.Entry(self, textvariable=self.offers, width=40)
+        self.roll_in_check = ttk.Checkbutton(self, text="Roll fees into the loan", variable=self.roll_in_fees)
+        self.compare_button = ttk.Button(self, text="Compare", command=self.compare, state='disabled')
+        self.summary_label = ttk.Label(self, textvariable=self.summary, font=f"Calibri {TEXTSIZE}")
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show='headings', height=4)
+        headings = ("Offer", "Monthly payment $", "Break-even month", "Lifetime savings $")
+        for column, heading in zip(self.COLUMNS, headings):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, anchor='e', width=150)
+
+    def create_layout(self):
+        widgets = (self.offers_label, self.offers_entry, self.roll_in_check, self.compare_button)
+        for column, widget in enumerate(widgets):
+            widget.grid(row=0, column=column, padx=5, pady=5)
+        self.summary_label.grid(row=1, column=0, columnspan=len(widgets), sticky='w', padx=5)
+        self.tree.grid(row=2, column=0, columnspan=len(widgets), sticky='ew', padx=5)
+
+    def show(self, amortization_df):
+        # The current loan is the table shown, with the rate it was generated at
+        _, balance = table_cash_flows(amortization_df)
+        self.loan = (balance, self.inputs.interest_rate.get(), len(amortization_df))
+        self.compare_button.configure(state='normal')
+        self.summary.set(f"Current loan: ${balance:,.2f} at {self.loan[1]:g}% over {self.loan[2]} months.")
+
+    def compare(self):
+        try:
+            offers = [[float(value) for value in offer.split()] for offer in self.offers.get().split(";")
+                      if offer.strip()]
+            if not offers or any(len(offer) != 3 for offer in offers):
+                raise ValueError("enter every offer as rate, term in months and fee")
+            rates, terms, fees = np.array(offers).T
+            comparison = compare_refinance(*self.loan, rates, terms.astype(np.int64), fees, self.roll_in_fees.get())
+        except ValueError as error:
+            self.summary.set(f"Could not compare offers: {error}")
+            return
+
+        self.tree.delete(*self.tree.get_children())
+        for offer, payment, break_even, savings in comparison.ranking().itertuples(index=False):
+            rate, term, fee = offers[offer]
+            self.tree.insert('', 'end', values=(f"{rate:g}% / {term:g} mo / ${fee:,.0f}", f"{payment:,.2f}",
+                                                break_even if break_even > 0 else "never", f"{savings:,.2f}"))
+        my_log.info("Refinance offers compared.")
+
+
+class LatencyMonitor:
+    """
+    Measures how responsive the Tk event loop is. A heartbeat scheduled with after()
+    every HEARTBEAT_MS records how late it fires, and timed() wraps callbacks to record
+    how long they run. Late heartbeats are logged with the callbacks that ran since the
+    previous one, and summary() logs the distribution of both when the app closes.
+    """
+    def __init__(self, root, interval_ms=HEARTBEAT_MS, slow_ms=SLOW_FRAME_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.slow_ms = slow_ms
+        self.lags = []
+        self.slow_frames = []
+        self.durations = {}
+        self.recent_stages = []
+
+        self.expected = time.perf_counter() + interval_ms / 1000
+        self.root.after(interval_ms, self.heartbeat)
+
+    def heartbeat(self):
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self.expected) * 1000)
+        self.lags.append(lag_ms)
+        if lag_ms > self.slow_ms:
+            cause = ", ".join(self.recent_stages) or "untimed work"
+            self.slow_frames.append((lag_ms, cause))
+            my_log.warning(f"Event loop blocked for {lag_ms:.0f} ms by: {cause}")
+        self.recent_stages = []
+
+        self.expected = now + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self.heartbeat)
+
+    def timed(self, name, callback):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return callback(*args, **kwargs)
+            finally:
+                duration_ms = (time.perf_counter() - start) * 1000
+                self.durations.setdefault(name, []).append(duration_ms)
+                self.recent_stages.append(f"{name} ({duration_ms:.0f} ms)")
+                if duration_ms > self.slow_ms:
+                    my_log.warning(f"Slow callback {name}: {duration_ms:.0f} ms")
+        return wrapper
+
+    def summary(self):
+        lines = ["Event loop latency summary:"]
+        if self.lags:
+            p50, p95, p99 = np.percentile(self.lags, (50, 95, 99))
+            lines.append(f"  heartbeat lag over {len(self.lags)} beats: p50 {p50:.1f} ms, p95 {p95:.1f} ms, "
+                         f"p99 {p99:.1f} ms, max {max(self.lags):.1f} ms, {len(self.slow_frames)} slow frames")
+        for name, durations in sorted(self.durations.items(), key=lambda item: -max(item[1])):
+            lines.append(f"  {name}: {len(durations)} calls, mean {np.mean(durations):.1f} ms, "
+                         f"max {max(durations):.1f} ms")
+        for lag_ms, cause in sorted(self.slow_frames, reverse=True)[:5]:
+            lines.append(f"  worst frame {lag_ms:.0f} ms: {cause}")
+
+        my_log.info("\n".join(lines))
+        return lines
 
 
 # class MiddleWindow(ttk.Frame):
@@ -0,0 +1,138 @@
+from ..tools.constants import DEFAULT_FREQUENCY
+from ..tools.payments_utils import periodic_rate
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass
+class BatchSchedule:
+    """
+    Amortization schedules for a batch of loans. Every field is a 2-D array of shape
+    (n_loans, n_periods) except num_periods, which holds the number of payments of each
+    loan. Periods after a loan is paid off are zero.
+
+    Attributes:
+    ---------------------------------------------------
+        payment (np.ndarray): amount paid every period
+        principal (np.ndarray): part of the payment that goes towards principal
+        interest (np.ndarray): part of the payment that goes towards interest
+        balance (np.ndarray): remaining balance after the payment
+        num_periods (np.ndarray): number of payments of each loan
+
+    Methods:
+    ---------------------------------------------------
+        loan: returns the schedule of a single loan, trimmed to its number of payments
+    """
+    payment: np.ndarray
+    principal: np.ndarray
+    interest: np.ndarray
+    balance: np.ndarray
+    num_periods: np.ndarray
+
+    def loan(self, index):
+        """Returns the payment, principal, interest and balance arrays of one loan."""
+        n = int(self.num_periods[index])
+        return (self.payment[index, :n], self.principal[index, :n],
+                self.interest[index, :n], self.balance[index, :n])
+
+
+def _rate_matrix(rates, n_loans, n_periods):
+    """
+    Expands the annual interest rates into an (n_loans, n_periods) matrix. Scalars and
+    1-D arrays give one fixed rate per loan; 2-D arrays are per-period rate paths, and
+    paths shorter than the term keep their last rate.
+    """
+    rates = np.asarray(rates, dtype=float)
+    if rates.ndim < 2:
+        return np.broadcast_to(rates.reshape(-1, 1), (n_loans, n_periods))
+
+    rates = np.broadcast_to(rates, (n_loans, rates.shape[1]))
+    if rates.shape[1] >= n_periods:
+        return rates[:, :n_periods]
+
+    padding = np.repeat(rates[:, -1:], n_periods - rates.shape[1], axis=1)
+    return np.concatenate([rates, padding], axis=1)
+
+
+def _balance_fraction(rate, remaining, paid):
+    """
+    Fraction of the balance left after `paid` payments of a loan that is amortized
+    over `remaining` periods at the periodic `rate`.
+    """
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        growth_term = (1 + rate)**remaining
+        fraction = (growth_term - (1 + rate)**paid) / (growth_term - 1)
+    return np.where(rate == 0, (remaining - paid) / remaining, fraction)
+
+
+def amortize(balances, rates, num_periods, frequency=DEFAULT_FREQUENCY, factors=None):
+    """
+    Computes the amortization schedules of many loans at once. Whenever the rate of a
+    loan changes, the payment is re-amortized over the remaining term. Each constant-rate
+    segment is computed in closed form, so there is no loop over the payments.
+
+    Args:
+        balances (array_like): amount borrowed for each loan
+        rates (array_like): annual interest rate of each loan, either one rate per loan
+            or an (n_loans, n_periods) matrix of per-period rates
+        num_periods (array_like): number of payments of each loan
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+        factors (FactorTable): optional table of growth factors covering every rate,
+            used to look the powers up instead of computing them
+
+    Returns:
+        BatchSchedule: schedules of all the loans
+    """
+    if factors is not None and factors.frequency != frequency:
+        raise ValueError(f"The factor table is for {factors.frequency} payments, not {frequency}")
+
+    balances = np.asarray(balances, dtype=float).reshape(-1)
+    num_periods = np.broadcast_to(np.asarray(num_periods, dtype=np.int64), balances.shape)
+    n_loans = balances.size
+    n_max = int(num_periods.max())
+
+    rate = periodic_rate(_rate_matrix(rates, n_loans, n_max), frequency)
+    period = np.arange(n_max)
+    active = period < num_periods[:, None]
+
+    #A new segment starts on the first payment and every time the rate changes:
+    reset = np.ones((n_loans, n_max), dtype=bool)
+    reset[:, 1:] = rate[:, 1:] != rate[:, :-1]
+    segment_start = np.maximum.accumulate(np.where(reset, period, 0), axis=1)
+    remaining = np.maximum(num_periods[:, None] - segment_start, 1)
+    paid = np.minimum(period - segment_start + 1, remaining)
+
+    if factors is None:
+        fraction = _balance_fraction(rate, remaining, paid)
+    else:
+        #Fixed rates are looked up once per loan rather than once per period:
+        table_rates = np.asarray(rates, dtype=float)
+        if table_rates.ndim < 2:
+            table_rates = np.broadcast_to(table_rates.reshape(-1, 1), (n_loans, 1))
+        else:
+            table_rates = _rate_matrix(rates, n_loans, n_max)
+        fraction = factors.balance_fraction(table_rates, remaining, paid)
+    fraction = np.where(active, fraction, 0.0)
+
+    #Balance at the start of each segment is the product of the previous segment ends:
+    segment_end = np.ones((n_loans, n_max), dtype=bool)
+    segment_end[:, :-1] = reset[:, 1:]
+    carried = np.where(segment_end, fraction, 1.0)
+    start_factor = np.ones((n_loans, n_max))
+    start_factor[:, 1:] = np.cumprod(carried[:, :-1], axis=1)
+
+    balance = balances[:, None] * start_factor * fraction
+    previous = np.empty_like(balance)
+    previous[:, 0] = balances
+    previous[:, 1:] = balance[:, :-1]
+
+    interest = np.where(active, previous * rate, 0.0)
+    principal = np.where(active, previous - balance, 0.0)
+
+    return BatchSchedule(
+        payment=principal + interest,
+        principal=principal,
+        interest=interest,
+        balance=balance,
+        num_periods=np.array(num_periods)
+    )
@@ -1 +1,14 @@
-TABLES_PATH = "debt_repayment/files/tables/"
\ No newline at end of file
+TABLES_PATH = "debt_repayment/files/tables/"
+TIMEZONE = "US/Mountain"
+TABLE_BACKEND = "csv"  # "csv" or "sqlite"
+
+# Payment status of a period in deferment schedules
+AMORTIZING = 0
+FORBEARANCE = 1  # no payment, interest accrues and is capitalized when the period ends
+DEFERMENT = 2  # no payment, interest is subsidized and does not accrue
+INTEREST_ONLY = 3
+
+# Revolving credit: default minimum payment (percent of the balance, plus interest if chosen, with a floor)
+MIN_PAYMENT_PERCENT = 1.0
+MIN_PAYMENT_FLOOR = 25.0
+MAX_REVOLVING_MONTHS = 600
\ No newline at end of file
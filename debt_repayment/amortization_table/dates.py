@@ -0,0 +1,52 @@
+from .constants import TIMEZONE
+from ..tools.constants import PAYMENT_FREQUENCIES, DEFAULT_FREQUENCY
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+
+@lru_cache(maxsize=256)
+def due_dates(start, periods, frequency=DEFAULT_FREQUENCY):
+    """
+    Generates the due dates of a payment schedule. Results are cached, so every loan
+    sharing a start date and frequency reuses the same (immutable) index.
+
+    Args:
+        start (datetime.date): date of the first payment period
+        periods (int): number of payments
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        pd.DatetimeIndex: due date of every payment
+    """
+    offset = PAYMENT_FREQUENCIES[frequency][0]
+    return pd.date_range(start, freq=offset, periods=periods, tz=TIMEZONE, name="Due date")
+
+
+def batch_due_dates(starts, num_periods, frequency=DEFAULT_FREQUENCY):
+    """
+    Generates the due dates of many schedules at once. Dates are generated once per
+    distinct start date and shared by every loan starting on it.
+
+    Args:
+        starts (array_like): date of the first payment period of each loan
+        num_periods (array_like): number of payments of each loan
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        np.ndarray: (n_loans, max(num_periods)) datetime64 due dates, NaT past the
+        last payment of each loan
+    """
+    starts = pd.to_datetime(np.asarray(starts).reshape(-1)).normalize()
+    num_periods = np.broadcast_to(np.asarray(num_periods, dtype=np.int64), starts.shape)
+    n_max = int(num_periods.max())
+
+    unique_starts, inverse = np.unique(starts.values, return_inverse=True)
+    calendar = np.stack([
+        due_dates(pd.Timestamp(start).date(), n_max, frequency).tz_localize(None).values
+        for start in unique_starts
+    ])
+
+    dates = calendar[inverse]
+    dates[np.arange(n_max) >= num_periods[:, None]] = np.datetime64('NaT')
+    return dates
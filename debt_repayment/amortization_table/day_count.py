@@ -0,0 +1,135 @@
+from .batch import BatchSchedule
+from ..tools.constants import DAY_COUNT_BASIS
+import numpy as np
+
+
+def _date_parts(dates):
+    """Year, month and day of datetime64 dates as integer arrays."""
+    months = dates.astype('datetime64[M]')
+    year = months.astype('datetime64[Y]').astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (dates.astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64) + 1
+    return year, month, day
+
+
+def _conventions(convention):
+    """Day-count conventions as an (n_loans, 1) array, checked against DAY_COUNT_BASIS."""
+    conventions = np.asarray(convention, dtype=object).reshape(-1, 1)
+    unknown = set(conventions.ravel()) - set(DAY_COUNT_BASIS)
+    if unknown:
+        raise ValueError(f"Unknown day-count convention '{unknown.pop()}'. " +\
+                         f"Choose one of: {', '.join(DAY_COUNT_BASIS)}")
+    return conventions
+
+
+def period_days(dates, origination=None, convention="actual/365"):
+    """
+    Number of days of interest accrued in every payment period.
+
+    Args:
+        dates (np.ndarray): (n_loans, n_periods) datetime64 due dates
+        origination (array_like): date interest starts accruing for each loan. Defaults
+            to one regular period before the first due date
+        convention (str or array_like): day-count convention, one of DAY_COUNT_BASIS,
+            or one per loan
+
+    Returns:
+        np.ndarray: (n_loans, n_periods) days in each period
+    """
+    conventions = _conventions(convention)
+    dates = np.atleast_2d(np.asarray(dates, dtype='datetime64[D]'))
+    if origination is None:
+        regular = dates[:, 1:2] - dates[:, :1] if dates.shape[1] > 1 else np.timedelta64(30, 'D')
+        origination = dates[:, :1] - regular
+    else:
+        origination = np.asarray(origination, dtype='datetime64[D]').reshape(-1, 1)
+
+    previous = np.concatenate([np.broadcast_to(origination, (len(dates), 1)), dates[:, :-1]], axis=1)
+
+    days = (dates - previous).astype(np.int64)
+    thirty_360 = conventions == "30/360"
+    if thirty_360.any():
+        y1, m1, d1 = _date_parts(previous)
+        y2, m2, d2 = _date_parts(dates)
+        d1 = np.minimum(d1, 30)
+        d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+        days = np.where(thirty_360, (y2 - y1) * 360 + (m2 - m1) * 30 + (d2 - d1), days)
+
+    #Past the last payment of a loan the dates are NaT:
+    return np.where(np.isnat(dates) | np.isnat(previous), 0, days)
+
+
+def period_rates(dates, interest_rates, origination=None, convention="actual/365"):
+    """
+    Interest rate charged in every payment period when interest accrues daily.
+
+    Args:
+        dates (np.ndarray): (n_loans, n_periods) datetime64 due dates
+        interest_rates (array_like): annual interest rate of each loan
+        origination (array_like): date interest starts accruing for each loan
+        convention (str or array_like): day-count convention, one of DAY_COUNT_BASIS,
+            or one per loan
+
+    Returns:
+        np.ndarray: (n_loans, n_periods) periodic rates
+    """
+    days = period_days(dates, origination, convention)
+    basis = np.array([DAY_COUNT_BASIS[name] for name in _conventions(convention).ravel()]).reshape(-1, 1)
+    daily_rate = np.asarray(interest_rates, dtype=float).reshape(-1, 1) / (100 * basis)
+    return daily_rate * days
+
+
+def day_count_schedules(balances, interest_rates, payments, dates, num_periods,
+                        origination=None, convention="actual/365"):
+    """
+    Computes the schedules of many loans with a fixed payment and daily interest
+    accrual. With per-period growth G_k = prod(1 + r_i), the balance after k payments
+    is G_k * (B0 - P * sum(1 / G_i)), so every period is computed with cumulative
+    products and sums instead of a loop. The last payment clears the balance.
+
+    Args:
+        balances (array_like): amount borrowed for each loan
+        interest_rates (array_like): annual interest rate of each loan
+        payments (array_like): payment of each loan
+        dates (np.ndarray): (n_loans, n_periods) datetime64 due dates, NaT past the last payment
+        num_periods (array_like): number of payments of each loan
+        origination (array_like): date interest starts accruing for each loan
+        convention (str or array_like): day-count convention, one of DAY_COUNT_BASIS,
+            or one per loan
+
+    Returns:
+        BatchSchedule: schedules of all the loans
+    """
+    rate = period_rates(dates, interest_rates, origination, convention)
+    n_loans = max(rate.shape[0], np.size(balances))
+    rate = np.broadcast_to(rate, (n_loans, rate.shape[1]))
+    balances = np.broadcast_to(np.asarray(balances, dtype=float).reshape(-1), (n_loans,))
+    num_periods = np.broadcast_to(np.asarray(num_periods, dtype=np.int64), (n_loans,))
+    payments = np.broadcast_to(np.asarray(payments, dtype=float), (n_loans,))[:, None]
+    period = np.arange(rate.shape[1])
+
+    growth = np.cumprod(1 + rate, axis=1)
+    balance = growth * (balances[:, None] - payments * np.cumsum(1 / growth, axis=1))
+
+    #Loans paid off before the end of their term stop at the first non-positive balance:
+    paid_off = (balance <= 0) & (period < num_periods[:, None])
+    num_periods = np.where(paid_off.any(axis=1), paid_off.argmax(axis=1) + 1, num_periods)
+    active = period < num_periods[:, None]
+    last = period == num_periods[:, None] - 1
+
+    previous = np.empty_like(balance)
+    previous[:, 0] = balances
+    previous[:, 1:] = balance[:, :-1]
+
+    interest = np.where(active, previous * rate, 0.0)
+    payment = np.where(last, previous + interest, np.where(active, payments, 0.0))
+    principal = payment - interest
+    balance = np.where(active & ~last, balance, 0.0)
+
+    return BatchSchedule(
+        payment=payment,
+        principal=principal,
+        interest=interest,
+        balance=balance,
+        num_periods=num_periods
+    )
@@ -0,0 +1,121 @@
+from .batch import BatchSchedule, _rate_matrix, _balance_fraction
+from .constants import AMORTIZING, FORBEARANCE, INTEREST_ONLY
+from ..tools.constants import DEFAULT_FREQUENCY
+from ..tools.payments_utils import periodic_rate
+import numpy as np
+
+
+def payment_status(num_periods, starts, lengths, kinds, n_loans=None):
+    """
+    Builds the per-period payment status of many loans from their payment holidays.
+
+    Args:
+        num_periods (int): number of periods in the status matrix
+        starts (array_like): (n_loans, n_events) payment numbers (starting at 1, as in the
+            "Pmt #" column) at which each holiday starts. A grace period starts at 1
+        lengths (array_like): (n_loans, n_events) number of periods of each holiday.
+            Loans with fewer holidays can be padded with a length of 0
+        kinds (array_like): (n_loans, n_events) FORBEARANCE, DEFERMENT or INTEREST_ONLY
+        n_loans (int): number of loans, taken from the event arrays if None
+
+    Returns:
+        np.ndarray: (n_loans, num_periods) status of every period, AMORTIZING outside holidays
+    """
+    starts = np.atleast_2d(np.asarray(starts, dtype=np.int64))
+    lengths = np.atleast_2d(np.asarray(lengths, dtype=np.int64))
+    kinds = np.atleast_2d(np.asarray(kinds, dtype=np.int64))
+    if n_loans is None:
+        n_loans = max(starts.shape[0], lengths.shape[0], kinds.shape[0])
+    shape = (n_loans, max(starts.shape[1], lengths.shape[1], kinds.shape[1]))
+    starts, lengths, kinds = (np.broadcast_to(x, shape) for x in (starts, lengths, kinds))
+
+    period = np.arange(1, num_periods + 1)
+    status = np.full((n_loans, num_periods), AMORTIZING, dtype=np.int64)
+
+    #Loop over events (few), later events override earlier ones where they overlap:
+    for column in range(shape[1]):
+        start = starts[:, column, None]
+        during = (period >= start) & (period < start + lengths[:, column, None])
+        status = np.where(during, kinds[:, column, None], status)
+
+    return status
+
+
+def deferment_schedules(balances, rates, num_periods, status, frequency=DEFAULT_FREQUENCY):
+    """
+    Computes the schedules of many loans with payment holidays, interest-only periods and
+    capitalized interest at once. Periods are split into segments wherever the status or
+    the rate changes, and each segment is computed in closed form:
+
+        - AMORTIZING: the payment is re-amortized at the start of the segment over the
+          amortizing periods left, so the payment after a holiday comes out in one pass
+        - FORBEARANCE: no payment, simple interest accrues on the balance and is
+          capitalized on the last period of the segment
+        - DEFERMENT: no payment and no interest
+        - INTEREST_ONLY: the payment is the interest, the balance does not change
+
+    Args:
+        balances (array_like): amount borrowed for each loan
+        rates (array_like): annual interest rate of each loan, either one rate per loan
+            or an (n_loans, n_periods) matrix of per-period rates
+        num_periods (array_like): number of periods of each loan, holidays included
+        status (array_like): (n_loans, n_periods) status of each period, see payment_status
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        tuple: the BatchSchedule of the loans and an (n_loans, n_periods) array of the
+            interest capitalized in each period
+    """
+    balances = np.asarray(balances, dtype=float).reshape(-1)
+    num_periods = np.broadcast_to(np.asarray(num_periods, dtype=np.int64), balances.shape)
+    n_loans = balances.size
+    n_max = int(num_periods.max())
+
+    status = np.broadcast_to(np.atleast_2d(np.asarray(status, dtype=np.int64)), (n_loans, n_max))
+    rate = periodic_rate(_rate_matrix(rates, n_loans, n_max), frequency)
+    period = np.arange(n_max)
+    active = period < num_periods[:, None]
+    amortizing = active & (status == AMORTIZING)
+
+    #A new segment starts on the first period and whenever the status or the rate changes:
+    reset = np.ones((n_loans, n_max), dtype=bool)
+    reset[:, 1:] = (status[:, 1:] != status[:, :-1]) | (rate[:, 1:] != rate[:, :-1])
+    segment_start = np.maximum.accumulate(np.where(reset, period, 0), axis=1)
+    segment_end = np.ones((n_loans, n_max), dtype=bool)
+    segment_end[:, :-1] = reset[:, 1:]
+    segment_end &= active
+    paid = period - segment_start + 1
+
+    #Amortizing periods left from each period to the end of the loan:
+    amortizing_left = np.cumsum(amortizing[:, ::-1], axis=1)[:, ::-1]
+    remaining = np.maximum(np.take_along_axis(amortizing_left, segment_start, axis=1), 1)
+
+    #Balance of each period relative to the start of its segment:
+    fraction = np.where(amortizing, _balance_fraction(rate, remaining, np.minimum(paid, remaining)), 1.0)
+    capitalizing = segment_end & (status == FORBEARANCE)
+    fraction = np.where(capitalizing, 1 + rate * paid, fraction)
+    fraction = np.where(active, fraction, 0.0)
+
+    #Balance at the start of each segment is the product of the previous segment ends:
+    carried = np.where(segment_end, fraction, 1.0)
+    start_factor = np.ones((n_loans, n_max))
+    start_factor[:, 1:] = np.cumprod(carried[:, :-1], axis=1)
+
+    balance = balances[:, None] * start_factor * fraction
+    previous = np.empty_like(balance)
+    previous[:, 0] = balances
+    previous[:, 1:] = balance[:, :-1]
+
+    paying_interest = active & ((status == AMORTIZING) | (status == INTEREST_ONLY))
+    interest = np.where(paying_interest, previous * rate, 0.0)
+    capitalized = np.where(capitalizing, balance - previous, 0.0)
+    principal = np.where(active, previous - balance + capitalized, 0.0)
+
+    schedule = BatchSchedule(
+        payment=principal + interest,
+        principal=principal,
+        interest=interest,
+        balance=balance,
+        num_periods=np.array(num_periods)
+    )
+    return schedule, capitalized
@@ -0,0 +1,207 @@
+from .batch import BatchSchedule
+from .kernels import cents_exact_schedules, numba
+from .table import AmortizationTable
+from ..tools.constants import DEFAULT_FREQUENCY
+from ..tools.payments_utils import calculate_payments, periodic_rate
+from ..tools.logger_utils import my_log
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+import time
+import numpy as np
+
+
+CALIBRATION_TERMS = (60, 360)
+CALIBRATION_BATCHES = (1, 200)  # small batches keep the startup calibration well under a second
+
+
+@dataclass(frozen=True)
+class Engine:
+    """
+    A schedule engine: computes the schedules of a batch of loans from their balance,
+    annual interest rate and payment, the way AmortizationTable._payment_split does.
+    Every engine must match the reference loop to the cent.
+
+    Attributes:
+    ---------------------------------------------------
+        name (str): name of the engine in the registry
+        schedules (Callable): schedules(balances, interest_rates, payments, frequency)
+        returning a BatchSchedule
+        available (Callable): returns whether the engine can run in this environment
+    """
+    name: str
+    schedules: Callable
+    available: Callable = lambda: True
+
+
+ENGINES = {}
+
+
+def available_engines():
+    """Names of the registered engines that can run here."""
+    return [name for name, engine in ENGINES.items() if engine.available()]
+
+
+def _sample_loans(n_loans, term, seed=0):
+    rng = np.random.default_rng(seed)
+    balances = np.round(rng.uniform(1_000, 500_000, n_loans), 2)
+    rates = np.round(rng.uniform(0, 12, n_loans), 3)
+    return balances, rates, calculate_payments(balances, rates, term)
+
+
+@lru_cache(maxsize=None)
+def _calibrate():
+    """Times every engine on a few terms and batch sizes, returns the fastest of each."""
+    fastest = {}
+    for term in CALIBRATION_TERMS:
+        for n_loans in CALIBRATION_BATCHES:
+            loans = _sample_loans(n_loans, term)
+            timings = {}
+            for name in available_engines():
+                ENGINES[name].schedules(*(x[:1] for x in loans))  # warm up, e.g. JIT compilation
+                start = time.perf_counter()
+                ENGINES[name].schedules(*loans)
+                timings[name] = time.perf_counter() - start
+            fastest[(term, n_loans)] = min(timings, key=timings.get)
+
+    my_log.info(f"Engine calibration: {fastest}")
+    return fastest
+
+
+def register_engine(name, schedules, available=None):
+    """Adds an engine to the registry, replacing any engine with the same name."""
+    ENGINES[name] = Engine(name, schedules, available or (lambda: True))
+    _calibrate.cache_clear()
+    return ENGINES[name]
+
+
+def _reference_schedules(balances, interest_rates, payments, frequency=DEFAULT_FREQUENCY):
+    """Runs AmortizationTable._payment_split for every loan, without building or saving tables."""
+    balances, interest_rates, payments = np.broadcast_arrays(*(np.asarray(x, dtype=float).reshape(-1)
+                                                               for x in (balances, interest_rates, payments)))
+    splits = []
+    for balance, rate, payment in zip(balances.tolist(), interest_rates.tolist(), payments.tolist()):
+        table = AmortizationTable.__new__(AmortizationTable)
+        table.loan_balance = balance
+        table.monthly_payments = payment
+        table.period_rate = periodic_rate(rate, frequency)
+        table.period_rates = None
+        table.num_months = 0
+        splits.append(table._payment_split())
+
+    num_periods = np.array([len(principal) for principal, _, _ in splits], dtype=np.int64)
+    n_max = int(num_periods.max(initial=0))
+    principal, interest, balance = (np.zeros((len(splits), n_max)) for _ in range(3))
+    for i, split in enumerate(splits):
+        for array, values in zip((principal, interest, balance), split):
+            array[i, :len(values)] = values
+
+    active = np.arange(n_max) < num_periods[:, None]
+    last = np.arange(n_max) == num_periods[:, None] - 1
+    return BatchSchedule(
+        payment=np.where(last, principal, np.where(active, payments[:, None], 0.0)),
+        principal=principal,
+        interest=interest,
+        balance=balance,
+        num_periods=num_periods
+    )
+
+
+register_engine("reference", _reference_schedules)
+register_engine("cents_exact", lambda balances, interest_rates, payments, frequency=DEFAULT_FREQUENCY:
+                cents_exact_schedules(balances, interest_rates, payments, frequency=frequency, compiled=False))
+register_engine("compiled", lambda balances, interest_rates, payments, frequency=DEFAULT_FREQUENCY:
+                cents_exact_schedules(balances, interest_rates, payments, frequency=frequency, compiled=True),
+                available=lambda: numba is not None)
+
+
+def select_engine(name="auto", n_loans=1, term=360):
+    """
+    Returns an engine from the registry. "auto" picks the engine that was fastest at
+    calibration for the closest term and batch size.
+
+    Args:
+        name (str): engine name, or "auto"
+        n_loans (int): number of loans the engine will run on
+        term (int): typical number of payments of the loans
+
+    Returns:
+        Engine: the selected engine
+    """
+    if name != "auto":
+        try:
+            engine = ENGINES[name]
+        except KeyError:
+            raise ValueError(f"Unknown engine '{name}'. Choose one of: auto, {', '.join(ENGINES)}")
+        if not engine.available():
+            raise ValueError(f"The {name} engine is not available here")
+        return engine
+
+    #Closest calibration point on a log scale:
+    fastest = _calibrate()
+    point = min(fastest, key=lambda key: abs(np.log(key[0] / term)) + abs(np.log(key[1] / n_loans)))
+    return ENGINES[fastest[point]]
+
+
+def engine_table(name="auto"):
+    """
+    Returns an AmortizationTable class whose fixed-rate schedules are computed by an
+    engine, to pass as amortization_cls to DebtAPP. Adjustable-rate, deferment and
+    daily-accrual tables keep their own code paths. With "auto", the engines are
+    calibrated here, at startup, so the first table doesn't wait for it.
+
+    Args:
+        name (str): engine name, or "auto"
+
+    Returns:
+        type: AmortizationTable subclass
+    """
+    engine = select_engine(name) if name != "auto" else None
+    if engine is None:
+        _calibrate()
+
+    class EngineAmortizationTable(AmortizationTable):
+        def _payment_split(self):
+            if self.period_rates is not None:
+                return super()._payment_split()
+
+            selected = engine or select_engine("auto", 1, self.num_months)
+            schedule = selected.schedules(self.loan_balance, self.interest_rate, self.monthly_payments,
+                                          self.frequency)
+            _, principal, interest, loan = schedule.loan(0)
+            return principal.tolist(), interest.tolist(), loan.tolist()
+
+    EngineAmortizationTable.__name__ = f"AmortizationTable[{name}]"
+    return EngineAmortizationTable
+
+
+def check_conformance(n_loans=500, terms=CALIBRATION_TERMS, seed=0):
+    """
+    Runs every available engine on the same random loans and compares the schedules
+    with the reference loop. Every engine must match it to the cent.
+
+    Args:
+        n_loans (int): number of loans per term
+        terms (tuple): terms of the loans
+        seed (int): seed of the random loans
+
+    Returns:
+        dict: for each engine, the number of loans whose schedule differs from the reference
+            and the largest balance difference
+    """
+    results = {name: [0, 0.0] for name in available_engines()}
+    for term in terms:
+        loans = _sample_loans(n_loans, term, seed)
+        reference = ENGINES["reference"].schedules(*loans)
+        for name in results:
+            schedule = ENGINES[name].schedules(*loans)
+            for i in range(n_loans):
+                expected, actual = reference.loan(i), schedule.loan(i)
+                if len(expected[0]) != len(actual[0]):
+                    results[name][0] += 1
+                    continue
+                differs = not all(np.array_equal(a, b) for a, b in zip(expected, actual))
+                results[name][0] += differs
+                results[name][1] = max(results[name][1], float(np.abs(expected[3] - actual[3]).max(initial=0)))
+
+    return {name: tuple(result) for name, result in results.items()}
@@ -0,0 +1,205 @@
+from .dates import due_dates
+from .kernels import cents_exact_schedules
+from ..tools.constants import DEFAULT_FREQUENCY
+import numpy as np
+import pandas as pd
+
+
+COLUMNS = ("payment", "principal", "interest", "balance")
+TABLE_COLUMNS = {"payment": "Payment_amount", "principal": "Principal_paid",
+                 "interest": "Interest_paid", "balance": "Remaining_balance"}
+
+
+class ScheduleVersion:
+    """
+    One variant of a schedule. A version only stores the payments from the month where it
+    departs from its parent; the earlier months are read from the parent, so versions
+    share their unchanged prefix instead of copying it.
+
+    Attributes:
+    ---------------------------------------------------
+        parent (ScheduleVersion): version this one was derived from, None for the base
+        start (int): index of the first payment stored by this version
+        monthly_payment (float): regular payment from start onwards
+        label (str): description of the change
+        suffix (dict): payment, principal, interest and balance arrays from start onwards
+
+    Methods:
+    ---------------------------------------------------
+        column: returns a full column of the schedule
+
+        payment_at: returns the regular payment in effect at a payment index
+
+        flatten: copies the parent's prefix into this version and detaches it
+    """
+    def __init__(self, parent, start, monthly_payment, label, **suffix) -> None:
+        self.parent = parent
+        self.start = start
+        self.monthly_payment = monthly_payment
+        self.label = label
+        self.suffix = suffix
+
+
+    @property
+    def num_periods(self):
+        return self.start + len(self.suffix["balance"])
+
+
+    def column(self, name):
+        """Full column of the schedule, the parent's prefix followed by this version's suffix."""
+        if self.parent is None:
+            return self.suffix[name]
+        return np.concatenate([self.parent.column(name)[:self.start], self.suffix[name]])
+
+
+    def payment_at(self, index):
+        """Regular payment in effect at a payment index."""
+        version = self
+        while version.parent is not None and index < version.start:
+            version = version.parent
+        return version.monthly_payment
+
+
+    def flatten(self):
+        """Stores the full schedule in this version so its ancestors can be released."""
+        self.suffix = {name: self.column(name) for name in COLUMNS}
+        self.start = 0
+        self.parent = None
+
+
+class ScenarioHistory:
+    """
+    Undo/redo history of lump-sum and extra-payment changes layered on top of a base
+    schedule. Each change is computed with the cents-exact kernel from the month it
+    takes effect, and only the changed suffix is stored.
+
+    Attributes:
+    ---------------------------------------------------
+        interest_rate (float): annual interest rate of the loan
+        frequency (str): payment frequency of the loan
+        first_due_date (pd.Timestamp): due date of the first payment
+        versions (list): versions in the order they were applied
+        position (int): index of the current version in versions
+        max_versions (int): number of versions kept, at least 2. Beyond it the oldest
+        changes are folded together, the base schedule is always kept
+
+    Methods:
+    ---------------------------------------------------
+        apply: adds a lump sum and/or extra payment from a given month to the current version
+
+        undo: steps back to the previous version
+
+        redo: steps forward to the next version
+
+        to_frame: returns the current version as an amortization table
+    """
+    def __init__(self, loan_balance, interest_rate, monthly_payment, amortization_df,
+                 frequency=DEFAULT_FREQUENCY, max_versions=50) -> None:
+        self.loan_balance = float(loan_balance)
+        self.interest_rate = float(interest_rate)
+        self.frequency = frequency
+        self.first_due_date = amortization_df["Due date"].iloc[0]
+        if max_versions < 2:
+            raise ValueError("The history must keep at least the base and one change")
+        self.max_versions = max_versions
+
+        base = ScheduleVersion(None, 0, float(monthly_payment), "Base schedule", **{
+            name: amortization_df[column].to_numpy(dtype=float) for name, column in TABLE_COLUMNS.items()
+        })
+        self.versions = [base]
+        self.position = 0
+
+
+    @property
+    def current(self):
+        return self.versions[self.position]
+
+    @property
+    def base(self):
+        return self.versions[0]
+
+    @property
+    def can_undo(self):
+        return self.position > 0
+
+    @property
+    def can_redo(self):
+        return self.position < len(self.versions) - 1
+
+
+    def apply(self, lump_sum=0, extra_payment=0, start_month=1):
+        """
+        Derives a new version from the current one. Any undone versions are discarded.
+
+        Args:
+            lump_sum (float): one-off payment made just before the start month's payment
+            extra_payment (float): increase of the regular payment from the start month
+            start_month (int): payment number (starting at 1) from which the change applies
+
+        Returns:
+            ScheduleVersion: the new current version
+        """
+        parent = self.current
+        start = int(start_month) - 1
+        if not 0 <= start < parent.num_periods:
+            raise ValueError(f"Start month must be between 1 and {parent.num_periods}")
+
+        balance = parent.column("balance")[start - 1] if start > 0 else self.loan_balance
+        if not 0 <= lump_sum < balance:
+            raise ValueError(f"Lump sum must be between 0 and the balance of ${balance:,.2f}")
+        if extra_payment < 0:
+            raise ValueError("Extra payment can't be negative")
+        monthly_payment = parent.payment_at(start) + extra_payment
+        schedule = cents_exact_schedules(balance - lump_sum, self.interest_rate, monthly_payment,
+                                         frequency=self.frequency)
+        _, principal, interest, remaining = schedule.loan(0)
+
+        #The regular payment column shows the payment in effect, like AmortizationTable:
+        payment = np.full(len(principal), monthly_payment)
+        label = f"Lump sum ${lump_sum:,.2f} and extra ${extra_payment:,.2f} from month {start_month}"
+        version = ScheduleVersion(parent, start, monthly_payment, label, payment=payment,
+                                  principal=principal.copy(), interest=interest.copy(),
+                                  balance=remaining.copy())
+
+        del self.versions[self.position + 1:]
+        self.versions.append(version)
+        self.position += 1
+
+        #Bound memory by folding the oldest changes into their successor. The base stays
+        #first, so savings are still measured against the original schedule:
+        while len(self.versions) > self.max_versions:
+            self.versions[2].flatten()
+            del self.versions[1]
+            self.position -= 1
+
+        return version
+
+
+    def undo(self):
+        if self.can_undo:
+            self.position -= 1
+        return self.current
+
+
+    def redo(self):
+        if self.can_redo:
+            self.position += 1
+        return self.current
+
+
+    def total_interest(self, version=None):
+        version = self.current if version is None else version
+        return float(version.column("interest").sum())
+
+
+    def to_frame(self, version=None):
+        """Returns a version of the schedule with the AmortizationTable columns."""
+        version = self.current if version is None else version
+        n_periods = version.num_periods
+        df = pd.DataFrame({
+            "Pmt #": np.arange(1, n_periods + 1),
+            "Due date": due_dates(self.first_due_date.date(), n_periods, self.frequency)
+        })
+        for name, column in TABLE_COLUMNS.items():
+            df[column] = version.column(name)
+        return df
@@ -0,0 +1,180 @@
+from .batch import BatchSchedule
+from ..tools.constants import DEFAULT_FREQUENCY
+from ..tools.payments_utils import periodic_rate
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+SPLITTER = 134217729.0  # 2**27 + 1, splits a double into two 26-bit halves
+MAX_PERIODS = 1200
+
+
+def round_cents(values):
+    """
+    Rounds to cents exactly like Python's round(value, 2). np.round scales by 100 first,
+    which can push a value sitting just off a half cent onto it; the exact rounding error
+    of the scaling (Dekker's product) tells which side the value really is on.
+
+    Args:
+        values (array_like): amounts to round
+
+    Returns:
+        np.ndarray: amounts rounded to cents
+    """
+    values = np.asarray(values, dtype=float)
+    scaled = values * 100
+
+    split = values * SPLITTER
+    high = split - (split - values)
+    low = values - high
+    error = (high * 100 - scaled) + low * 100
+
+    cents = np.rint(scaled)
+    on_half = scaled - np.floor(scaled) == 0.5
+    cents = np.where(on_half & (error > 0), np.ceil(scaled), cents)
+    cents = np.where(on_half & (error < 0), np.floor(scaled), cents)
+    return cents / 100
+
+
+def _payment_split_numpy(balances, rates, payments, max_periods):
+    """
+    Runs the AmortizationTable._payment_split recurrence for every loan at once, looping
+    over periods and vectorizing over loans.
+    """
+    n_loans = balances.size
+    principal = np.zeros((n_loans, max_periods))
+    interest = np.zeros((n_loans, max_periods))
+    balance = np.zeros((n_loans, max_periods))
+    num_periods = np.full(n_loans, max_periods, dtype=np.int64)
+
+    loan = balances.copy()
+    running = np.ones(n_loans, dtype=bool)
+    for period in range(max_periods):
+        if not running.any():
+            break
+
+        period_interest = round_cents(loan * rates)
+        regular = running & (loan > payments)
+        last = running & ~regular
+
+        #Regular payment:
+        period_principal = round_cents(payments - period_interest)
+        new_loan = round_cents(loan - period_principal)
+
+        #Last payment clears the balance and its interest:
+        period_principal = np.where(last, loan + period_interest, period_principal)
+        new_loan = np.where(last, 0.0, new_loan)
+
+        principal[running, period] = period_principal[running]
+        interest[running, period] = period_interest[running]
+        balance[running, period] = new_loan[running]
+
+        num_periods[last] = period + 1
+        loan = np.where(running, new_loan, loan)
+        running = regular
+
+    return principal, interest, balance, num_periods
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _round_cents_scalar(value):
+        scaled = value * 100
+        split = value * SPLITTER
+        high = split - (split - value)
+        low = value - high
+        error = (high * 100 - scaled) + low * 100
+
+        cents = np.rint(scaled)
+        if scaled - np.floor(scaled) == 0.5:
+            if error > 0:
+                cents = np.ceil(scaled)
+            elif error < 0:
+                cents = np.floor(scaled)
+        return cents / 100
+
+
+    @numba.njit(parallel=True, cache=True)
+    def _payment_split_compiled(balances, rates, payments, max_periods):
+        n_loans = balances.size
+        principal = np.zeros((n_loans, max_periods))
+        interest = np.zeros((n_loans, max_periods))
+        balance = np.zeros((n_loans, max_periods))
+        num_periods = np.full(n_loans, max_periods, dtype=np.int64)
+
+        for i in numba.prange(n_loans):
+            loan = balances[i]
+            for period in range(max_periods):
+                period_interest = _round_cents_scalar(loan * rates[i])
+                interest[i, period] = period_interest
+                if loan > payments[i]:
+                    principal[i, period] = _round_cents_scalar(payments[i] - period_interest)
+                    loan = _round_cents_scalar(loan - principal[i, period])
+                    balance[i, period] = loan
+                else:
+                    principal[i, period] = loan + period_interest
+                    num_periods[i] = period + 1
+                    break
+
+        return principal, interest, balance, num_periods
+else:
+    _payment_split_compiled = None
+
+
+def _estimate_periods(balances, rates, payments):
+    """Upper bound on the number of payments from the closed-form payoff time."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        periods = np.where(rates == 0, balances / payments,
+                           -np.log1p(-rates * balances / payments) / np.log1p(rates))
+    periods = np.where(np.isfinite(periods), periods, MAX_PERIODS)
+    return int(min(MAX_PERIODS, np.ceil(periods.max()) + 2))
+
+
+def cents_exact_schedules(balances, interest_rates, payments, max_periods=None,
+                          frequency=DEFAULT_FREQUENCY, compiled=None):
+    """
+    Computes schedules that match AmortizationTable._payment_split to the cent for a
+    batch of loans. Uses a Numba kernel when Numba is installed and falls back to a
+    NumPy loop over periods otherwise.
+
+    Args:
+        balances (array_like): amount borrowed for each loan
+        interest_rates (array_like): annual interest rate of each loan
+        payments (array_like): payment of each loan
+        max_periods (int): number of periods computed, estimated from the loans if None
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+        compiled (bool): force (True) or disable (False) the Numba kernel, auto if None
+
+    Returns:
+        BatchSchedule: schedules of all the loans
+    """
+    balances = np.ascontiguousarray(balances, dtype=float).reshape(-1)
+    rates = np.ascontiguousarray(np.broadcast_to(periodic_rate(np.asarray(interest_rates, dtype=float),
+                                                               frequency), balances.shape))
+    payments = np.ascontiguousarray(np.broadcast_to(np.asarray(payments, dtype=float), balances.shape))
+    if max_periods is None:
+        max_periods = _estimate_periods(balances, rates, payments)
+
+    if compiled is None:
+        compiled = _payment_split_compiled is not None
+    if compiled and _payment_split_compiled is None:
+        raise ImportError("The compiled kernel requires numba")
+
+    kernel = _payment_split_compiled if compiled else _payment_split_numpy
+    principal, interest, balance, num_periods = kernel(balances, rates, payments, int(max_periods))
+
+    active = np.arange(max_periods) < num_periods[:, None]
+    last = np.arange(max_periods) == num_periods[:, None] - 1
+    payment = np.where(last, principal, np.where(active, payments[:, None], 0.0))
+
+    return BatchSchedule(
+        payment=payment,
+        principal=principal,
+        interest=interest,
+        balance=balance,
+        num_periods=num_periods
+    )
@@ -0,0 +1,124 @@
+from .batch import BatchSchedule
+from .constants import MIN_PAYMENT_PERCENT, MIN_PAYMENT_FLOOR, MAX_REVOLVING_MONTHS
+from .dates import due_dates
+from .kernels import round_cents
+import numpy as np
+import pandas as pd
+
+
+def _charge_matrix(charges, n_cards, n_months):
+    """Expands new charges into an (n_cards, n_months) matrix; scalars and 1-D arrays repeat every month."""
+    charges = np.asarray(charges, dtype=float)
+    if charges.ndim < 2:
+        return np.broadcast_to(charges.reshape(-1, 1), (n_cards, n_months))
+    charges = np.broadcast_to(charges, (n_cards, charges.shape[1]))
+    if charges.shape[1] >= n_months:
+        return charges[:, :n_months]
+    return np.pad(charges, ((0, 0), (0, n_months - charges.shape[1])))
+
+
+def revolving_schedules(balances, aprs, min_percent=MIN_PAYMENT_PERCENT, min_floor=MIN_PAYMENT_FLOOR,
+                        plus_interest=True, fixed_payments=None, charges=0, max_months=MAX_REVOLVING_MONTHS):
+    """
+    Computes the payoff schedules of many credit cards at once. Every month interest is
+    charged on the balance, the payment is made, and then any new charges are added.
+    The minimum payment is min_percent of the balance (plus the month's interest when
+    plus_interest), but never less than min_floor. A fixed payment overrides it when
+    larger. Amounts are rounded to cents like a statement. The loop runs over months
+    on the cards still open only, so each card stops costing anything once paid off.
+
+    Args:
+        balances (array_like): balance of each card
+        aprs (array_like): annual percentage rate of each card
+        min_percent (float or array_like): minimum payment as a percent of the balance
+        min_floor (float or array_like): smallest minimum payment
+        plus_interest (bool or array_like): add the month's interest to the minimum payment
+        fixed_payments (array_like): payment each card makes instead of the minimum when
+            larger, np.nan or None for minimum payments only
+        charges (array_like): new charges each month, one amount per card or an
+            (n_cards, n_months) matrix. Cards with charges stay open until they stop
+        max_months (int): months computed before giving up on a card
+
+    Returns:
+        tuple: the BatchSchedule of the cards and whether each card was paid off
+    """
+    balances = np.asarray(balances, dtype=float).reshape(-1)
+    n_cards = balances.size
+    def per_card(values):
+        return np.broadcast_to(np.asarray(values, dtype=float).reshape(-1), (n_cards,))
+
+    aprs = per_card(aprs)
+    min_percent = per_card(min_percent)
+    min_floor = per_card(min_floor)
+    plus_interest = per_card(plus_interest).astype(bool)
+    fixed = per_card(np.nan if fixed_payments is None else fixed_payments)
+    fixed = np.where(np.isnan(fixed), 0.0, fixed)
+    charges = _charge_matrix(charges, n_cards, max_months)
+
+    #A card can close once its balance is paid and no more charges are coming:
+    charged = charges != 0
+    last_charge = np.where(charged.any(axis=1), max_months - np.argmax(charged[:, ::-1], axis=1), 0)
+
+    payment, principal, interest, balance = (np.zeros((n_cards, max_months)) for _ in range(4))
+    num_periods = np.full(n_cards, max_months, dtype=np.int64)
+    paid_off = np.zeros(n_cards, dtype=bool)
+
+    open_cards = (balances > 0) | (last_charge > 0)
+    num_periods[~open_cards] = 0
+    paid_off[~open_cards] = True
+    rows = np.flatnonzero(open_cards)
+    current = balances[rows]
+    for month in range(max_months):
+        if rows.size == 0:
+            break
+
+        month_interest = round_cents(current * aprs[rows] / 1200)
+        owed = current + month_interest
+        minimum = round_cents(current * min_percent[rows] / 100 + np.where(plus_interest[rows], month_interest, 0.0))
+        month_payment = np.minimum(np.maximum.reduce([minimum, min_floor[rows], fixed[rows]]), owed)
+        month_payment = np.maximum(month_payment, 0.0)
+        current = round_cents(owed - month_payment + charges[rows, month])
+
+        payment[rows, month] = month_payment
+        interest[rows, month] = month_interest
+        principal[rows, month] = month_payment - month_interest
+        balance[rows, month] = current
+
+        done = (current <= 0) & (month + 1 >= last_charge[rows])
+        num_periods[rows[done]] = month + 1
+        paid_off[rows[done]] = True
+        rows, current = rows[~done], current[~done]
+
+    n_max = int(num_periods.max(initial=0))
+    schedule = BatchSchedule(
+        payment=payment[:, :n_max],
+        principal=principal[:, :n_max],
+        interest=interest[:, :n_max],
+        balance=balance[:, :n_max],
+        num_periods=num_periods
+    )
+    return schedule, paid_off
+
+
+def revolving_table(balance, apr, min_percent=MIN_PAYMENT_PERCENT, min_floor=MIN_PAYMENT_FLOOR,
+                    plus_interest=True, fixed_payment=None, charges=0, max_months=MAX_REVOLVING_MONTHS):
+    """
+    Payoff schedule of one credit card with the columns of AmortizationTable, so it
+    can be shown by the same viewers. Arguments are those of revolving_schedules.
+
+    Returns:
+        pd.DataFrame: payoff schedule of the card
+    """
+    schedule, _ = revolving_schedules(balance, apr, min_percent, min_floor, plus_interest,
+                                      fixed_payment, charges, max_months)
+    payment, principal, interest, remaining = schedule.loan(0)
+    n_months = len(payment)
+
+    return pd.DataFrame({
+        "Pmt #": np.arange(1, n_months + 1),
+        "Due date": due_dates(pd.Timestamp.now().date(), n_months),
+        "Payment_amount": payment,
+        "Principal_paid": np.round(principal, 2),
+        "Interest_paid": interest,
+        "Remaining_balance": remaining
+    })
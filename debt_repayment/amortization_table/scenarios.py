@@ -0,0 +1,78 @@
+from .dates import due_dates
+from .kernels import cents_exact_schedules
+import numpy as np
+import pandas as pd
+
+
+def _scenario_inputs(lump_sums, extra_payments, grid):
+    """Pairs up the lump sums and extra payments, or takes every combination if grid."""
+    lump_sums = np.atleast_1d(np.asarray(lump_sums, dtype=float))
+    extra_payments = np.atleast_1d(np.asarray(extra_payments, dtype=float))
+    if grid:
+        lump_sums, extra_payments = np.meshgrid(lump_sums, extra_payments, indexing='ij')
+    return np.broadcast_arrays(lump_sums.ravel(), extra_payments.ravel())
+
+
+def scenario_schedules(a_table, lump_sums, extra_payments, grid=False):
+    """
+    Computes the schedules update_payments would produce for many lump sums and extra
+    payments at once, without modifying the table or writing files. Results match
+    update_payments to the cent.
+
+    Args:
+        a_table (AmortizationTable): base fixed-rate loan
+        lump_sums (array_like): one-off payment of each scenario
+        extra_payments (array_like): increase of the monthly payment of each scenario
+        grid (bool): compute every combination of lump sum and extra payment
+
+    Returns:
+        tuple: the lump sums and extra payments of the scenarios, and their BatchSchedule
+    """
+    if a_table.rate_path is not None or a_table.day_count is not None or a_table.payment_status is not None:
+        raise ValueError("Scenarios are only supported for fixed-rate tables without daily accrual "
+                         "or payment holidays")
+
+    lump_sums, extra_payments = _scenario_inputs(lump_sums, extra_payments, grid)
+    balance = a_table.loan_balance
+    if not ((0 <= lump_sums) & (lump_sums < balance)).all():
+        raise ValueError(f"Lump sum must be between 0 and the balance of ${balance:,.2f}")
+    if (extra_payments < 0).any():
+        raise ValueError("Extra payment can't be negative")
+    schedule = cents_exact_schedules(a_table.loan_balance - lump_sums, a_table.interest_rate,
+                                     a_table.monthly_payments + extra_payments,
+                                     frequency=a_table.frequency)
+    return lump_sums, extra_payments, schedule
+
+
+def compare_scenarios(a_table, lump_sums, extra_payments, grid=False):
+    """
+    Compares many lump-sum and extra-payment scenarios against the base loan.
+
+    Args:
+        a_table (AmortizationTable): base fixed-rate loan
+        lump_sums (array_like): one-off payment of each scenario
+        extra_payments (array_like): increase of the monthly payment of each scenario
+        grid (bool): compute every combination of lump sum and extra payment
+
+    Returns:
+        pd.DataFrame: months, interest and payoff date of each scenario and what it saves
+    """
+    lump_sums, extra_payments, schedule = scenario_schedules(a_table, lump_sums, extra_payments, grid)
+
+    base_months = len(a_table.amortization_df)
+    base_interest = a_table.amortization_df["Interest_paid"].sum()
+    months = schedule.num_periods
+    total_interest = schedule.interest.sum(axis=1)
+
+    first_due_date = a_table.amortization_df["Due date"].iloc[0]
+    calendar = due_dates(first_due_date.date(), int(months.max()), a_table.frequency)
+
+    return pd.DataFrame({
+        "Lump_sum": lump_sums,
+        "Extra_payment": extra_payments,
+        "Months": months,
+        "Months_saved": base_months - months,
+        "Total_interest": np.round(total_interest, 2),
+        "Interest_saved": np.round(base_interest - total_interest, 2),
+        "Payoff_date": calendar[months - 1]
+    })
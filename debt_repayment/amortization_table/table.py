@@ -1,4 +1,11 @@
-from .constants import TABLES_PATH
+from .constants import TABLES_PATH, TABLE_BACKEND, AMORTIZING, FORBEARANCE, INTEREST_ONLY
+from .batch import amortize
+from .dates import due_dates
+from .day_count import period_rates
+from .deferment import deferment_schedules
+from .kernels import MAX_PERIODS
+from ..tools.constants import DEFAULT_FREQUENCY
+from ..tools.payments_utils import periodic_rate
 from ..tools.logger_utils import my_log
 import os
 import numpy as np
@@ -16,8 +23,18 @@ class AmortizationTable:
         loan_type (str): title of the loan, i.e. Student loans, Car, Medical...
         loan_balance (float): amount borrowed
         interest_rate (float): annual interest rate
-        num_months (int): duration of the loan in months
+        num_months (int): duration of the loan in months (number of payments for
+        other payment frequencies)
         monthly_payment (float): amount owed every pay month
+        rate_path (np.ndarray): optional annual interest rate for each month of an
+        adjustable-rate loan. The payment is re-amortized whenever the rate changes
+        frequency (str): payment frequency, i.e. monthly, semi-monthly, biweekly or weekly
+        day_count (str): optional day-count convention (actual/365, actual/360 or 30/360).
+        When given, interest accrues daily on the actual days between due dates. Not
+        supported together with rate_path or payment_status
+        payment_status (np.ndarray): optional status of each month (AMORTIZING, FORBEARANCE,
+        DEFERMENT or INTEREST_ONLY), see deferment.payment_status. Holidays are included
+        in num_months and the payment is re-amortized after each of them
 
     Methods:
     ---------------------------------------------------
@@ -31,9 +48,18 @@ class AmortizationTable:
         _payment_split: #Calculate the principal, interest and loan balance for 
         each payment
 
+        _rate: returns the interest rate charged in a payment period
+
+        _variable_payment_split: calculates the payment, principal, interest and loan
+        balance for each payment of an adjustable-rate loan or a loan with payment holidays
+
+        _fixed_payment_split: same as _variable_payment_split, but keeps the monthly payment
+        and lets the rates and holidays set the payoff month, used once the payments are updated
+
         save_table: checks if the folder reserved for amortization tables exist,
         creates it if needed. Saves the moartization table into csv file using the
-        loan_type, loan_amount nd monthly_payment as the name of the file.
+        loan_type, loan_amount nd monthly_payment as the name of the file. When
+        TABLE_BACKEND is "sqlite" the table is stored in the SQLite catalog instead.
 
         more_principal: checks the amortization table for the number of months
         it will take for the monthly payment to contribute to the principal
@@ -46,13 +72,23 @@ class AmortizationTable:
         or an increase in the monthly payment
     """
     def __init__(self, loan_type:str, loan_balance:float, interest_rate:float, \
-                num_months:int, monthly_payments:float) -> None:
+                num_months:int, monthly_payments:float, rate_path=None, \
+                frequency:str=DEFAULT_FREQUENCY, day_count:str=None, payment_status=None) -> None:
 
         self.loan_type = loan_type
         self.loan_balance = float(loan_balance)
         self.interest_rate = float(interest_rate)
         self.num_months = int(num_months)
         self.monthly_payments = float(monthly_payments)
+        self.rate_path = None if rate_path is None else np.asarray(rate_path, dtype=float)
+        self.frequency = frequency
+        self.period_rate = periodic_rate(self.interest_rate, frequency)
+        self.day_count = day_count
+        self.period_rates = None
+        self.payment_status = None if payment_status is None else np.asarray(payment_status, dtype=np.int64)
+        if day_count is not None and (self.rate_path is not None or self.payment_status is not None):
+            raise ValueError("Daily accrual can't be combined with a rate path or payment holidays")
+        self.fixed_payment = False
         self.amortization_df = pd.DataFrame()
 
         #Log new amortization table:
@@ -64,21 +100,41 @@ class AmortizationTable:
     def create_table(self):
         """Creates amortization table."""
         self.amortization_df["Pmt #"] = pd.Series(range(1, self.num_months+1))
-        self.amortization_df["Due date"] = pd.Series(pd.date_range(pd.Timestamp.now().date(), freq='MS', \
-                                periods=self.num_months, tz='US/Mountain', name="Due date"))
+        dates = due_dates(pd.Timestamp.now().date(), self.num_months, self.frequency)
+        self.amortization_df["Due date"] = pd.Series(dates)
+        if self.day_count is not None:
+            self.period_rates = period_rates(dates.tz_localize(None).values[None, :], self.interest_rate,
+                                             convention=self.day_count)[0]
         self.amortization_df["Payment_amount"] = pd.Series(self.monthly_payments, \
                                                         index=np.arange(self.num_months))
         
         #Calculate the principal, interest and loan balance for each payment
         if "Principal_paid" not in self.amortization_df.columns:
-            principal, interest, loan = self._payment_split()
+            if self.rate_path is None and self.payment_status is None:
+                principal, interest, loan = self._payment_split()
+            else:
+                if self.fixed_payment:
+                    payment, principal, interest, loan = self._fixed_payment_split()
+                else:
+                    payment, principal, interest, loan = self._variable_payment_split()
+                self.amortization_df["Payment_amount"] = pd.Series(payment,
+                                                            index=np.arange(self.num_months))
+
+            #A payment rounded down to the cent can leave a few cents for one more payment:
+            if len(principal) > self.num_months:
+                self.num_months = len(principal)
+                self.amortization_df = pd.DataFrame()
+                return self.create_table()
+
+            #Interest accrued daily can pay the loan off early, drop the unused due dates:
+            self.amortization_df = self.amortization_df.iloc[:len(principal)].copy()
 
             self.amortization_df["Principal_paid"] = pd.Series(principal,
-                                                            index=np.arange(self.num_months))
+                                                            index=np.arange(len(principal)))
             self.amortization_df["Interest_paid"] = pd.Series(interest,
-                                                            index=np.arange(self.num_months))
+                                                            index=np.arange(len(principal)))
             self.amortization_df["Remaining_balance"] = pd.Series(loan,
-                                                            index=np.arange(self.num_months))
+                                                            index=np.arange(len(principal)))
         
         try:
             #Update last payment:
@@ -100,23 +156,107 @@ class AmortizationTable:
         loan_list = []
         loan = self.loan_balance
         
+        #With daily accrual the payment doesn't amortize the loan exactly, so the last
+        #due date pays whatever is left:
+        last_payment = self.num_months - 1 if self.period_rates is not None else np.inf
+
         #Calculate principal, interest and loan balance for each payment
-        while loan > self.monthly_payments:
-            interest_list.append(round(loan*(self.interest_rate/1200),2))
+        while loan > self.monthly_payments and len(loan_list) < last_payment:
+            interest_list.append(round(loan*self._rate(len(interest_list)),2))
             principal_list.append(round(self.monthly_payments - interest_list[-1], 2))
             loan = round(loan - principal_list[-1],2)
             loan_list.append(loan)
         
         #Calculate last payment
-        interest_list.append(round(loan_list[-1] * (self.interest_rate/1200),2))
+        interest_list.append(round(loan_list[-1] * self._rate(len(interest_list)),2))
         principal_list.append(loan_list[-1] + interest_list[-1])
         loan_list.append(0)
         
         return principal_list, interest_list, loan_list
 
 
+    def _rate(self, payment_index):
+        """Interest rate of a payment period, from the day count when interest accrues daily."""
+        if self.period_rates is None:
+            return self.period_rate
+        return self.period_rates[min(payment_index, len(self.period_rates) - 1)]
+
+
+    def _variable_payment_split(self):
+        """
+        Calculate the payment, principal, interest and loan balance of an adjustable-rate loan
+        or a loan with payment holidays.
+        """
+        rates = self.interest_rate if self.rate_path is None else self.rate_path[None, :]
+        if self.payment_status is None:
+            schedule = amortize(self.loan_balance, rates, self.num_months, self.frequency)
+        else:
+            schedule, _ = deferment_schedules(self.loan_balance, rates, self.num_months,
+                                              self.payment_status[None, :], self.frequency)
+        payment, principal, interest, loan = schedule.loan(0)
+
+        return np.round(payment, 2), np.round(principal, 2), np.round(interest, 2), np.round(loan, 2)
+
+
+    def _fixed_payment_split(self):
+        """
+        Calculate the payment, principal, interest and loan balance of an adjustable-rate loan
+        or a loan with payment holidays paying monthly_payments on every amortizing month, as
+        _payment_split does with a single rate. Holidays follow deferment_schedules: no payment
+        during a deferment, interest only during an interest-only period, and interest accrued
+        during a forbearance is capitalized when it ends.
+        """
+        rates = periodic_rate(np.atleast_1d(self.interest_rate if self.rate_path is None else self.rate_path),
+                              self.frequency)
+        status = np.atleast_1d(AMORTIZING if self.payment_status is None else self.payment_status)
+        payment_list, principal_list, interest_list, loan_list = [], [], [], []
+        loan = self.loan_balance
+        accrued = 0
+
+        while loan > 0:
+            period = len(loan_list)
+            if period == MAX_PERIODS:
+                raise ValueError(f"A payment of ${self.monthly_payments:,.2f} doesn't pay off the loan "
+                                 f"in {MAX_PERIODS} payments")
+            rate = rates[min(period, len(rates) - 1)]
+            period_status = status[period] if period < len(status) else AMORTIZING
+
+            if period_status == AMORTIZING:
+                interest_list.append(round(loan * rate, 2))
+                if loan > self.monthly_payments:
+                    principal_list.append(round(self.monthly_payments - interest_list[-1], 2))
+                    loan = round(loan - principal_list[-1], 2)
+                    payment_list.append(self.monthly_payments)
+                else:
+                    #Last payment clears the balance and its interest:
+                    principal_list.append(loan + interest_list[-1])
+                    loan = 0
+                    payment_list.append(principal_list[-1])
+            else:
+                interest_list.append(round(loan * rate, 2) if period_status == INTEREST_ONLY else 0)
+                principal_list.append(0)
+                payment_list.append(interest_list[-1])
+                if period_status == FORBEARANCE:
+                    accrued += round(loan * rate, 2)
+                    #Capitalize the interest on the last month of the forbearance or of its rate:
+                    next_status = status[period + 1] if period + 1 < len(status) else AMORTIZING
+                    if next_status != FORBEARANCE or rates[min(period + 1, len(rates) - 1)] != rate:
+                        loan = round(loan + accrued, 2)
+                        accrued = 0
+            loan_list.append(loan)
+
+        return (np.round(payment_list, 2), np.round(principal_list, 2), np.round(interest_list, 2),
+                np.round(loan_list, 2))
+
+
     def save_table(self, amort_table):
         """Saves amortization table."""
+        if TABLE_BACKEND == "sqlite":
+            #Imported here so the CSV backend doesn't depend on the storage package:
+            from ..storage.sqlite_store import get_catalog
+            get_catalog().save_table(self)
+            return
+
         if not os.path.exists(TABLES_PATH):
             os.makedirs(TABLES_PATH)
 
@@ -160,8 +300,13 @@ class AmortizationTable:
         #Log updated amortization table:
         self._log_amortization_table("Updated ")
         
-        #Calculate the number of months required to pay off debt:
-        principal, interest, loan = self._payment_split()
+        #Calculate the number of months required to pay off debt. With a rate path or payment
+        #holidays the new payment is kept as is and the schedule decides when the loan is paid off:
+        if self.rate_path is not None or self.payment_status is not None:
+            self.fixed_payment = True
+            _, principal, interest, loan = self._fixed_payment_split()
+        else:
+            principal, interest, loan = self._payment_split()
 
         #Update num_months:
         self.num_months = len(principal)
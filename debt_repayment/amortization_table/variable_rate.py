@@ -0,0 +1,82 @@
+from .batch import amortize
+from ..tools.constants import DEFAULT_FREQUENCY
+import numpy as np
+
+
+def step_rate_path(initial_rates, reset_periods, reset_rates, num_periods,
+                   cap=None, floor=None, periodic_cap=None):
+    """
+    Builds per-period rate paths for adjustable-rate loans from their reset schedules.
+
+    Args:
+        initial_rates (array_like): annual interest rate of each loan before the first reset
+        reset_periods (array_like): (n_loans, n_resets) payment numbers (starting at 1, as
+            in the "Pmt #" column) from which each new rate applies. Entries <= 0 are ignored,
+            so loans with fewer resets can be padded with 0
+        reset_rates (array_like): (n_loans, n_resets) annual interest rate set at each reset
+        num_periods (int): number of periods in the rate paths
+        cap (float or array_like): highest annual rate a loan can reach
+        floor (float or array_like): lowest annual rate a loan can reach
+        periodic_cap (float or array_like): largest change of the rate at a single reset
+
+    Returns:
+        np.ndarray: (n_loans, num_periods) annual interest rate for each period
+    """
+    initial_rates = np.asarray(initial_rates, dtype=float).reshape(-1)
+    n_loans = initial_rates.size
+    reset_periods = np.atleast_2d(np.asarray(reset_periods, dtype=np.int64))
+    reset_periods = np.broadcast_to(reset_periods, (n_loans, reset_periods.shape[1]))
+    reset_rates = np.broadcast_to(np.atleast_2d(np.asarray(reset_rates, dtype=float)), reset_periods.shape)
+
+    #Order resets chronologically, pushing unused entries to the end:
+    valid = reset_periods > 0
+    order = np.argsort(np.where(valid, reset_periods, np.iinfo(np.int64).max), axis=1, kind='stable')
+    reset_periods = np.take_along_axis(reset_periods, order, axis=1)
+    reset_rates = np.take_along_axis(reset_rates, order, axis=1)
+    valid = np.take_along_axis(valid, order, axis=1)
+
+    lower = -np.inf if floor is None else np.asarray(floor, dtype=float)
+    upper = np.inf if cap is None else np.asarray(cap, dtype=float)
+
+    current = np.clip(initial_rates, lower, upper)
+    path = np.repeat(current[:, None], num_periods, axis=1)
+    period = np.arange(num_periods)
+
+    #Loop over resets (few), not over periods:
+    for column in range(reset_periods.shape[1]):
+        new_rate = reset_rates[:, column]
+        if periodic_cap is not None:
+            new_rate = np.clip(new_rate, current - periodic_cap, current + periodic_cap)
+        new_rate = np.clip(new_rate, lower, upper)
+
+        applies = valid[:, column]
+        current = np.where(applies, new_rate, current)
+        from_reset = applies[:, None] & (period >= reset_periods[:, column, None] - 1)
+        path = np.where(from_reset, current[:, None], path)
+
+    return path
+
+
+def variable_rate_schedules(balances, initial_rates, reset_periods, reset_rates, num_periods,
+                            cap=None, floor=None, periodic_cap=None, frequency=DEFAULT_FREQUENCY):
+    """
+    Computes the schedules of many adjustable-rate loans at once. The payment is
+    re-amortized over the remaining term at every reset.
+
+    Args:
+        balances (array_like): amount borrowed for each loan
+        initial_rates (array_like): annual interest rate of each loan before the first reset
+        reset_periods (array_like): (n_loans, n_resets) payment numbers of the resets
+        reset_rates (array_like): (n_loans, n_resets) annual interest rate set at each reset
+        num_periods (array_like): number of payments of each loan
+        cap (float or array_like): highest annual rate a loan can reach
+        floor (float or array_like): lowest annual rate a loan can reach
+        periodic_cap (float or array_like): largest change of the rate at a single reset
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        BatchSchedule: schedules of all the loans
+    """
+    rate_path = step_rate_path(initial_rates, reset_periods, reset_rates, int(np.max(num_periods)),
+                               cap=cap, floor=floor, periodic_cap=periodic_cap)
+    return amortize(balances, rate_path, num_periods, frequency)
@@ -0,0 +1,8 @@
+PERCENTILES = (5, 25, 50, 75, 95)
+MAX_SIMULATED_MONTHS = 600
+PATHS_PER_CHUNK = 10_000
+FISCAL_YEAR_START = 1  # first month of the year in yearly rollups, 10 for the US federal fiscal year
+DISCOUNT_RATES = (0.0, 3.0, 5.0, 7.0)  # annual percent, opportunity cost of the money paid on top of inflation
+INFLATION_RATES = (0.0, 2.0, 3.0, 5.0)  # annual percent, 0 for costs in nominal terms
+PSA_BASE_CPR = 6.0  # CPR in percent reached by 100% PSA once the loans are PSA_RAMP_MONTHS old
+PSA_RAMP_MONTHS = 30
\ No newline at end of file
@@ -0,0 +1,117 @@
+from .constants import PERCENTILES, MAX_SIMULATED_MONTHS, PATHS_PER_CHUNK
+from ..tools.logger_utils import my_log
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass
+class SimulationResult:
+    """
+    Distribution of payoff months and total interest over the simulated payment paths.
+
+    Attributes:
+    ---------------------------------------------------
+        payoff_months (np.ndarray): month each path pays off the loan, inf if it doesn't
+        within the simulated horizon
+        total_interest (np.ndarray): interest paid on each path
+        payoff_percentiles (dict): percentile -> payoff month
+        interest_percentiles (dict): percentile -> total interest
+        unpaid (int): number of paths still owing money at the end of the horizon
+    """
+    payoff_months: np.ndarray
+    total_interest: np.ndarray
+    payoff_percentiles: dict
+    interest_percentiles: dict
+    unpaid: int
+
+
+def _simulate_chunk(seed, n_paths, loan_balance, monthly_rate, monthly_payment, extra_payment,
+                    extra_payment_std, skip_probability, max_months, block=12):
+    """
+    Runs n_paths payment paths of one loan. Extra payments are drawn as 2-D blocks of
+    (n_paths, block) months and every month is one vectorized step over all paths.
+    """
+    rng = np.random.default_rng(seed)
+    balance = np.full(n_paths, loan_balance)
+    total_interest = np.zeros(n_paths)
+    #A lump sum covering the balance pays the loan off before the first month:
+    payoff_months = np.where(balance <= 0, 0.0, np.inf)
+
+    for block_start in range(0, max_months, block):
+        months = min(block, max_months - block_start)
+        extras = np.maximum(rng.normal(extra_payment, extra_payment_std, (n_paths, months)), 0)
+        if skip_probability:
+            extras[rng.random((n_paths, months)) < skip_probability] = 0
+
+        for step in range(months):
+            owing = balance > 0
+            interest = np.round(balance * monthly_rate, 2)
+            #As in AmortizationTable, the last payment clears the balance and its interest:
+            due = monthly_payment + extras[:, step]
+            payment = np.where(balance <= due, balance + interest, due)
+
+            balance = np.where(owing, np.round(balance + interest - payment, 2), 0)
+            total_interest += np.where(owing, interest, 0)
+            payoff_months[owing & (balance <= 0)] = block_start + step + 1
+
+        if not (balance > 0).any():
+            break
+
+    return payoff_months, total_interest
+
+
+def simulate_payoff(loan_balance, interest_rate, monthly_payment, lump_sum=0, extra_payment=0,
+                    extra_payment_std=0, skip_probability=0, n_paths=10_000,
+                    max_months=MAX_SIMULATED_MONTHS, seed=None, n_workers=1):
+    """
+    Simulates many random repayment paths of a loan where the extra payment varies
+    month to month, and summarizes when the loan is paid off and how much interest
+    is paid. Paths are split into fixed chunks with their own seeds, so a given seed
+    gives the same results whatever the number of workers.
+
+    Args:
+        loan_balance (float): amount owed
+        interest_rate (float): annual interest rate for the loan
+        monthly_payment (float): required monthly payment
+        lump_sum (float): one-off payment made before the first month
+        extra_payment (float): average extra payment made every month
+        extra_payment_std (float): standard deviation of the extra payment
+        skip_probability (float): chance of not making the extra payment in a month
+        n_paths (int): number of simulated payment paths
+        max_months (int): number of months simulated
+        seed (int): seed of the random number generator
+        n_workers (int): number of processes running the chunks of paths
+
+    Returns:
+        SimulationResult: payoff month and total interest of every path plus percentiles
+    """
+    balance = float(loan_balance) - float(lump_sum)
+    monthly_rate = interest_rate / 1200
+
+    chunk_sizes = [min(PATHS_PER_CHUNK, n_paths - start) for start in range(0, n_paths, PATHS_PER_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    args = [(chunk_seed, size, balance, monthly_rate, monthly_payment, extra_payment,
+             extra_payment_std, skip_probability, max_months)
+            for chunk_seed, size in zip(seeds, chunk_sizes)]
+
+    if n_workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_simulate_chunk, *zip(*args)))
+    else:
+        results = [_simulate_chunk(*chunk_args) for chunk_args in args]
+
+    payoff_months = np.concatenate([months for months, _ in results])
+    total_interest = np.concatenate([interest for _, interest in results])
+
+    my_log.info(f"Simulated {n_paths} payment paths - Balance: {loan_balance} - " +\
+                f"Interest rate: {interest_rate} - Extra payment: {extra_payment}")
+
+    return SimulationResult(
+        payoff_months=payoff_months,
+        total_interest=total_interest,
+        payoff_percentiles=dict(zip(PERCENTILES,
+                                    np.percentile(payoff_months, PERCENTILES, method='nearest'))),
+        interest_percentiles=dict(zip(PERCENTILES, np.percentile(total_interest, PERCENTILES))),
+        unpaid=int(np.isinf(payoff_months).sum())
+    )
@@ -0,0 +1,159 @@
+from ..amortization_table.batch import amortize
+from ..amortization_table.dates import batch_due_dates
+from ..tools.constants import PAYMENT_FREQUENCIES, DEFAULT_FREQUENCY, MEMORY_BUDGET
+from ..tools.memory_profiler import MemoryProfiler, chunk_size, SCHEDULE_BYTES_PER_CELL
+import numpy as np
+import pandas as pd
+
+
+CASH_FLOW_COLUMNS = ("Payment_amount", "Principal_paid", "Interest_paid", "Remaining_balance", "Active_loans")
+
+
+def _due_months(start_dates, num_periods, frequency):
+    """Calendar month (months since 1970-01) of every due date, -1 past the last payment."""
+    offset = PAYMENT_FREQUENCIES[frequency][0]
+    if frequency == "monthly":
+        #Due dates fall on month starts, so a start after the 1st rolls forward to the next month:
+        starts = pd.to_datetime(np.asarray(start_dates).reshape(-1))
+        start_months = starts.values.astype('datetime64[M]').astype(np.int64) + (starts.day != 1)
+        start_months = np.broadcast_to(start_months, num_periods.shape)
+        months = start_months[:, None] + np.arange(int(num_periods.max()))
+    elif offset.endswith("D"):
+        #Fixed-day frequencies are plain date arithmetic, no calendar needed:
+        start_days = pd.to_datetime(np.asarray(start_dates).reshape(-1)).values.astype('datetime64[D]')
+        start_days = np.broadcast_to(start_days, num_periods.shape)
+        days = start_days[:, None] + np.arange(int(num_periods.max())) * np.timedelta64(int(offset[:-1]), 'D')
+        months = days.astype('datetime64[M]').astype(np.int64)
+    else:
+        months = batch_due_dates(start_dates, num_periods, frequency).astype('datetime64[M]').astype(np.int64)
+
+    months[np.arange(months.shape[1]) >= num_periods[:, None]] = -1
+    return months
+
+
+class CashFlowAccumulator:
+    """
+    Sums the cash flows of a loan book per calendar month directly from batch schedule
+    arrays, one chunk of loans at a time, without building a DataFrame per loan.
+
+    Attributes:
+    ---------------------------------------------------
+        first_month (int): calendar month (months since 1970-01) of the first total
+        totals (np.ndarray): (n_months, 5) running totals in CASH_FLOW_COLUMNS order
+
+    Methods:
+    ---------------------------------------------------
+        add: adds the schedules of a chunk of loans to the totals
+
+        result: returns the monthly totals as a DataFrame
+    """
+    def __init__(self) -> None:
+        self.first_month = None
+        self.totals = np.zeros((0, len(CASH_FLOW_COLUMNS)))
+
+
+    def _extend(self, first_month, last_month):
+        """Grows the totals so they cover the months from first_month to last_month."""
+        if self.first_month is None:
+            self.first_month = first_month
+        before = max(0, self.first_month - first_month)
+        after = max(0, last_month - (self.first_month + len(self.totals) - 1))
+        if before or after:
+            self.totals = np.pad(self.totals, ((before, after), (0, 0)))
+            self.first_month -= before
+
+
+    def add(self, schedule, start_dates, frequency=DEFAULT_FREQUENCY):
+        """
+        Adds the schedules of a chunk of loans to the monthly totals.
+
+        Args:
+            schedule (BatchSchedule): schedules of the chunk
+            start_dates (array_like): date of the first payment period of each loan
+            frequency (str): payment frequency of the chunk
+        """
+        num_periods = np.asarray(schedule.num_periods, dtype=np.int64)
+        months = _due_months(start_dates, num_periods, frequency)
+        active = months >= 0
+        if not active.any():
+            return
+
+        self._extend(int(months[active].min()), int(months.max()))
+        index = months[active] - self.first_month
+        n_months = len(self.totals)
+
+        #The outstanding balance of a loan in a month is the one after its last payment that month:
+        month_end = active.copy()
+        month_end[:, :-1] &= months[:, :-1] != months[:, 1:]
+
+        self.totals[:, 0] += np.bincount(index, weights=schedule.payment[active], minlength=n_months)
+        self.totals[:, 1] += np.bincount(index, weights=schedule.principal[active], minlength=n_months)
+        self.totals[:, 2] += np.bincount(index, weights=schedule.interest[active], minlength=n_months)
+        end_index = months[month_end] - self.first_month
+        self.totals[:, 3] += np.bincount(end_index, weights=schedule.balance[month_end], minlength=n_months)
+        self.totals[:, 4] += np.bincount(end_index, minlength=n_months)
+
+
+    def result(self):
+        """Returns the totals as a DataFrame indexed by calendar month."""
+        if self.first_month is None:
+            return pd.DataFrame(columns=CASH_FLOW_COLUMNS)
+
+        months = pd.period_range(pd.Period(np.datetime64(self.first_month, 'M'), freq='M'),
+                                 periods=len(self.totals), freq='M', name="Month")
+        df = pd.DataFrame(np.round(self.totals, 2), index=months, columns=CASH_FLOW_COLUMNS)
+        df["Active_loans"] = df["Active_loans"].astype(np.int64)
+        return df
+
+
+def portfolio_cash_flows(schedule, start_dates, frequency=DEFAULT_FREQUENCY):
+    """
+    Computes total payments, principal, interest and outstanding balance per calendar
+    month across all the loans of a batch.
+
+    Args:
+        schedule (BatchSchedule): schedules of the loans
+        start_dates (array_like): date of the first payment period of each loan
+        frequency (str): payment frequency of the loans
+
+    Returns:
+        pd.DataFrame: monthly totals indexed by calendar month
+    """
+    accumulator = CashFlowAccumulator()
+    accumulator.add(schedule, start_dates, frequency)
+    return accumulator.result()
+
+
+def book_cash_flows(balances, interest_rates, num_periods, start_dates, frequency=DEFAULT_FREQUENCY,
+                    memory_budget=MEMORY_BUDGET):
+    """
+    Amortizes a whole loan book and sums its cash flows per calendar month. The loans
+    are processed in chunks sized so the schedule arrays stay under the memory budget.
+    With MEMORY_PROFILING on, the run writes a memory report.
+
+    Args:
+        balances (array_like): amount borrowed for each loan
+        interest_rates (array_like): annual interest rate of each loan
+        num_periods (array_like): number of payments of each loan
+        start_dates (array_like): date of the first payment period of each loan
+        frequency (str): payment frequency of the loans
+        memory_budget (int): memory budget in bytes, None to amortize all loans at once
+
+    Returns:
+        pd.DataFrame: monthly totals indexed by calendar month
+    """
+    balances = np.asarray(balances, dtype=float).reshape(-1)
+    interest_rates, num_periods, start_dates = (np.broadcast_to(np.asarray(x).reshape(-1), balances.shape)
+                                                for x in (interest_rates, num_periods, start_dates))
+
+    n_loans = balances.size
+    bytes_per_loan = SCHEDULE_BYTES_PER_CELL * int(num_periods.max(initial=1))
+    step = chunk_size(n_loans, bytes_per_loan, memory_budget)
+
+    accumulator = CashFlowAccumulator()
+    with MemoryProfiler() as profiler, profiler.stage(f"book cash flows, {n_loans} loans in chunks of {step}"):
+        for first in range(0, n_loans, step):
+            chunk = slice(first, first + step)
+            schedule = amortize(balances[chunk], interest_rates[chunk], num_periods[chunk], frequency)
+            accumulator.add(schedule, start_dates[chunk], frequency)
+        return accumulator.result()
@@ -0,0 +1,133 @@
+from .constants import PSA_BASE_CPR, PSA_RAMP_MONTHS
+from ..amortization_table.batch import amortize
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+
+PROJECTION_COLUMNS = ("Scheduled_principal", "Prepaid_principal", "Interest_paid", "Remaining_balance", "Cash_flow")
+
+
+@dataclass
+class PoolProjection:
+    """
+    Expected monthly cash flows of loan pools under prepayment scenarios. Every field
+    is an (n_scenarios, n_pools, n_months) array; months after a pool's last contractual
+    payment are zero.
+
+    Attributes:
+    ---------------------------------------------------
+        scheduled_principal (np.ndarray): contractual principal paid by the surviving loans
+        prepaid_principal (np.ndarray): principal paid ahead of schedule
+        interest (np.ndarray): interest paid
+        balance (np.ndarray): surviving balance after the month's payments
+        smm (np.ndarray): single monthly mortality rate applied each month
+
+    Methods:
+    ---------------------------------------------------
+        pool: returns the projection of one pool under one scenario as a DataFrame
+
+        totals: returns the cash flows summed over all pools for every scenario
+    """
+    scheduled_principal: np.ndarray
+    prepaid_principal: np.ndarray
+    interest: np.ndarray
+    balance: np.ndarray
+    smm: np.ndarray
+
+    @property
+    def cash_flow(self):
+        return self.scheduled_principal + self.prepaid_principal + self.interest
+
+    def pool(self, scenario, index):
+        """Returns the monthly projection of one pool under one scenario."""
+        values = (self.scheduled_principal, self.prepaid_principal, self.interest, self.balance, self.cash_flow)
+        return pd.DataFrame({column: value[scenario, index] for column, value in zip(PROJECTION_COLUMNS, values)},
+                            index=pd.RangeIndex(1, self.balance.shape[2] + 1, name="Month"))
+
+    def totals(self):
+        """Returns the (n_scenarios, n_months, 5) cash flows of all pools together, in PROJECTION_COLUMNS order."""
+        values = (self.scheduled_principal, self.prepaid_principal, self.interest, self.balance, self.cash_flow)
+        return np.stack([value.sum(axis=1) for value in values], axis=-1)
+
+
+def smm_from_cpr(cpr):
+    """
+    Single monthly mortality rate, the fraction of the balance prepaid in a month,
+    equivalent to a conditional prepayment rate: 1 - SMM = (1 - CPR)^(1/12).
+
+    Args:
+        cpr (array_like): annual conditional prepayment rates, in percent
+
+    Returns:
+        np.ndarray: monthly prepayment fractions
+    """
+    return 1 - (1 - np.asarray(cpr, dtype=float) / 100) ** (1 / 12)
+
+
+def psa_cpr(speeds, n_months, ages=0):
+    """
+    CPR curves of the PSA benchmark: 100% PSA ramps up by PSA_BASE_CPR / PSA_RAMP_MONTHS
+    a month until the loans are PSA_RAMP_MONTHS months old, then stays at PSA_BASE_CPR.
+    Other speeds scale the curve.
+
+    Args:
+        speeds (array_like): PSA speed of each scenario, in percent (100 is the benchmark)
+        n_months (int): number of months projected
+        ages (array_like): age in months of each pool's loans at the start of the projection
+
+    Returns:
+        np.ndarray: (n_scenarios, n_pools, n_months) CPR in percent
+    """
+    speeds = np.asarray(speeds, dtype=float).reshape(-1, 1, 1)
+    ages = np.asarray(ages, dtype=np.int64).reshape(1, -1, 1)
+    month_age = ages + np.arange(1, n_months + 1)
+    return speeds / 100 * PSA_BASE_CPR * np.minimum(month_age, PSA_RAMP_MONTHS) / PSA_RAMP_MONTHS
+
+
+def project_pools(balances, rates, remaining_terms, cpr):
+    """
+    Projects the cash flows of loan pools under prepayment scenarios, vectorized over
+    pools and scenarios. Each pool amortizes like one loan with its rate and remaining
+    term, and the loans prepaid each month take their share of the contractual schedule
+    with them. The projection is therefore the contractual schedule scaled by the
+    fraction of the pool surviving each month. No loop over the months is needed.
+
+    Args:
+        balances (array_like): current balance of each pool
+        rates (array_like): annual interest rate of each pool, either one rate per pool
+            or an (n_pools, n_months) matrix of per-month rates
+        remaining_terms (array_like): remaining number of monthly payments of each pool
+        cpr (array_like): annual prepayment rates in percent, one constant rate per
+            scenario, an (n_scenarios, n_months) curve per scenario, or an
+            (n_scenarios, n_pools, n_months) curve per scenario and pool such as psa_cpr's.
+            Curves shorter than the longest term keep their last rate
+
+    Returns:
+        PoolProjection: projected cash flows of every pool under every scenario
+    """
+    balances = np.asarray(balances, dtype=float).reshape(-1)
+    contract = amortize(balances, rates, remaining_terms)
+    n_pools, n_months = contract.balance.shape
+
+    cpr = np.asarray(cpr, dtype=float)
+    if cpr.ndim <= 1:
+        cpr = cpr.reshape(-1, 1, 1)
+    elif cpr.ndim == 2:
+        cpr = cpr[:, None, :]
+    if cpr.shape[2] < n_months:
+        cpr = np.concatenate([cpr, np.repeat(cpr[:, :, -1:], n_months - cpr.shape[2], axis=2)], axis=2)
+    smm = np.broadcast_to(smm_from_cpr(cpr[:, :, :n_months]), (len(cpr), n_pools, n_months))
+
+    #Fraction of the pool still outstanding after each month's prepayments, and before them:
+    survival = np.cumprod(1 - smm, axis=2)
+    previous = np.ones_like(survival)
+    previous[:, :, 1:] = survival[:, :, :-1]
+
+    return PoolProjection(
+        scheduled_principal=previous * contract.principal,
+        prepaid_principal=(previous - survival) * contract.balance,
+        interest=previous * contract.interest,
+        balance=survival * contract.balance,
+        smm=smm
+    )
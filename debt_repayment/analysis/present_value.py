@@ -0,0 +1,144 @@
+from .constants import DISCOUNT_RATES, INFLATION_RATES
+from ..tools.constants import PAYMENT_FREQUENCIES, DEFAULT_FREQUENCY
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+
+COST_COLUMNS = ("Discount_rate", "Inflation_rate", "Combined_rate", "Present_value", "Cost")
+
+
+@lru_cache(maxsize=64)
+def _discount_factors(annual_rates, n_periods, frequency):
+    periods_per_year = PAYMENT_FREQUENCIES[frequency][1]
+    years = np.arange(1, n_periods + 1) / periods_per_year
+    factors = (1 + np.asarray(annual_rates, dtype=float)[:, None] / 100) ** -years
+    factors.flags.writeable = False
+    return factors
+
+
+def discount_factors(annual_rates, n_periods, frequency=DEFAULT_FREQUENCY):
+    """
+    Value today of one dollar paid at each payment, for every annual rate. Payment t is
+    discounted by (1 + rate)^(t / payments per year). Tables are cached, so scenarios
+    sharing rates and a term reuse the same (read-only) matrix.
+
+    Args:
+        annual_rates (array_like): annual discount or inflation rates, in percent
+        n_periods (int): number of payments
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        np.ndarray: (n_rates, n_periods) discount factors
+    """
+    rates = tuple(np.asarray(annual_rates, dtype=float).reshape(-1).tolist())
+    return _discount_factors(rates, int(n_periods), frequency)
+
+
+def present_values(payments, annual_rates, frequency=DEFAULT_FREQUENCY):
+    """
+    Present value of payment streams at every annual rate, as one product of the
+    payments with the discount factor matrix.
+
+    Args:
+        payments (array_like): payment of every period, one stream or an
+            (n_loans, n_periods) matrix with zeros past the last payment
+        annual_rates (array_like): annual discount or inflation rates, in percent
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        np.ndarray: (n_rates,) present values, or (n_loans, n_rates) for a matrix
+    """
+    payments = np.asarray(payments, dtype=float)
+    return payments @ discount_factors(annual_rates, payments.shape[-1], frequency).T
+
+
+def combined_rates(discount_rates, inflation_rates):
+    """
+    Nominal rate of every pair of discount and inflation rates, (1 + d) * (1 + i) - 1:
+    a payment is deflated to today's prices by the inflation and discounted by what the
+    money could earn on top of it.
+
+    Args:
+        discount_rates (array_like): annual discount rates, in percent
+        inflation_rates (array_like): annual inflation rates, in percent
+
+    Returns:
+        np.ndarray: (n_discount_rates, n_inflation_rates) combined rates, in percent
+    """
+    discount_rates = np.asarray(discount_rates, dtype=float).reshape(-1, 1)
+    inflation_rates = np.asarray(inflation_rates, dtype=float).reshape(1, -1)
+    return ((1 + discount_rates / 100) * (1 + inflation_rates / 100) - 1) * 100
+
+
+def cost_scenarios(payments, balance, discount_rates=DISCOUNT_RATES, inflation_rates=INFLATION_RATES,
+                   frequency=DEFAULT_FREQUENCY):
+    """
+    Cost of a loan in today's dollars. Every pair of a discount rate, what the money
+    could earn instead on top of inflation, and an inflation rate is one scenario. Its
+    fixed payments are deflated by both, at the combined rate of the pair, so they are
+    worth less the higher either rate is and a longer term costs less than its total
+    interest suggests. Cost is the present value of the payments minus the amount
+    borrowed. All scenarios take one matrix-vector product.
+
+    Args:
+        payments (array_like): payment of every period. An (n_loans, n_periods) matrix
+            of a whole portfolio is summed per period first, each loan counted from its
+            own first payment
+        balance (float or array_like): amount borrowed, or of each loan
+        discount_rates (array_like): annual discount rates, in percent
+        inflation_rates (array_like): annual inflation rates, in percent
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        pd.DataFrame: combined rate, present value of the payments and cost for every pair
+            of rates, discount rate first
+    """
+    payments = np.asarray(payments, dtype=float)
+    stream = payments.sum(axis=0) if payments.ndim == 2 else payments
+    discount_rates = np.asarray(discount_rates, dtype=float).reshape(-1)
+    inflation_rates = np.asarray(inflation_rates, dtype=float).reshape(-1)
+
+    rates = combined_rates(discount_rates, inflation_rates).reshape(-1)
+    values = present_values(stream, rates, frequency)
+    return pd.DataFrame({
+        "Discount_rate": np.repeat(discount_rates, len(inflation_rates)),
+        "Inflation_rate": np.tile(inflation_rates, len(discount_rates)),
+        "Combined_rate": np.round(rates, 4),
+        "Present_value": np.round(values, 2),
+        "Cost": np.round(values - np.sum(balance), 2)
+    }, columns=COST_COLUMNS)
+
+
+def table_cash_flows(amortization_df):
+    """
+    Cash paid each period of an amortization table, lump sums included, from the drop
+    in balance plus the interest, and the balance the table starts from.
+
+    Args:
+        amortization_df (pd.DataFrame): amortization table, as shown
+
+    Returns:
+        tuple: (n_periods,) cash paid each period and the balance before the first payment
+    """
+    remaining = amortization_df["Remaining_balance"].to_numpy(dtype=float)
+    balance = remaining[0] + float(amortization_df["Principal_paid"].iloc[0])
+    paid = -np.diff(remaining, prepend=balance) + amortization_df["Interest_paid"].to_numpy(dtype=float)
+    return paid, balance
+
+
+def portfolio_costs(schedule, balances, annual_rates=DISCOUNT_RATES, frequency=DEFAULT_FREQUENCY):
+    """
+    Cost in today's dollars of every loan of a batch at every annual rate.
+
+    Args:
+        schedule (BatchSchedule): schedules of the loans
+        balances (array_like): amount borrowed for each loan
+        annual_rates (array_like): annual discount or inflation rates, in percent
+        frequency (str): payment frequency of the loans
+
+    Returns:
+        np.ndarray: (n_loans, n_rates) present value of the payments minus the balance
+    """
+    balances = np.asarray(balances, dtype=float).reshape(-1, 1)
+    return present_values(schedule.payment, annual_rates, frequency) - balances
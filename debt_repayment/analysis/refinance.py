@@ -0,0 +1,102 @@
+from ..tools.payments_utils import calculate_payments
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class RefinanceComparison:
+    """
+    Cost of keeping the current loan against each refinance offer. Costs are the
+    cumulative interest paid plus, for offers, their fees.
+
+    Attributes:
+    ---------------------------------------------------
+        current_cost (np.ndarray): (n_months,) cumulative cost of the current loan
+        offer_costs (np.ndarray): (n_offers, n_months) cumulative cost of each offer
+        monthly_payments (np.ndarray): monthly payment of each offer
+        break_even_month (np.ndarray): month from which the offer stays no more costly than
+        the current loan, -1 if it ends up costing more
+        lifetime_savings (np.ndarray): total cost of the current loan minus that of the offer
+
+    Methods:
+    ---------------------------------------------------
+        ranking: returns the offers sorted by lifetime savings
+    """
+    current_cost: np.ndarray
+    offer_costs: np.ndarray
+    monthly_payments: np.ndarray
+    break_even_month: np.ndarray
+    lifetime_savings: np.ndarray
+
+    def ranking(self):
+        """Offers sorted from the largest to the smallest lifetime savings."""
+        df = pd.DataFrame({
+            "Offer": np.arange(len(self.lifetime_savings)),
+            "Monthly_payment": self.monthly_payments,
+            "Break_even_month": self.break_even_month,
+            "Lifetime_savings": np.round(self.lifetime_savings, 2)
+        })
+        return df.sort_values("Lifetime_savings", ascending=False, ignore_index=True)
+
+
+def _cumulative_interest(amount, int_rate, duration, n_months):
+    """
+    Interest paid by the end of every month for a batch of loans with the payments
+    from calculate_payments, in closed form. Returns an (n_loans, n_months) array.
+    """
+    amount, int_rate, duration = np.broadcast_arrays(np.asarray(amount, dtype=float),
+                                                     np.asarray(int_rate, dtype=float),
+                                                     np.asarray(duration, dtype=np.int64))
+    payment = calculate_payments(amount, int_rate, duration)[:, None]
+    rate = int_rate[:, None] / 1200
+    months = np.minimum(np.arange(1, n_months + 1), duration[:, None])
+
+    #Balance after the payments, the last one absorbing the rounding of the payment:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1 + rate)**months
+        balance = amount[:, None] * growth - payment * (growth - 1) / rate
+    balance = np.where(rate == 0, amount[:, None] - months * payment, balance)
+
+    return months * payment - amount[:, None] + balance
+
+
+def compare_refinance(loan_balance, interest_rate, remaining_months, offer_rates, offer_terms,
+                      offer_fees=0, roll_in_fees=False):
+    """
+    Compares keeping the current loan against many refinance offers at once.
+
+    Args:
+        loan_balance (float): amount still owed on the current loan
+        interest_rate (float): annual interest rate of the current loan
+        remaining_months (int): months left on the current loan
+        offer_rates (array_like): annual interest rate of each offer
+        offer_terms (array_like): duration of each offer in months
+        offer_fees (array_like): closing costs of each offer
+        roll_in_fees (bool): add the fees to the new balance instead of paying them upfront
+
+    Returns:
+        RefinanceComparison: cost curves, break-even month and savings of every offer
+    """
+    offer_rates = np.atleast_1d(np.asarray(offer_rates, dtype=float))
+    offer_terms = np.broadcast_to(np.asarray(offer_terms, dtype=np.int64), offer_rates.shape)
+    offer_fees = np.broadcast_to(np.asarray(offer_fees, dtype=float), offer_rates.shape)
+    n_months = int(max(remaining_months, offer_terms.max()))
+
+    current_cost = _cumulative_interest([loan_balance], [interest_rate], [remaining_months], n_months)[0]
+
+    offer_balances = loan_balance + (offer_fees if roll_in_fees else np.zeros(offer_rates.shape))
+    offer_costs = _cumulative_interest(offer_balances, offer_rates, offer_terms, n_months) + offer_fees[:, None]
+
+    #Break even once the offer is cheaper for every remaining month:
+    cheaper = offer_costs <= current_cost
+    stays_cheaper = np.logical_and.accumulate(cheaper[:, ::-1], axis=1)[:, ::-1]
+    break_even_month = np.where(stays_cheaper[:, -1], stays_cheaper.argmax(axis=1) + 1, -1)
+
+    return RefinanceComparison(
+        current_cost=current_cost,
+        offer_costs=offer_costs,
+        monthly_payments=calculate_payments(offer_balances, offer_rates, offer_terms),
+        break_even_month=break_even_month,
+        lifetime_savings=current_cost[-1] - offer_costs[:, -1]
+    )
@@ -0,0 +1,128 @@
+from .constants import FISCAL_YEAR_START
+from .portfolio import _due_months
+from ..tools.constants import DEFAULT_FREQUENCY
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+
+ROLLUP_COLUMNS = ("Payment_amount", "Principal_paid", "Interest_paid", "Remaining_balance")
+
+
+@dataclass
+class YearlyRollup:
+    """
+    Yearly totals of the schedules of a batch of loans. Every field except years is an
+    (n_loans, n_years) array; years a loan has no payment due in are zero.
+
+    Attributes:
+    ---------------------------------------------------
+        years (np.ndarray): calendar or fiscal year of each column
+        payment (np.ndarray): amount paid during the year
+        principal (np.ndarray): principal paid during the year
+        interest (np.ndarray): interest paid during the year
+        balance (np.ndarray): remaining balance after the last payment of the year
+        num_payments (np.ndarray): number of payments due during the year
+
+    Methods:
+    ---------------------------------------------------
+        loan: returns the yearly totals of a single loan as a DataFrame
+    """
+    years: np.ndarray
+    payment: np.ndarray
+    principal: np.ndarray
+    interest: np.ndarray
+    balance: np.ndarray
+    num_payments: np.ndarray
+
+    def loan(self, index):
+        """Returns the yearly totals of one loan, indexed by year, for the years it has payments due in."""
+        paid = self.num_payments[index] > 0
+        values = (self.payment[index], self.principal[index], self.interest[index], self.balance[index])
+        return pd.DataFrame({column: np.round(value[paid], 2) for column, value in zip(ROLLUP_COLUMNS, values)},
+                            index=pd.Index(self.years[paid], name="Year"))
+
+
+def period_years(months, fiscal_start=FISCAL_YEAR_START):
+    """
+    Year of every due date from its calendar month (months since 1970-01). Fiscal years
+    are named after the calendar year they end in, so with fiscal_start=10 October 2024
+    falls in fiscal year 2025. Negative months (past the last payment) stay -1.
+
+    Args:
+        months (np.ndarray): calendar month of every due date
+        fiscal_start (int): first month of the year, 1 for calendar years
+
+    Returns:
+        np.ndarray: year of every due date
+    """
+    shift = (13 - fiscal_start) % 12
+    return np.where(months >= 0, (months + shift) // 12 + 1970, -1)
+
+
+def _rollup(years, payment, principal, interest, balance):
+    """
+    Sums the periods of every loan per year. The active periods are flattened row by
+    row, so each (loan, year) pair is a contiguous run and one np.add.reduceat sums
+    all of them, and the balance at the end of each run is the year-end balance.
+    """
+    active = years >= 0
+    if not active.any():
+        return YearlyRollup(np.zeros(0, dtype=np.int64), *(np.zeros((len(years), 0)) for _ in range(5)))
+
+    first_year = int(years[active].min())
+    n_years = int(years.max()) - first_year + 1
+    rows = np.nonzero(active)[0]
+    key = rows * n_years + (years[active] - first_year)
+
+    starts = np.flatnonzero(np.concatenate([[True], key[1:] != key[:-1]]))
+    ends = np.concatenate([starts[1:], [len(key)]]) - 1
+    sums = np.add.reduceat(np.stack([payment[active], principal[active], interest[active]], axis=1), starts, axis=0)
+
+    totals = np.zeros((5, len(years) * n_years))
+    totals[:3, key[starts]] = sums.T
+    totals[3, key[starts]] = balance[active][ends]
+    totals[4, key[starts]] = ends - starts + 1
+    payment, principal, interest, balance, num_payments = totals.reshape(5, len(years), n_years)
+    return YearlyRollup(np.arange(first_year, first_year + n_years), payment, principal, interest, balance,
+                        num_payments.astype(np.int64))
+
+
+def yearly_rollups(schedule, start_dates, frequency=DEFAULT_FREQUENCY, fiscal_start=FISCAL_YEAR_START):
+    """
+    Computes the payments, principal, interest and year-end balance of every loan of a
+    batch per calendar or fiscal year, e.g. the interest to report for a tax year.
+
+    Args:
+        schedule (BatchSchedule): schedules of the loans
+        start_dates (array_like): date of the first payment period of each loan
+        frequency (str): payment frequency of the loans
+        fiscal_start (int): first month of the year, 1 for calendar years
+
+    Returns:
+        YearlyRollup: yearly totals of every loan
+    """
+    num_periods = np.asarray(schedule.num_periods, dtype=np.int64)
+    months = _due_months(start_dates, num_periods, frequency)
+    n_max = months.shape[1]
+    return _rollup(period_years(months, fiscal_start), schedule.payment[:, :n_max], schedule.principal[:, :n_max],
+                   schedule.interest[:, :n_max], schedule.balance[:, :n_max])
+
+
+def table_rollup(amortization_df, fiscal_start=FISCAL_YEAR_START):
+    """
+    Yearly totals of the schedule of an AmortizationTable.
+
+    Args:
+        amortization_df (pd.DataFrame): amortization table with its due dates
+        fiscal_start (int): first month of the year, 1 for calendar years
+
+    Returns:
+        pd.DataFrame: payments, principal, interest and year-end balance indexed by year
+    """
+    dates = pd.DatetimeIndex(amortization_df["Due date"])
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    months = dates.values.astype('datetime64[M]').astype(np.int64)[None, :]
+    values = (amortization_df[column].to_numpy(dtype=float)[None, :] for column in ROLLUP_COLUMNS)
+    return _rollup(period_years(months, fiscal_start), *values).loan(0)
@@ -1 +1,7 @@
-TEXTSIZE = 12
\ No newline at end of file
+TEXTSIZE = 12
+TABLE_ROWS = 20
+CHART_HEIGHT = 220
+ENGINE = "auto"  # "auto" or a name from amortization_table.engines.ENGINES
+LATENCY_MONITOR = False  # log event-loop lag and slow callbacks, with a summary on exit
+HEARTBEAT_MS = 50
+SLOW_FRAME_MS = 100
\ No newline at end of file
@@ -0,0 +1,4 @@
+HOST = "127.0.0.1"
+PORT = 8765
+STREAM_CHUNK_ROWS = 500
+MAX_BODY_BYTES = 10 * 1024 * 1024
\ No newline at end of file
@@ -0,0 +1,120 @@
+from .constants import HOST, PORT
+import argparse
+import asyncio
+import json
+import random
+import time
+import numpy as np
+
+
+def _random_loan(rng):
+    """Loan request body with random balance, rate and duration."""
+    return {
+        "loan_balance": round(rng.uniform(1_000, 500_000), 2),
+        "interest_rate": round(rng.uniform(1, 12), 3),
+        "num_months": rng.choice([60, 120, 180, 360])
+    }
+
+
+def _request_body(endpoint, rng, batch_size, repeat_ratio):
+    """JSON body for one request. A share of requests repeats a fixed loan to exercise coalescing."""
+    if endpoint == "batch":
+        return {"loans": [_random_loan(rng) for _ in range(batch_size)]}
+    if rng.random() < repeat_ratio:
+        return {"loan_balance": 30000.0, "interest_rate": 4.3, "num_months": 120}
+    return _random_loan(rng)
+
+
+async def _read_response(reader):
+    """Reads one HTTP response with either a Content-Length or a chunked body."""
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding") == "chunked":
+        body = bytearray()
+        while (size := int((await reader.readline()).strip(), 16)):
+            body += await reader.readexactly(size)
+            await reader.readline()
+        await reader.readline()
+        return status, bytes(body)
+
+    return status, await reader.readexactly(int(headers.get("content-length", 0)))
+
+
+async def _client(host, port, endpoint, n_requests, latencies, errors, rng, batch_size, repeat_ratio):
+    """Sends n_requests sequentially over one keep-alive connection."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n_requests):
+            body = json.dumps(_request_body(endpoint, rng, batch_size, repeat_ratio)).encode()
+            start = time.perf_counter()
+            writer.write(
+                f"POST /{endpoint} HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            status, _ = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load_test(host=HOST, port=PORT, endpoint="payments", n_requests=2000, concurrency=50,
+                        batch_size=100, repeat_ratio=0.2, seed=0):
+    """
+    Sends requests to a running PaymentServer from concurrent keep-alive clients.
+
+    Args:
+        host (str): address of the server
+        port (int): port of the server
+        endpoint (str): payments, schedule or batch
+        n_requests (int): total number of requests
+        concurrency (int): number of concurrent connections
+        batch_size (int): number of loans per batch request
+        repeat_ratio (float): share of requests repeating the same loan
+        seed (int): seed for the random loans
+
+    Returns:
+        dict: throughput, latency percentiles in milliseconds and number of errors
+    """
+    latencies, errors = [], []
+    per_client = [n_requests // concurrency + (i < n_requests % concurrency) for i in range(concurrency)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _client(host, port, endpoint, n, latencies, errors, random.Random(seed + i), batch_size, repeat_ratio)
+        for i, n in enumerate(per_client) if n
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 2),
+        "errors": len(errors)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the local payment service.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--endpoint", choices=["payments", "schedule", "batch"], default="payments")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--repeat-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run_load_test(args.host, args.port, args.endpoint, args.requests,
+                                               args.concurrency, args.batch_size, args.repeat_ratio)),
+                     indent=2))
@@ -0,0 +1,270 @@
+from .constants import HOST, PORT, STREAM_CHUNK_ROWS, MAX_BODY_BYTES
+from ..amortization_table.kernels import cents_exact_schedules
+from ..amortization_table.dates import due_dates
+from ..tools.constants import DEFAULT_FREQUENCY
+from ..tools.payments_utils import calculate_payments, calculate_total_interest, calculate_total_paid
+from ..tools.logger_utils import my_log
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+import argparse
+import asyncio
+import json
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+
+def _loan_args(loan):
+    """Balance, interest rate, number of payments and frequency of a loan in a request body."""
+    args = (float(loan["loan_balance"]), float(loan["interest_rate"]), int(loan["num_months"]),
+            loan.get("frequency", DEFAULT_FREQUENCY))
+    if args[0] <= 0 or args[1] < 0 or args[2] <= 0:
+        raise ValueError("loan_balance and num_months must be positive and interest_rate not negative")
+    return args
+
+
+def _payment_metrics(loan):
+    """Monthly payment, total repaid and total interest of one loan."""
+    args = _loan_args(loan)
+    return {
+        "monthly_payment": calculate_payments(*args),
+        "total_repaid": round(calculate_total_paid(*args), 2),
+        "total_interest": round(calculate_total_interest(*args), 2)
+    }
+
+
+def _batch_metrics(body):
+    """Payment metrics of every loan of a batch request."""
+    return [_payment_metrics(loan) for loan in body["loans"]]
+
+
+def _schedule_columns(loan):
+    """Amortization table of one loan, rounded to cents every payment like AmortizationTable."""
+    loan_balance, interest_rate, num_months, frequency = _loan_args(loan)
+    payment = calculate_payments(loan_balance, interest_rate, num_months, frequency)
+    schedule = cents_exact_schedules(loan_balance, interest_rate, payment, frequency=frequency)
+    payment, principal, interest, balance = schedule.loan(0)
+    dates = due_dates(pd.Timestamp.now().date(), len(payment), frequency)
+
+    return {
+        "Pmt #": list(range(1, len(payment) + 1)),
+        "Due date": [date.isoformat() for date in dates],
+        "Payment_amount": np.round(payment, 2).tolist(),
+        "Principal_paid": np.round(principal, 2).tolist(),
+        "Interest_paid": np.round(interest, 2).tolist(),
+        "Remaining_balance": np.round(balance, 2).tolist()
+    }
+
+
+class BadRequest(Exception):
+    """Raised when a request can't be parsed or is missing loan fields."""
+
+
+class PaymentServer:
+    """
+    Local HTTP/JSON service exposing the payment and amortization calculations so
+    other tools don't need to embed the Tk application.
+
+    Endpoints (all POST with a JSON body):
+        /payments: {"loan_balance", "interest_rate", "num_months", "frequency"?} ->
+        monthly payment, total repaid and total interest
+        /schedule: same body -> amortization table streamed as a JSON array of rows
+        /batch: {"loans": [...]} -> payment metrics of every loan
+
+    Attributes:
+    ---------------------------------------------------
+        host (str): interface the server listens on
+        port (int): port the server listens on
+        executor (ProcessPoolExecutor): runs the calculations off the event loop
+        in_flight (dict): pending calculations, shared by identical concurrent requests
+
+    Methods:
+    ---------------------------------------------------
+        serve_forever: starts listening and handles connections until cancelled
+
+        handle_connection: reads keep-alive HTTP requests from one client
+
+        compute: runs a calculation in the process pool, coalescing identical requests
+    """
+    def __init__(self, host=HOST, port=PORT, max_workers=None) -> None:
+        self.host = host
+        self.port = port
+        #Workers come from a fork server, so they don't inherit open client sockets or the
+        #threads of the numerical libraries:
+        self.executor = ProcessPoolExecutor(max_workers=max_workers,
+                                            mp_context=multiprocessing.get_context("forkserver"))
+        self.in_flight = {}
+        self.routes = {
+            "/payments": _payment_metrics,
+            "/schedule": _schedule_columns,
+            "/batch": _batch_metrics
+        }
+
+
+    async def serve_forever(self):
+        """Starts listening and handles connections until cancelled."""
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        my_log.info(f"Payment service listening on http://{self.host}:{self.port}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+
+    async def compute(self, path, body):
+        """
+        Runs the calculation of an endpoint in the process pool. Concurrent requests with
+        the same path and body wait on the same calculation instead of repeating it.
+        """
+        key = (path, json.dumps(body, sort_keys=True))
+        if key not in self.in_flight:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, self.routes[path], body)
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+
+        return await asyncio.shield(self.in_flight[key])
+
+
+    async def handle_connection(self, reader, writer):
+        """Serves HTTP/1.1 requests from one client until it closes the connection."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except BadRequest as error:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": str(error)}, False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, raw_body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    if path not in self.routes:
+                        await self._respond(writer, HTTPStatus.NOT_FOUND,
+                                            {"error": f"Unknown path {path}"}, keep_alive)
+                    elif method != "POST":
+                        await self._respond(writer, HTTPStatus.METHOD_NOT_ALLOWED,
+                                            {"error": "Use POST"}, keep_alive)
+                    else:
+                        body = self._parse_body(raw_body)
+                        result = await self.compute(path, body)
+                        if path == "/schedule":
+                            await self._stream_rows(writer, result, keep_alive)
+                        else:
+                            await self._respond(writer, HTTPStatus.OK, result, keep_alive)
+                except KeyError as error:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST,
+                                        {"error": f"Missing field {error}"}, keep_alive)
+                except (BadRequest, TypeError, ValueError) as error:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": str(error)}, keep_alive)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    raise
+                except Exception as error:
+                    my_log.exception(f"Request to {path} failed")
+                    await self._respond(writer, HTTPStatus.INTERNAL_SERVER_ERROR,
+                                        {"error": f"{type(error).__name__}: {error}"}, False)
+                    break
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+    @staticmethod
+    async def _read_request(reader):
+        """Reads one request. Returns None when the client closed the connection."""
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+
+        try:
+            method, path, _ = request_line.decode("latin-1").split()
+        except ValueError:
+            raise ConnectionError("Malformed request line")
+
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise BadRequest(f"Invalid Content-Length {headers['content-length']!r}")
+        if length < 0:
+            raise BadRequest(f"Invalid Content-Length {length}")
+        if length > MAX_BODY_BYTES:
+            raise ConnectionError("Request body too large")
+
+        body = await reader.readexactly(length) if length else b""
+        return method, path, headers, body
+
+
+    @staticmethod
+    def _parse_body(raw_body):
+        """Decodes the JSON body of a request."""
+        try:
+            body = json.loads(raw_body or b"{}")
+        except json.JSONDecodeError as error:
+            raise BadRequest(f"Invalid JSON: {error}")
+
+        if not isinstance(body, dict):
+            raise BadRequest("Request body must be a JSON object")
+        return body
+
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        """Writes a complete JSON response."""
+        content = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(content)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + content
+        )
+        await writer.drain()
+
+
+    @staticmethod
+    async def _stream_rows(writer, columns, keep_alive):
+        """Streams an amortization table as a JSON array using chunked transfer encoding."""
+        writer.write(
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/json\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+        )
+
+        names = list(columns)
+        rows = list(zip(*columns.values()))
+        for start in range(0, len(rows), STREAM_CHUNK_ROWS):
+            chunk = ",".join(json.dumps(dict(zip(names, row)))
+                             for row in rows[start:start + STREAM_CHUNK_ROWS])
+            data = (("[" if start == 0 else ",") + chunk).encode()
+            writer.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            await writer.drain()
+
+        closing = b"]" if rows else b"[]"
+        writer.write(f"{len(closing):X}\r\n".encode() + closing + b"\r\n0\r\n\r\n")
+        await writer.drain()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local JSON service for loan payment calculations.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=None, help="size of the process pool")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(PaymentServer(args.host, args.port, args.workers).serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,8 @@
+STORES_PATH = "debt_repayment/files/stores/"
+SCHEDULE_COLUMNS = ("payment", "principal", "interest", "balance")
+CATALOG_PATH = "debt_repayment/files/tables.db"
+EXPORTS_PATH = "debt_repayment/files/exports/"
+EXPORT_CHUNK_LOANS = 2_000
+EXPORT_WORKERS = 2
+EXPORT_QUEUE_SIZE = 4  # chunks waiting for the writer before the workers block
+EXPORT_BUFFER_BYTES = 16 * 2**20
\ No newline at end of file
@@ -0,0 +1,133 @@
+from .constants import (EXPORTS_PATH, EXPORT_CHUNK_LOANS, EXPORT_WORKERS, EXPORT_QUEUE_SIZE,
+                        EXPORT_BUFFER_BYTES)
+from ..amortization_table.engines import select_engine
+from ..tools.constants import DEFAULT_FREQUENCY
+from ..tools.logger_utils import my_log
+from ..tools.memory_profiler import MemoryProfiler
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+import multiprocessing
+import time
+import numpy as np
+
+
+EXPORT_COLUMNS = ("Loan", "Pmt #", "Payment_amount", "Principal_paid", "Interest_paid", "Remaining_balance")
+ROW_FORMAT = "%s,%d,%.2f,%.2f,%.2f,%.2f\n"
+
+
+@dataclass
+class ExportStats:
+    """
+    Timings of an export. compute_seconds adds up the time the workers spent computing
+    and formatting schedules, write_seconds the time the writer spent waiting for them
+    and writing. With the stages overlapped, total_seconds is close to the slower one.
+    """
+    path: Path
+    n_loans: int
+    n_rows: int
+    compute_seconds: float
+    write_seconds: float
+    total_seconds: float
+
+
+def _format_chunk(loan_ids, schedule):
+    """CSV rows, without header, of the schedules of a chunk of loans."""
+    n_max = schedule.payment.shape[1]
+    active = np.arange(n_max) < schedule.num_periods[:, None]
+    loans, periods = np.nonzero(active)
+
+    #One % operation over the whole chunk is several times faster than DataFrame.to_csv:
+    rows = np.empty((len(loans), len(EXPORT_COLUMNS)), dtype=object)
+    rows[:, 0] = np.asarray(loan_ids)[loans]
+    rows[:, 1] = periods + 1
+    for column, values in enumerate((schedule.payment, schedule.principal, schedule.interest, schedule.balance)):
+        rows[:, column + 2] = values[active]
+    return (ROW_FORMAT * len(rows)) % tuple(rows.ravel().tolist()), len(rows)
+
+
+def _export_chunk(engine, balances, interest_rates, payments, loan_ids, frequency):
+    """Computes and formats the schedules of a chunk of loans, run by the workers."""
+    start = time.perf_counter()
+    schedule = select_engine(engine).schedules(balances, interest_rates, payments, frequency)
+    text, n_rows = _format_chunk(loan_ids, schedule)
+    return text, n_rows, time.perf_counter() - start
+
+
+def export_schedules(name, balances, interest_rates, payments, loan_ids=None, frequency=DEFAULT_FREQUENCY,
+                     engine="auto", chunk_loans=EXPORT_CHUNK_LOANS, n_workers=EXPORT_WORKERS,
+                     queue_size=EXPORT_QUEUE_SIZE, root=EXPORTS_PATH):
+    """
+    Exports the schedules of many loans to one CSV file with a producer/consumer
+    pipeline: worker processes compute and format chunks of schedules while this
+    process writes the finished chunks, in order, through a large buffer. At most
+    queue_size chunks wait for the writer; when it falls behind, no new chunks are
+    handed to the workers, so memory stays bounded. With MEMORY_PROFILING on, the
+    memory of this process during the export is written to a report.
+
+    Args:
+        name (str): name of the CSV file, without extension
+        balances (array_like): amount borrowed for each loan
+        interest_rates (array_like): annual interest rate of each loan
+        payments (array_like): payment of each loan
+        loan_ids (array_like): identifier of each loan, its position if None
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+        engine (str): schedule engine, see amortization_table.engines
+        chunk_loans (int): number of loans computed and written at once
+        n_workers (int): number of worker processes, 0 to compute and write one chunk
+            after the other in this process
+        queue_size (int): number of finished chunks that can wait for the writer
+        root (str): folder of the export
+
+    Returns:
+        ExportStats: timings of the export
+    """
+    start = time.perf_counter()
+    balances, interest_rates, payments = np.broadcast_arrays(*(np.asarray(x, dtype=float).reshape(-1)
+                                                               for x in (balances, interest_rates, payments)))
+    n_loans = balances.size
+    loan_ids = np.arange(n_loans) if loan_ids is None else np.asarray(loan_ids)
+
+    #Workers get the engine by name, so "auto" is only calibrated once, here:
+    engine = select_engine(engine, min(chunk_loans, n_loans)).name
+    chunks = (slice(first, first + chunk_loans) for first in range(0, n_loans, chunk_loans))
+    tasks = ((engine, balances[chunk], interest_rates[chunk], payments[chunk], loan_ids[chunk], frequency)
+             for chunk in chunks)
+
+    path = Path(root) / f"{name}.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    compute_seconds, write_seconds, n_rows = 0.0, 0.0, 0
+
+    with MemoryProfiler() as profiler, profiler.stage(f"export {n_loans} schedules"), \
+         open(path, "w", buffering=EXPORT_BUFFER_BYTES, newline="") as out:
+        out.write(",".join(EXPORT_COLUMNS) + "\n")
+
+        if n_workers == 0:
+            for task in tasks:
+                text, rows, seconds = _export_chunk(*task)
+                started = time.perf_counter()
+                out.write(text)
+                write_seconds += time.perf_counter() - started
+                compute_seconds += seconds
+                n_rows += rows
+        else:
+            #Forked workers would inherit the threads of the compiled engines and can hang:
+            with ProcessPoolExecutor(n_workers, mp_context=multiprocessing.get_context("forkserver")) as executor:
+                pending = deque(executor.submit(_export_chunk, *task)
+                                for task in islice(tasks, n_workers + queue_size))
+                while pending:
+                    started = time.perf_counter()
+                    text, rows, seconds = pending.popleft().result()
+                    #Hand the next chunk out before writing, so the workers stay busy:
+                    for task in islice(tasks, 1):
+                        pending.append(executor.submit(_export_chunk, *task))
+                    out.write(text)
+                    write_seconds += time.perf_counter() - started
+                    compute_seconds += seconds
+                    n_rows += rows
+
+    stats = ExportStats(path, n_loans, n_rows, compute_seconds, write_seconds, time.perf_counter() - start)
+    my_log.info(f"Exported {n_loans} schedules ({n_rows} rows) to {path} in {stats.total_seconds:.2f} s.")
+    return stats
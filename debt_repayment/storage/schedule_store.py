@@ -0,0 +1,148 @@
+from .constants import STORES_PATH, SCHEDULE_COLUMNS
+from ..tools.logger_utils import my_log
+from pathlib import Path
+import numpy as np
+
+
+class ScheduleStoreWriter:
+    """
+    Writes the schedules of a batch run into memory-mapped .npy files. Schedules are
+    stored back to back (no padding after payoff), and an offsets array maps every
+    loan to its row range. The number of payments of each loan is known before the
+    schedules are computed, so the files are sized upfront and filled chunk by chunk.
+
+    Attributes:
+    ---------------------------------------------------
+        path (Path): directory of the store
+        offsets (np.ndarray): first row of each loan, plus the total number of rows
+        loan_ids (np.ndarray): identifier of each loan
+
+    Methods:
+    ---------------------------------------------------
+        write: copies the schedules of a chunk of consecutive loans into the store
+
+        close: flushes the files and writes the lookup index
+    """
+    def __init__(self, name, num_periods, loan_ids=None, root=STORES_PATH) -> None:
+        self.path = Path(root) / name
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        num_periods = np.asarray(num_periods, dtype=np.int64)
+        self.offsets = np.zeros(num_periods.size + 1, dtype=np.int64)
+        np.cumsum(num_periods, out=self.offsets[1:])
+        self.loan_ids = np.arange(num_periods.size) if loan_ids is None else np.asarray(loan_ids)
+
+        self.columns = {
+            column: np.lib.format.open_memmap(self.path / f"{column}.npy", mode='w+',
+                                              dtype=np.float64, shape=(int(self.offsets[-1]),))
+            for column in SCHEDULE_COLUMNS
+        }
+
+
+    def write(self, first_loan, schedule):
+        """
+        Copies the schedules of a chunk of consecutive loans into the store.
+
+        Args:
+            first_loan (int): position of the first loan of the chunk in the run
+            schedule (BatchSchedule): schedules of the chunk
+        """
+        n_loans = len(schedule.num_periods)
+        start, end = self.offsets[first_loan], self.offsets[first_loan + n_loans]
+        active = np.arange(schedule.payment.shape[1]) < schedule.num_periods[:, None]
+
+        for column in SCHEDULE_COLUMNS:
+            self.columns[column][start:end] = getattr(schedule, column)[active]
+
+
+    def close(self):
+        """Flushes the files and writes the offsets and the loan id index."""
+        for column in self.columns.values():
+            column.flush()
+        self.columns = {}
+
+        np.save(self.path / "offsets.npy", self.offsets)
+        np.save(self.path / "loan_ids.npy", self.loan_ids)
+        np.save(self.path / "order.npy", np.argsort(self.loan_ids, kind='stable'))
+        my_log.info(f"Saved {len(self.loan_ids)} schedules to {self.path}")
+
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ScheduleStore:
+    """
+    Read-only access to a store written by ScheduleStoreWriter. Opening the store only
+    maps the files; fetching a loan returns views into them without reading the rest.
+
+    Attributes:
+    ---------------------------------------------------
+        path (Path): directory of the store
+        offsets (np.ndarray): first row of each loan, plus the total number of rows
+        loan_ids (np.ndarray): identifier of each loan
+
+    Methods:
+    ---------------------------------------------------
+        get: returns the schedule of one loan by its identifier
+
+        rows: returns the schedule of the loan at a given position
+    """
+    def __init__(self, name, root=STORES_PATH) -> None:
+        self.path = Path(root) / name
+        self.columns = {column: np.load(self.path / f"{column}.npy", mmap_mode='r')
+                        for column in SCHEDULE_COLUMNS}
+        self.offsets = np.load(self.path / "offsets.npy", mmap_mode='r')
+        self.loan_ids = np.load(self.path / "loan_ids.npy", mmap_mode='r')
+        self.order = np.load(self.path / "order.npy", mmap_mode='r')
+
+
+    def __len__(self):
+        return len(self.loan_ids)
+
+
+    def __contains__(self, loan_id):
+        return self._position(loan_id) is not None
+
+
+    def _position(self, loan_id):
+        """Position of a loan in the run, found by binary search over the sorted ids."""
+        index = np.searchsorted(self.loan_ids, loan_id, sorter=self.order)
+        if index < len(self.order) and self.loan_ids[self.order[index]] == loan_id:
+            return int(self.order[index])
+        return None
+
+
+    def rows(self, position):
+        """Returns the schedule columns of the loan at a position as zero-copy views."""
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return {column: values[start:end] for column, values in self.columns.items()}
+
+
+    def get(self, loan_id):
+        """Returns the schedule columns of a loan as zero-copy views."""
+        position = self._position(loan_id)
+        if position is None:
+            raise KeyError(loan_id)
+        return self.rows(position)
+
+
+def save_schedules(name, schedule, loan_ids=None, root=STORES_PATH):
+    """
+    Saves the schedules of a single batch into a new store.
+
+    Args:
+        name (str): name of the store directory
+        schedule (BatchSchedule): schedules to save
+        loan_ids (array_like): identifier of each loan, defaults to its position
+        root (str): directory holding the stores
+
+    Returns:
+        Path: directory of the store
+    """
+    with ScheduleStoreWriter(name, schedule.num_periods, loan_ids, root) as writer:
+        writer.write(0, schedule)
+    return writer.path
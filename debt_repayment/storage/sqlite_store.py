@@ -0,0 +1,253 @@
+from .constants import CATALOG_PATH
+from ..amortization_table.constants import TIMEZONE
+from ..amortization_table.dates import due_dates
+from ..tools.constants import DEFAULT_FREQUENCY
+from ..tools.logger_utils import my_log
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS loans (
+    id INTEGER PRIMARY KEY,
+    loan_type TEXT NOT NULL,
+    loan_balance REAL NOT NULL,
+    interest_rate REAL NOT NULL,
+    num_months INTEGER NOT NULL,
+    monthly_payments REAL,
+    frequency TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS schedule_rows (
+    loan_id INTEGER NOT NULL REFERENCES loans(id) ON DELETE CASCADE,
+    pmt INTEGER NOT NULL,
+    due_date TEXT,
+    payment REAL NOT NULL,
+    principal REAL NOT NULL,
+    interest REAL NOT NULL,
+    balance REAL NOT NULL,
+    PRIMARY KEY (loan_id, pmt)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS loans_loan_type ON loans(loan_type);
+CREATE INDEX IF NOT EXISTS loans_interest_rate ON loans(interest_rate);
+CREATE INDEX IF NOT EXISTS loans_created_at ON loans(created_at);
+"""
+
+LOAN_COLUMNS = ("id", "loan_type", "loan_balance", "interest_rate", "num_months",
+                "monthly_payments", "frequency", "created_at")
+INSERT_LOANS = f"INSERT INTO loans VALUES ({', '.join('?' * len(LOAN_COLUMNS))})"
+INSERT_ROWS = "INSERT INTO schedule_rows VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+
+class TableCatalog:
+    """
+    SQLite catalog of saved amortization tables. Loan parameters go in the `loans`
+    table and every payment in `schedule_rows`. Writes are bulk executemany inserts
+    in a single transaction and the database runs in WAL mode, so readers are never
+    blocked by a running export. The catalog is shared between threads, so every use
+    of the connection holds a lock.
+
+    Attributes:
+    ---------------------------------------------------
+        path (Path): location of the database file
+        connection (sqlite3.Connection): open connection to the database
+        lock (threading.Lock): serializes the threads using the connection
+
+    Methods:
+    ---------------------------------------------------
+        save_table: stores one AmortizationTable
+
+        save_batch: stores the schedules of a batch run
+
+        find: lists the saved loans matching the given filters
+
+        load_table: rebuilds the amortization table of a saved loan
+    """
+    def __init__(self, path=CATALOG_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+
+    @contextmanager
+    def _transaction(self):
+        """Runs the enclosed inserts in one write transaction, rolled back on error."""
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+
+
+    @staticmethod
+    def _next_id(cursor):
+        """First free loan id. Ids are assigned upfront so rows can reference them in bulk."""
+        return cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM loans").fetchone()[0]
+
+
+    def save_table(self, a_table):
+        """
+        Stores an AmortizationTable.
+
+        Args:
+            a_table (AmortizationTable): table to store
+
+        Returns:
+            int: id of the saved loan
+        """
+        df = a_table.amortization_df
+        created_at = datetime.now(timezone.utc).isoformat()
+
+        with self._transaction() as cursor:
+            loan_id = self._next_id(cursor)
+            cursor.execute(INSERT_LOANS, (loan_id, a_table.loan_type, a_table.loan_balance,
+                                          a_table.interest_rate, a_table.num_months, a_table.monthly_payments,
+                                          getattr(a_table, "frequency", DEFAULT_FREQUENCY), created_at))
+            cursor.executemany(INSERT_ROWS, zip(
+                [loan_id] * len(df), df["Pmt #"].tolist(),
+                [date.isoformat() for date in df["Due date"]],
+                df["Payment_amount"].tolist(), df["Principal_paid"].tolist(),
+                df["Interest_paid"].tolist(), df["Remaining_balance"].tolist()
+            ))
+
+        return loan_id
+
+
+    def save_batch(self, loan_types, balances, interest_rates, schedule, monthly_payments=None,
+                   frequency=DEFAULT_FREQUENCY, start=None):
+        """
+        Stores the schedules of a batch run.
+
+        Args:
+            loan_types (array_like): title of each loan
+            balances (array_like): amount borrowed for each loan
+            interest_rates (array_like): annual interest rate of each loan
+            schedule (BatchSchedule): schedules of the loans
+            monthly_payments (array_like): payment of each loan, defaults to its first payment
+            frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+            start (datetime.date): date of the first payment period, defaults to today
+
+        Returns:
+            np.ndarray: ids of the saved loans
+        """
+        num_periods = np.asarray(schedule.num_periods, dtype=np.int64)
+        n_loans = num_periods.size
+        loan_types = np.broadcast_to(np.asarray(loan_types, dtype=object), (n_loans,))
+        balances = np.broadcast_to(np.asarray(balances, dtype=float), (n_loans,))
+        interest_rates = np.broadcast_to(np.asarray(interest_rates, dtype=float), (n_loans,))
+        if monthly_payments is None:
+            monthly_payments = np.round(schedule.payment[:, 0], 2)
+        monthly_payments = np.broadcast_to(np.asarray(monthly_payments, dtype=float), (n_loans,))
+
+        created_at = datetime.now(timezone.utc).isoformat()
+        start = pd.Timestamp.now().date() if start is None else start
+        calendar = np.array([date.isoformat() for date in due_dates(start, int(num_periods.max()), frequency)])
+
+        #Flatten the padded schedules into one row per payment:
+        active = np.arange(schedule.payment.shape[1]) < num_periods[:, None]
+        first_row = np.cumsum(num_periods) - num_periods
+        pmt = np.arange(int(num_periods.sum())) - np.repeat(first_row, num_periods) + 1
+
+        with self._transaction() as cursor:
+            first_id = self._next_id(cursor)
+            cursor.executemany(INSERT_LOANS, zip(
+                range(first_id, first_id + n_loans), loan_types.tolist(), balances.tolist(),
+                interest_rates.tolist(), num_periods.tolist(), monthly_payments.tolist(),
+                [frequency] * n_loans, [created_at] * n_loans
+            ))
+            cursor.executemany(INSERT_ROWS, zip(
+                np.repeat(np.arange(first_id, first_id + n_loans), num_periods).tolist(), pmt.tolist(),
+                calendar[pmt - 1].tolist(),
+                np.round(schedule.payment[active], 2).tolist(), np.round(schedule.principal[active], 2).tolist(),
+                np.round(schedule.interest[active], 2).tolist(), np.round(schedule.balance[active], 2).tolist()
+            ))
+
+        my_log.info(f"Saved {n_loans} amortization tables to {self.path}")
+        return np.arange(first_id, first_id + n_loans)
+
+
+    def find(self, loan_type=None, min_rate=None, max_rate=None, since=None, limit=None):
+        """
+        Lists the saved loans matching the given filters, newest first.
+
+        Args:
+            loan_type (str): title of the loan
+            min_rate (float): lowest annual interest rate
+            max_rate (float): highest annual interest rate
+            since (str): ISO timestamp, only loans saved from then on
+            limit (int): maximum number of loans returned
+
+        Returns:
+            list: one dict of loan parameters per saved loan
+        """
+        filters = {"loan_type = ?": loan_type, "interest_rate >= ?": min_rate,
+                   "interest_rate <= ?": max_rate, "created_at >= ?": since}
+        clauses = [clause for clause, value in filters.items() if value is not None]
+        query = "SELECT * FROM loans"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+
+        parameters = [value for value in filters.values() if value is not None]
+        with self.lock:
+            rows = self.connection.execute(query, parameters).fetchall()
+        return [dict(zip(LOAN_COLUMNS, row)) for row in rows]
+
+
+    def load_table(self, loan_id):
+        """
+        Rebuilds the amortization table of a saved loan.
+
+        Args:
+            loan_id (int): id of the saved loan
+
+        Returns:
+            pd.DataFrame: amortization table with the same columns as AmortizationTable
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT pmt, due_date, payment, principal, interest, balance "
+                "FROM schedule_rows WHERE loan_id = ? ORDER BY pmt", (int(loan_id),)
+            ).fetchall()
+        df = pd.DataFrame(rows, columns=["Pmt #", "Due date", "Payment_amount",
+                                                      "Principal_paid", "Interest_paid", "Remaining_balance"])
+        if df.empty:
+            raise KeyError(loan_id)
+
+        df["Due date"] = pd.to_datetime(df["Due date"], utc=True).dt.tz_convert(TIMEZONE)
+        return df
+
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@lru_cache(maxsize=None)
+def get_catalog(path=CATALOG_PATH):
+    """Shared catalog per database file, used when TABLE_BACKEND is "sqlite"."""
+    return TableCatalog(path)
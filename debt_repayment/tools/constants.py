@@ -5,4 +5,33 @@ from pathlib import Path
 LOG_DIR = Path("debt_repayment/files/logs")
 LOG_FILE = LOG_DIR / "getting_out_of_debt.log"
 LOG_LEVEL = logging.DEBUG
-LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
\ No newline at end of file
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+# Payment frequencies: pandas offset of the due dates and number of payments per year
+PAYMENT_FREQUENCIES = {
+    "monthly": ("MS", 12),
+    "semi-monthly": ("SMS", 24),
+    "biweekly": ("14D", 26),
+    "weekly": ("7D", 52),
+}
+DEFAULT_FREQUENCY = "monthly"
+
+
+# Day-count conventions for daily interest accrual: days in a year for each convention
+DAY_COUNT_BASIS = {
+    "actual/365": 365,
+    "actual/360": 360,
+    "30/360": 360,
+}
+
+# Iterative solvers: step size on the periodic rate at which a row has converged, and iteration cap
+SOLVER_TOLERANCE = 1e-12
+SOLVER_MAX_ITER = 100
+
+# Memory profiling: opt-in tracemalloc/RSS instrumentation, report folder and batch memory budget in bytes
+MEMORY_PROFILING = False
+MEMORY_REPORT_DIR = Path("debt_repayment/files/reports")
+MEMORY_TRACE_FRAMES = 1
+MEMORY_TOP_LOCATIONS = 15
+RSS_SAMPLE_INTERVAL = 0.01
+MEMORY_BUDGET = None  # e.g. 512 * 2**20, None for no limit
\ No newline at end of file
@@ -0,0 +1,29 @@
+import numpy as np
+
+
+def min_max_indices(values, n_buckets):
+    """
+    Picks the points to draw a long series on n_buckets pixels: the minimum and the
+    maximum of every bucket, in their original order, so spikes are never lost.
+
+    Args:
+        values (array_like): series to downsample
+        n_buckets (int): number of buckets, usually the width of the plot in pixels
+
+    Returns:
+        np.ndarray: sorted indices of the points to keep
+    """
+    values = np.asarray(values, dtype=float)
+    n_points = values.size
+    n_buckets = max(1, int(n_buckets))
+    if n_points <= 2 * n_buckets:
+        return np.arange(n_points)
+
+    #Pad the series with its last value so it splits into equal buckets:
+    size = -(-n_points // n_buckets)
+    padded = np.pad(values, (0, size * n_buckets - n_points), mode='edge').reshape(n_buckets, size)
+
+    starts = np.arange(n_buckets)[:, None] * size
+    picks = np.sort(np.stack([padded.argmin(axis=1), padded.argmax(axis=1)], axis=1), axis=1) + starts
+    return np.unique(np.minimum(picks.ravel(), n_points - 1))
+
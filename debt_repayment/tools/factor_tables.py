@@ -0,0 +1,112 @@
+from .constants import DEFAULT_FREQUENCY
+from .payments_utils import periodic_rate
+from functools import lru_cache
+import numpy as np
+
+
+RATE_KEY_SCALE = 1000  # rates on a 0.001% grid are indexed directly instead of searched
+MAX_RATE_KEYS = 1_000_000
+
+
+class FactorTable:
+    """
+    Growth factors (1 + r)^k of a small set of interest rates for every period up to a
+    maximum term, computed once so payments and balances of many loans sharing those
+    rates are looked up by index instead of recomputing the powers for every loan.
+
+    Attributes:
+    ---------------------------------------------------
+        rates (np.ndarray): sorted distinct annual interest rates of the table
+        max_term (int): largest number of periods in the table
+        frequency (str): payment frequency the periodic rates are computed for
+        period_rates (np.ndarray): periodic rate of every row
+        growth (np.ndarray): (n_rates, max_term + 1) growth factors, growth[i, k] = (1 + r_i)^k
+        payment (np.ndarray): (n_rates, max_term + 1) payment per unit borrowed over k periods
+
+    Methods:
+    ---------------------------------------------------
+        index: returns the row of each rate
+
+        growth_factor: returns (1 + r)^n
+
+        payment_factor: returns the payment per unit borrowed over n periods
+
+        balance_fraction: returns the fraction of the balance left after some payments
+    """
+    def __init__(self, rates, max_term, frequency=DEFAULT_FREQUENCY) -> None:
+        self.rates = np.unique(np.asarray(rates, dtype=float))
+        self.max_term = int(max_term)
+        self.frequency = frequency
+        self.period_rates = periodic_rate(self.rates, frequency)
+
+        #np.power gives the same doubles as (1 + r)**n, so lookups match the closed forms:
+        self.growth = np.power(1 + self.period_rates[:, None], np.arange(self.max_term + 1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.payment = self.period_rates[:, None] * self.growth / (self.growth - 1)
+            self.payment[self.period_rates == 0] = 1 / np.arange(self.max_term + 1)
+
+        #Rates on a fine grid map straight to their row through a dense array of keys:
+        keys = np.rint(self.rates * RATE_KEY_SCALE)
+        self._key_offset = None
+        if len(keys) and np.array_equal(keys / RATE_KEY_SCALE, self.rates) \
+                and keys[-1] - keys[0] < MAX_RATE_KEYS:
+            self._key_offset = int(keys[0])
+            self._rows_by_key = np.full(int(keys[-1] - keys[0]) + 1, -1, dtype=np.int64)
+            self._rows_by_key[(keys - keys[0]).astype(np.int64)] = np.arange(len(keys))
+
+
+    def index(self, rates):
+        """Row of each annual rate, raises ValueError for rates missing from the table."""
+        rates = np.asarray(rates, dtype=float)
+        if self._key_offset is not None:
+            keys = np.rint(rates * RATE_KEY_SCALE) - self._key_offset
+            keys = np.clip(keys, 0, len(self._rows_by_key) - 1).astype(np.int64)
+            rows = np.maximum(self._rows_by_key[keys], 0)
+        else:
+            rows = np.minimum(np.searchsorted(self.rates, rates), len(self.rates) - 1)
+
+        if not np.array_equal(self.rates[rows], rates):
+            missing = np.setdiff1d(rates, self.rates)
+            raise ValueError(f"Rates missing from the factor table: {missing[:5].tolist()}")
+        return rows
+
+
+    def growth_factor(self, rates, periods):
+        return self.growth[self.index(rates), periods]
+
+
+    def payment_factor(self, rates, periods):
+        """Payment per unit borrowed, r(1 + r)^n / ((1 + r)^n - 1), or 1/n at a zero rate."""
+        return self.payment[self.index(rates), periods]
+
+
+    def balance_fraction(self, rates, remaining, paid):
+        """Fraction of the balance left after `paid` of `remaining` payments, as in amortize."""
+        rows = self.index(rates)
+        growth_term = self.growth[rows, remaining]
+        growth_paid = self.growth[rows, paid]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = (growth_term - growth_paid) / (growth_term - 1)
+        return np.where(self.period_rates[rows] == 0, (remaining - paid) / remaining, fraction)
+
+
+@lru_cache(maxsize=32)
+def _cached_table(rates, max_term, frequency):
+    return FactorTable(rates, max_term, frequency)
+
+
+def get_factor_table(rates, max_term, frequency=DEFAULT_FREQUENCY):
+    """
+    Returns the shared factor table for the distinct values of some rates. Tables are
+    cached, so every caller with the same rates, term and frequency uses the same arrays.
+
+    Args:
+        rates (array_like): annual interest rates, usually of every loan in a book
+        max_term (int): largest number of periods needed
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        FactorTable: table covering every distinct rate
+    """
+    distinct = tuple(np.unique(np.asarray(rates, dtype=float)).tolist())
+    return _cached_table(distinct, int(max_term), frequency)
@@ -0,0 +1,245 @@
+from .constants import (MEMORY_PROFILING, MEMORY_REPORT_DIR, MEMORY_TRACE_FRAMES, MEMORY_TOP_LOCATIONS,
+                        RSS_SAMPLE_INTERVAL, MEMORY_BUDGET)
+from .logger_utils import my_log
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+import ast
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+#Bytes of float64 working memory per loan and period of a batch schedule: the five
+#output arrays, the rate matrix, the temporaries of the closed form and the cash flow
+#month indices, as measured with MemoryProfiler on book_cash_flows.
+SCHEDULE_BYTES_PER_CELL = 8 * 18
+
+
+def current_rss():
+    """Resident set size of the process in bytes, None when it cannot be read."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def _functions(filename):
+    """Line ranges and qualified names of the functions defined in a source file."""
+    try:
+        tree = ast.parse(Path(filename).read_text())
+    except (OSError, SyntaxError, ValueError):
+        return ()
+
+    functions = []
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                name = prefix + child.name
+                if not isinstance(child, ast.ClassDef):
+                    functions.append((child.lineno, child.end_lineno, name))
+                visit(child, name + ".")
+    visit(tree, "")
+    return tuple(functions)
+
+
+@lru_cache(maxsize=None)
+def _module_name(filename):
+    """Dotted module name of a source file, found from the longest matching sys.path entry."""
+    path = Path(filename)
+    roots = sorted((Path(entry or ".").resolve() for entry in sys.path), key=lambda p: len(p.parts), reverse=True)
+    for root in roots:
+        try:
+            relative = path.resolve().relative_to(root)
+        except (ValueError, OSError):
+            continue
+        return ".".join(relative.with_suffix("").parts)
+    return path.stem
+
+
+def _location(frame):
+    """(module, function) of a traceback frame, the innermost function containing the line."""
+    function = "<module>"
+    for start, end, name in _functions(frame.filename):
+        if start <= frame.lineno <= end:
+            function = name
+    return _module_name(frame.filename), function
+
+
+def chunk_size(n_items, bytes_per_item, budget=MEMORY_BUDGET):
+    """
+    Number of items to process at once so a batch run stays under a memory budget
+
+    Args:
+        n_items (int): total number of items of the run
+        bytes_per_item (float): working memory needed per item
+        budget (int): memory budget in bytes, None for no limit
+
+    Returns:
+        int: items per chunk, at least one
+    """
+    if budget is None:
+        return max(1, int(n_items))
+    return max(1, min(int(n_items), int(budget // max(bytes_per_item, 1))))
+
+
+class MemoryProfiler:
+    """
+    Opt-in memory instrumentation for batch runs. While enabled, tracemalloc traces
+    Python allocations and a background thread samples the resident set size. Each
+    stage records its duration, its traced and RSS peaks, and the memory it left
+    allocated grouped by module and function. The report is written to a text file
+    when the profiler exits. When disabled, every method is a no-op, so batch runs
+    always go through one and MEMORY_PROFILING switches the instrumentation on.
+
+    Attributes:
+    ---------------------------------------------------
+        enabled (bool): whether memory is being profiled, MEMORY_PROFILING when not given
+        report_dir (Path): folder where the report is written
+        stages (list): one dictionary of measurements per finished stage
+        report_path (Path): path of the written report, None before exiting
+
+    Methods:
+    ---------------------------------------------------
+        stage: context manager measuring one stage of the run
+
+        write_report: writes the measurements of every stage to report_dir
+    """
+    def __init__(self, enabled=None, report_dir=MEMORY_REPORT_DIR,
+                 top=MEMORY_TOP_LOCATIONS, sample_interval=RSS_SAMPLE_INTERVAL) -> None:
+        self.enabled = MEMORY_PROFILING if enabled is None else enabled
+        self.report_dir = Path(report_dir)
+        self.top = top
+        self.sample_interval = sample_interval
+        self.stages = []
+        self.report_path = None
+
+        self._rss_peak = None
+        self._sampling = threading.Event()
+        self._sampler = None
+
+
+    def __enter__(self):
+        if self.enabled:
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start(MEMORY_TRACE_FRAMES)
+            self._sampling.set()
+            self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+            self._sampler.start()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.enabled:
+            self._sampling.clear()
+            self._sampler.join()
+            self.write_report()
+            if self._started_tracing:
+                tracemalloc.stop()
+        return False
+
+
+    def _sample_rss(self):
+        while self._sampling.is_set():
+            rss = current_rss()
+            if rss is not None and (self._rss_peak is None or rss > self._rss_peak):
+                self._rss_peak = rss
+            time.sleep(self.sample_interval)
+
+
+    @staticmethod
+    def _snapshot():
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+
+
+    @contextmanager
+    def stage(self, name):
+        """Measures the block run inside the with statement as one stage of the report."""
+        if not self.enabled:
+            yield
+            return
+
+        before = self._snapshot()
+        traced_start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        rss_start = current_rss()
+        self._rss_peak = rss_start
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            traced_end, traced_peak = tracemalloc.get_traced_memory()
+            rss_end = current_rss()
+            rss_peak = max(filter(None, (self._rss_peak, rss_end)), default=None)
+
+            #Group what the stage left allocated by module and function:
+            locations = {}
+            for stat in self._snapshot().compare_to(before, 'lineno'):
+                key = _location(stat.traceback[0])
+                size, count = locations.get(key, (0, 0))
+                locations[key] = (size + stat.size_diff, count + stat.count_diff)
+            locations = sorted((item for item in locations.items() if item[1][0]),
+                               key=lambda item: abs(item[1][0]), reverse=True)
+
+            self.stages.append({
+                "name": name,
+                "seconds": seconds,
+                "traced_change": traced_end - traced_start,
+                "traced_peak": traced_peak - traced_start,
+                "rss_start": rss_start,
+                "rss_end": rss_end,
+                "rss_peak": rss_peak,
+                "locations": locations[:self.top],
+            })
+            my_log.debug(f"Memory stage '{name}': peak {traced_peak - traced_start} bytes traced.")
+
+
+    def write_report(self):
+        """
+        Writes the measurements of every stage to a timestamped text file
+
+        Returns:
+            Path: path of the report
+        """
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.report_path = self.report_dir / f"memory_{datetime.now():%Y%m%d_%H%M%S}.txt"
+
+        lines = [f"Memory report, {datetime.now():%Y-%m-%d %H:%M:%S}", ""]
+        for stage in self.stages:
+            lines += [
+                f"Stage: {stage['name']} ({stage['seconds']:.3f} s)",
+                f"    traced peak:    {_megabytes(stage['traced_peak'])}",
+                f"    traced change:  {_megabytes(stage['traced_change'])}",
+                f"    RSS start/end:  {_megabytes(stage['rss_start'])} / {_megabytes(stage['rss_end'])}",
+                f"    RSS peak:       {_megabytes(stage['rss_peak'])}",
+                "    left allocated by module and function:",
+            ]
+            lines += [f"        {_megabytes(size)}  {count:>9} blocks  {module}.{function}"
+                      for (module, function), (size, count) in stage["locations"]]
+            lines.append("")
+
+        self.report_path.write_text("\n".join(lines))
+        my_log.info(f"Memory report written to {self.report_path}.")
+        return self.report_path
+
+
+def _megabytes(size):
+    return "       n/a" if size is None else f"{size / 2**20:10.2f} MB"
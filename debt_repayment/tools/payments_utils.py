@@ -1,27 +1,64 @@
-def calculate_payments(amount, int_rate, duration):
+from .constants import PAYMENT_FREQUENCIES, DEFAULT_FREQUENCY, SOLVER_TOLERANCE, SOLVER_MAX_ITER
+import numpy as np
+
+
+def periodic_rate(int_rate, frequency=DEFAULT_FREQUENCY):
+    """
+    Converts an annual interest rate in percent into the rate charged every payment period
+
+    Args:
+        int_rate (float): annual interest rate for the loan
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        float: interest rate per payment period
+    """
+    try:
+        periods_per_year = PAYMENT_FREQUENCIES[frequency][1]
+    except KeyError:
+        raise ValueError(f"Unknown payment frequency '{frequency}'. " +\
+                         f"Choose one of: {', '.join(PAYMENT_FREQUENCIES)}")
+
+    return int_rate / (100 * periods_per_year)
+
+
+def calculate_payments(amount, int_rate, duration, frequency=DEFAULT_FREQUENCY, factors=None):
     """
     Calculates the monthly payments for a given loan amount, interest
     rate and duration
 
     Args:
-        amount (float): amount of the loan
-        int_rate (float): interest rate for the loan
-        duration (int): duration of the loan in months
+        amount (float or np.ndarray): amount of the loan
+        int_rate (float or np.ndarray): interest rate for the loan
+        duration (int or np.ndarray): duration of the loan in months (number of
+            payments for other frequencies)
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+        factors (FactorTable): optional table of growth factors covering every rate,
+            used to look the powers up instead of computing them
 
     Returns:
-        float: monthly payment
+        float or np.ndarray: payment per period
     """
-    #Compute monthly interest rate
-    int_rate /= 1200
+    if factors is not None:
+        if factors.frequency != frequency:
+            raise ValueError(f"The factor table is for {factors.frequency} payments, not {frequency}")
+        return np.round(amount * factors.payment_factor(int_rate, duration), 2)
+
+    #Compute interest rate per payment period
+    int_rate = periodic_rate(np.asarray(int_rate, dtype=float), frequency)
     
     r1 = int_rate * (1 + int_rate)**duration
     r2 = (1+int_rate)**duration - 1
-    r3 = r1 / r2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r3 = r1 / r2
+
+    #Without interest the payments just split the amount:
+    r3 = np.where(int_rate == 0, 1 / np.asarray(duration, dtype=float), r3)
 
-    return round(amount * r3,2)
+    return np.round(amount * r3,2)
 
 
-def calculate_total_paid(amount, int_rate, duration):
+def calculate_total_paid(amount, int_rate, duration, frequency=DEFAULT_FREQUENCY):
     """
     Calculates the total amount paid for the loan
 
@@ -29,14 +66,15 @@ def calculate_total_paid(amount, int_rate, duration):
         amount (float): amount of the loan
         int_rate (float): interest rate for the loan
         duration (int): duration of the loan in months
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
 
     Returns:
         float: total amount paid for the loan
     """
-    return calculate_payments(amount, int_rate, duration) * duration
+    return calculate_payments(amount, int_rate, duration, frequency) * duration
 
 
-def calculate_total_interest(amount, int_rate, duration):
+def calculate_total_interest(amount, int_rate, duration, frequency=DEFAULT_FREQUENCY):
     """
     Calculates the total amount of interest paid on the loan
 
@@ -44,8 +82,133 @@ def calculate_total_interest(amount, int_rate, duration):
         amount (float): amount of the loan
         int_rate (float): interest rate for the loan
         duration (int): duration of the loan in months
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
 
     Returns:
         float: total amount of interest paid on the loan
     """
-    return calculate_payments(amount, int_rate, duration)*duration - amount
+    return calculate_payments(amount, int_rate, duration, frequency)*duration - amount
+
+
+def _annuity_factor(rate, duration):
+    """Present value of one unit paid every period, with the zero-rate limit handled."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = -np.expm1(-duration * np.log1p(rate)) / rate
+    return np.where(rate == 0, duration, factor)
+
+
+def affordable_balance(payment, int_rate, duration, frequency=DEFAULT_FREQUENCY):
+    """
+    Calculates the largest loan amount that a payment budget repays in a given duration
+
+    Args:
+        payment (float or np.ndarray): payment per period the borrower can afford
+        int_rate (float or np.ndarray): interest rate for the loan
+        duration (int or np.ndarray): duration of the loan in months (number of
+            payments for other frequencies)
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        float or np.ndarray: maximum affordable loan amount
+    """
+    rate = periodic_rate(np.asarray(int_rate, dtype=float), frequency)
+    duration = np.asarray(duration, dtype=float)
+    return np.round(payment * _annuity_factor(rate, duration), 2)
+
+
+def minimum_duration(amount, int_rate, payment, frequency=DEFAULT_FREQUENCY):
+    """
+    Calculates the number of payments needed to repay a loan with a given payment. As in
+    the amortization table, the last payment is made once the balance is no larger than
+    the payment and also clears that period's interest. The table rounds every
+    payment to cents, so very long schedules can differ from it by one payment.
+
+    Args:
+        amount (float or np.ndarray): amount of the loan
+        int_rate (float or np.ndarray): interest rate for the loan
+        payment (float or np.ndarray): payment per period
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+
+    Returns:
+        float or np.ndarray: number of payments, np.inf where the payment does not
+            cover the interest
+    """
+    rate = periodic_rate(np.asarray(int_rate, dtype=float), frequency)
+    amount = np.asarray(amount, dtype=float)
+    payment = np.asarray(payment, dtype=float)
+
+    #Number of payments after which the balance is down to one payment:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        periods = np.where(rate == 0, amount / payment - 1,
+                           (np.log1p(-rate) - np.log1p(-rate * amount / payment)) / np.log1p(rate))
+    periods = np.where((payment > rate * amount) & (payment > 0), periods, np.inf)
+
+    #Round away the floating point noise before counting the last payment:
+    return np.ceil(np.maximum(np.round(periods, 9), 0)) + 1
+
+
+def implied_rate(amount, payment, duration, frequency=DEFAULT_FREQUENCY,
+                 tol=SOLVER_TOLERANCE, max_iter=SOLVER_MAX_ITER):
+    """
+    Calculates the annual interest rate at which a payment repays a loan in a given
+    duration. There is no closed form, so every row is solved with Newton's method,
+    falling back to bisection whenever a step leaves the bracket known to hold the
+    root. Rows that have converged are dropped from the following iterations.
+
+    Args:
+        amount (float or np.ndarray): amount of the loan
+        payment (float or np.ndarray): payment per period
+        duration (int or np.ndarray): duration of the loan in months (number of
+            payments for other frequencies)
+        frequency (str): payment frequency, one of PAYMENT_FREQUENCIES
+        tol (float): step on the periodic rate below which a row has converged
+        max_iter (int): maximum number of iterations
+
+    Returns:
+        tuple: the interest rates (np.nan where unsolved) and whether each row converged
+    """
+    amount, payment, duration = np.broadcast_arrays(*(np.asarray(x, dtype=float).reshape(-1)
+                                                      for x in (amount, payment, duration)))
+    rates = np.full(amount.shape, np.nan)
+    converged = np.zeros(amount.shape, dtype=bool)
+
+    #Payments adding up to the amount mean no interest; less than that has no non-negative rate:
+    valid = (amount > 0) & (payment > 0) & (duration > 0)
+    interest_free = valid & np.isclose(payment * duration, amount, rtol=0, atol=1e-9 * amount)
+    rates[interest_free] = 0
+    converged[interest_free] = True
+    rows = np.flatnonzero(valid & ~interest_free & (payment * duration > amount))
+
+    #The rate lies between 0 and payment / amount, where only interest would be paid:
+    a, p, n = amount[rows], payment[rows], duration[rows]
+    low, high = np.zeros(rows.size), p / a
+    rate = np.clip(2 * (n * p - a) / (a * (n + 1)), high * 1e-3, high * 0.5)
+
+    for _ in range(max_iter):
+        if rows.size == 0:
+            break
+
+        discount = np.exp(-n * np.log1p(rate))
+        factor = -np.expm1(-n * np.log1p(rate)) / rate
+        error = a - p * factor
+        derivative = -p * (n * discount / (1 + rate) - factor) / rate
+
+        #error grows with the rate, so its sign tells which side of the root we are on:
+        low = np.where(error < 0, rate, low)
+        high = np.where(error > 0, rate, high)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            new_rate = rate - error / derivative
+        outside = ~((new_rate > low) & (new_rate < high))
+        new_rate = np.where(outside, (low + high) / 2, new_rate)
+
+        done = (np.abs(new_rate - rate) <= tol) | (error == 0)
+        rates[rows[done]] = new_rate[done]
+        converged[rows[done]] = True
+
+        keep = ~done
+        rows, a, p, n = rows[keep], a[keep], p[keep], n[keep]
+        low, high, rate = low[keep], high[keep], new_rate[keep]
+
+    #Convert the periodic rates back into annual percentages:
+    return rates / periodic_rate(1, frequency), converged
@@ -0,0 +1,13 @@
+import logging
+import pytest
+
+
+#The application logger opens the tracked log file when it is first imported, unless it already has a
+#handler. Give it one before any test imports it; records still reach pytest through propagation:
+logging.getLogger("debt_repayment.tools.logger_utils").addHandler(logging.NullHandler())
+
+
+@pytest.fixture(autouse=True)
+def run_in_tmp_path(tmp_path, monkeypatch):
+    """Runs every test from a temporary folder, so saved tables don't land in the repo."""
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,63 @@
+from debt_repayment.amortization_table.day_count import day_count_schedules, period_days, period_rates
+from debt_repayment.amortization_table.table import AmortizationTable
+import numpy as np
+import pytest
+
+
+ORIGINATION = "2024-01-15"
+DATES = np.array(["2024-02-15", "2024-03-15", "2024-03-31", "2024-04-30", "2024-05-31"], dtype="datetime64[D]")
+#Days counted by hand, 2024 being a leap year:
+DAYS = {
+    "actual/365": [31, 29, 16, 30, 31],
+    "actual/360": [31, 29, 16, 30, 31],
+    "30/360": [30, 30, 16, 30, 30],
+}
+
+
+@pytest.mark.parametrize("convention", DAYS)
+def test_period_days(convention):
+    np.testing.assert_array_equal(period_days(DATES[None, :], ORIGINATION, convention)[0], DAYS[convention])
+
+
+@pytest.mark.parametrize("convention, interest", [("actual/365", 50.96), ("actual/360", 51.67), ("30/360", 50.00)])
+def test_first_period_interest(convention, interest):
+    schedule = day_count_schedules(10_000, 6, 1_000, DATES[None, :], 5, ORIGINATION, convention)
+    assert round(schedule.interest[0, 0], 2) == interest
+
+
+def test_thirty_360_end_of_month():
+    #A 31st counts as the 30th, so every whole month is 30 days:
+    dates = np.array(["2024-04-30", "2024-05-31", "2024-06-30"], dtype="datetime64[D]")
+    np.testing.assert_array_equal(period_days(dates[None, :], "2024-03-31", "30/360")[0], [30, 30, 30])
+    np.testing.assert_array_equal(period_days(dates[None, :], "2024-03-31", "actual/360")[0], [30, 31, 30])
+
+
+def test_conventions_can_differ_per_loan():
+    conventions = list(DAYS)
+    rates = period_rates(DATES[None, :], [6, 6, 6], ORIGINATION, conventions)
+    for row, convention in enumerate(conventions):
+        np.testing.assert_allclose(rates[row], period_rates(DATES[None, :], 6, ORIGINATION, convention)[0])
+
+    schedules = day_count_schedules([10_000] * 3, 6, 1_000, DATES[None, :], 5, ORIGINATION, conventions)
+    np.testing.assert_allclose(np.round(schedules.interest[:, 0], 2), [50.96, 51.67, 50.00])
+
+
+def test_unknown_convention_is_rejected():
+    with pytest.raises(ValueError):
+        period_days(DATES[None, :], ORIGINATION, ["actual/365", "actual/actual"])
+
+
+@pytest.mark.parametrize("convention", DAYS)
+def test_table_accrues_interest_on_the_days_between_due_dates(convention):
+    table = AmortizationTable("test", 10_000, 6, 12, 860.66, day_count=convention)
+    dates = table.amortization_df["Due date"].dt.tz_localize(None).to_numpy().astype("datetime64[D]")
+    days = period_days(dates[None, :], convention=convention)[0]
+    basis = 365 if convention == "actual/365" else 360
+    assert table.amortization_df["Interest_paid"].iloc[0] == round(10_000 * 0.06 * days[0] / basis, 2)
+    assert table.amortization_df["Remaining_balance"].iloc[-1] == 0
+
+
+@pytest.mark.parametrize("kwargs", [{"rate_path": np.full(12, 6.0)}, {"payment_status": np.zeros(12)}])
+def test_daily_accrual_is_not_combined_with_variable_schedules(kwargs):
+    with pytest.raises(ValueError):
+        AmortizationTable("test", 10_000, 6, 12, 860.66, day_count="actual/365", **kwargs)
@@ -0,0 +1,45 @@
+from debt_repayment.amortization_table.engines import (ENGINES, available_engines, check_conformance,
+                                                      engine_table, select_engine, _sample_loans)
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.tools.payments_utils import calculate_payments
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("name", available_engines())
+@pytest.mark.parametrize("frequency", ["monthly", "biweekly"])
+@pytest.mark.parametrize("term", [12, 60, 360])
+def test_engine_matches_reference(name, frequency, term):
+    balances, rates, _ = _sample_loans(200, term, seed=term)
+    rates[:10] = 0
+    payments = calculate_payments(balances, rates, term, frequency)
+    payments[10:20] += 50  # extra payments end the loans early
+
+    expected = ENGINES["reference"].schedules(balances, rates, payments, frequency)
+    actual = ENGINES[name].schedules(balances, rates, payments, frequency)
+    np.testing.assert_array_equal(actual.num_periods, expected.num_periods)
+    #Engines may compute extra all-zero periods past the longest loan:
+    n_max = int(expected.num_periods.max())
+    for field in ("payment", "principal", "interest", "balance"):
+        np.testing.assert_array_equal(getattr(actual, field)[:, :n_max], getattr(expected, field)[:, :n_max],
+                                      err_msg=field)
+
+
+def test_check_conformance_finds_no_differences():
+    for name, (mismatches, largest) in check_conformance(n_loans=100).items():
+        assert mismatches == 0, name
+        assert largest == 0, name
+
+
+@pytest.mark.parametrize("name", ["auto", *available_engines()])
+def test_engine_table_matches_amortization_table(name):
+    args = ("test", 30_000, 6.8, 120, calculate_payments(30_000, 6.8, 120))
+    expected = AmortizationTable(*args).amortization_df
+    actual = engine_table(name)(*args).amortization_df
+    for column in ("Payment_amount", "Principal_paid", "Interest_paid", "Remaining_balance"):
+        np.testing.assert_array_equal(actual[column].to_numpy(), expected[column].to_numpy(), err_msg=column)
+
+
+def test_select_engine_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        select_engine("unknown")
@@ -0,0 +1,32 @@
+from debt_repayment.amortization_table.engines import select_engine
+from debt_repayment.tools.payments_utils import calculate_payments
+from debt_repayment.storage.export import EXPORT_COLUMNS, export_schedules
+import numpy as np
+import pandas as pd
+import pytest
+
+
+BALANCES = [10_000, 25_000, 5_000, 40_000, 1_200]
+RATES = [5, 0, 7.5, 3, 18]
+TERMS = [12, 36, 6, 60, 24]
+
+
+@pytest.mark.parametrize("n_workers", [0, 2])
+def test_one_row_per_payment(n_workers):
+    payments = calculate_payments(np.array(BALANCES), np.array(RATES), np.array(TERMS))
+    schedule = select_engine("cents_exact").schedules(BALANCES, RATES, payments)
+    stats = export_schedules("book", BALANCES, RATES, payments, loan_ids=[907, 12, 450, 33, 5],
+                             engine="cents_exact", chunk_loans=2, n_workers=n_workers, root="exports")
+
+    df = pd.read_csv(stats.path)
+    assert tuple(df.columns) == EXPORT_COLUMNS
+    assert len(df) == stats.n_rows == schedule.num_periods.sum()
+    assert stats.n_loans == len(BALANCES)
+
+    #Chunks are written in order, and every loan keeps its own schedule:
+    assert df["Loan"].unique().tolist() == [907, 12, 450, 33, 5]
+    for index, (_, rows) in enumerate(df.groupby("Loan", sort=False)):
+        payment, principal, interest, balance = schedule.loan(index)
+        assert rows["Pmt #"].tolist() == list(range(1, len(payment) + 1))
+        np.testing.assert_allclose(rows["Payment_amount"], payment, atol=0.005)
+        np.testing.assert_allclose(rows["Remaining_balance"], balance, atol=0.005)
@@ -0,0 +1,48 @@
+from debt_repayment.amortization_table.history import ScenarioHistory
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.tools.payments_utils import calculate_payments
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def table():
+    table = AmortizationTable("test", 30_000, 5, 120, calculate_payments(30_000, 5, 120))
+    table.create_table()
+    return table
+
+
+def _history(table, max_versions=50):
+    return ScenarioHistory(table.loan_balance, table.interest_rate, table.monthly_payments,
+                           table.amortization_df, max_versions=max_versions)
+
+
+def test_trimmed_history_keeps_the_base(table):
+    trimmed, full = _history(table, max_versions=3), _history(table)
+    for month in range(1, 6):
+        for history in (trimmed, full):
+            history.apply(extra_payment=10, start_month=month)
+
+    assert len(trimmed.versions) == 3
+    assert trimmed.base.label == "Base schedule"
+    np.testing.assert_array_equal(trimmed.base.column("balance"), table.amortization_df["Remaining_balance"])
+    assert trimmed.total_interest(trimmed.base) == pytest.approx(table.amortization_df["Interest_paid"].sum())
+    for name in ("payment", "principal", "interest", "balance"):
+        np.testing.assert_array_equal(trimmed.current.column(name), full.current.column(name))
+
+    trimmed.undo()
+    np.testing.assert_array_equal(trimmed.current.column("balance"), full.versions[4].column("balance"))
+    trimmed.undo()
+    assert trimmed.current is trimmed.base
+
+
+def test_negative_extra_payments_are_rejected(table):
+    history = _history(table)
+    with pytest.raises(ValueError):
+        history.apply(extra_payment=-50)
+    assert len(history.versions) == 1
+
+
+def test_history_needs_room_for_a_change(table):
+    with pytest.raises(ValueError):
+        _history(table, max_versions=1)
@@ -0,0 +1,35 @@
+from benchmarks import profile_memory
+from debt_repayment.analysis.portfolio import book_cash_flows
+from debt_repayment.storage.export import export_schedules
+from debt_repayment.tools import memory_profiler
+from debt_repayment.tools.constants import MEMORY_REPORT_DIR
+import os
+import pytest
+
+
+def _book():
+    return book_cash_flows([10_000, 20_000], [5, 6], 24, ["2026-01-01", "2026-03-15"])
+
+
+def _export():
+    return export_schedules("profiled", [10_000, 20_000], [5, 6], [450, 900], n_workers=0, root="exports")
+
+
+@pytest.mark.parametrize("run", [_book, _export])
+def test_batch_runs_write_a_report_when_profiling(run, monkeypatch):
+    monkeypatch.setattr(memory_profiler, "MEMORY_PROFILING", True)
+    run()
+    reports = list(MEMORY_REPORT_DIR.glob("memory_*.txt"))
+    assert len(reports) == 1
+    assert "Stage: " in reports[0].read_text()
+
+
+@pytest.mark.parametrize("run", [_book, _export])
+def test_batch_runs_are_not_profiled_by_default(run):
+    run()
+    assert not MEMORY_REPORT_DIR.exists()
+
+
+def test_profile_memory_restores_the_working_directory(tmp_path):
+    profile_memory.main(n_tables=2, n_loans=10, n_months=12, budget_mb=None, seed=0)
+    assert os.getcwd() == str(tmp_path)
@@ -0,0 +1,23 @@
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.analysis.monte_carlo import simulate_payoff
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("lump_sum", [10_000, 12_000])
+def test_lump_sum_covering_the_balance_pays_off_at_month_zero(lump_sum):
+    result = simulate_payoff(10_000, 5, 200, lump_sum=lump_sum, extra_payment=50, extra_payment_std=20,
+                             n_paths=100, seed=1)
+    assert (result.payoff_months == 0).all()
+    assert (result.total_interest == 0).all()
+    assert result.unpaid == 0
+    assert result.payoff_percentiles[50] == 0
+
+
+def test_payoff_without_extra_payments_matches_the_table():
+    table = AmortizationTable("test", 10_000, 5, 120, 200)
+    table.create_table()
+    result = simulate_payoff(10_000, 5, 200, n_paths=10, seed=1)
+    np.testing.assert_array_equal(result.payoff_months, len(table.amortization_df))
+    np.testing.assert_allclose(result.total_interest, table.amortization_df["Interest_paid"].sum())
+    assert result.unpaid == 0
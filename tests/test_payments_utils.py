@@ -0,0 +1,103 @@
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.tools.constants import PAYMENT_FREQUENCIES
+from debt_repayment.tools.payments_utils import (affordable_balance, calculate_payments, calculate_total_interest,
+                                                 implied_rate, minimum_duration, periodic_rate)
+import numpy as np
+import pytest
+
+
+YEARS = 10
+PER_YEAR = {frequency: periods for frequency, (_, periods) in PAYMENT_FREQUENCIES.items()}
+
+
+@pytest.mark.parametrize("frequency", PAYMENT_FREQUENCIES)
+def test_periodic_rate(frequency):
+    assert periodic_rate(6, frequency) == pytest.approx(0.06 / PER_YEAR[frequency])
+
+
+def test_unknown_frequency_is_rejected():
+    with pytest.raises(ValueError):
+        periodic_rate(6, "quarterly")
+
+
+@pytest.mark.parametrize("frequency", PAYMENT_FREQUENCIES)
+def test_payments_reconcile_with_the_monthly_schedule(frequency):
+    n_periods = YEARS * PER_YEAR[frequency]
+    monthly = calculate_payments(30_000, 5, YEARS * 12)
+    payment = calculate_payments(30_000, 5, n_periods, frequency)
+
+    #A year of payments is within a percent of twelve monthly ones, and never more:
+    yearly = payment * PER_YEAR[frequency]
+    assert yearly <= monthly * 12 + 0.01 * PER_YEAR[frequency]
+    assert yearly == pytest.approx(monthly * 12, rel=0.01)
+
+    #Without interest the payments split the amount over the same years exactly:
+    assert calculate_payments(30_000, 0, n_periods, frequency) == round(30_000 / n_periods, 2)
+
+
+def test_more_frequent_payments_pay_less_interest():
+    interest = [calculate_total_interest(30_000, 5, YEARS * PER_YEAR[frequency], frequency)
+                for frequency in sorted(PAYMENT_FREQUENCIES, key=PER_YEAR.get)]
+    assert (np.diff(interest) < 0).all()
+
+
+@pytest.mark.parametrize("frequency", PAYMENT_FREQUENCIES)
+def test_table_has_one_row_per_period(frequency):
+    n_periods = YEARS * PER_YEAR[frequency]
+    table = AmortizationTable("test", 30_000, 5, n_periods, calculate_payments(30_000, 5, n_periods, frequency),
+                              frequency=frequency)
+    df = table.amortization_df
+    assert abs(len(df) - n_periods) <= 1
+    assert df["Remaining_balance"].iloc[-1] == 0
+    assert df["Principal_paid"].sum() - df["Interest_paid"].iloc[-1] == pytest.approx(30_000, abs=0.01)
+    assert df["Interest_paid"].iloc[0] == round(30_000 * periodic_rate(5, frequency), 2)
+    spacing = np.diff(df["Due date"].dt.tz_localize(None).to_numpy()).astype("timedelta64[D]").astype(int)
+    assert spacing.mean() == pytest.approx(365.25 / PER_YEAR[frequency], rel=0.02)
+
+
+@pytest.mark.parametrize("frequency", PAYMENT_FREQUENCIES)
+def test_implied_rate_recovers_the_rate(frequency):
+    rates = np.array([0.5, 3, 6.25, 12, 24])
+    durations = np.array([12, 60, 120, 360, 36])
+    payments = calculate_payments(30_000, rates, durations, frequency)
+    #Payments are rounded to cents, which moves the rate by less than a thousandth of a point:
+    implied, converged = implied_rate(30_000, payments, durations, frequency)
+    assert converged.all()
+    np.testing.assert_allclose(implied, rates, atol=1e-3)
+
+
+def test_implied_rate_of_unsolvable_loans():
+    implied, converged = implied_rate([12_000, 12_000, 0], [1_000, 900, 100], [12, 12, 12])
+    assert implied[0] == 0 and converged[0]
+    assert np.isnan(implied[1:]).all() and not converged[1:].any()
+
+
+@pytest.mark.parametrize("frequency", PAYMENT_FREQUENCIES)
+def test_affordable_balance_recovers_the_balance(frequency):
+    rates = np.array([0, 3, 6.25, 12, 24])
+    durations = np.array([12, 60, 120, 360, 36])
+    payments = calculate_payments(30_000, rates, durations, frequency)
+    #Rounding the payment to cents moves the balance by at most half a cent a payment:
+    balances = affordable_balance(payments, rates, durations, frequency)
+    assert (np.abs(balances - 30_000) <= 0.005 * durations + 0.01).all()
+
+
+@pytest.mark.parametrize("amount, rate, payment, expected", [
+    #$1,000 at 0% with $100 payments takes exactly 10; with $99 the 11th payment is $10:
+    (1_000, 0, 100, 10),
+    (1_000, 0, 99, 11),
+    #12% on $10,000 with the 12-month payment of $888.49 takes 12; $800 takes 14:
+    (10_000, 12, 888.49, 12),
+    (10_000, 12, 800, 14),
+    #A payment that only covers the interest never repays the loan:
+    (10_000, 12, 100, np.inf),
+])
+def test_minimum_duration_checked_by_hand(amount, rate, payment, expected):
+    assert minimum_duration(amount, rate, payment) == expected
+
+
+@pytest.mark.parametrize("amount, rate, duration", [(30_000, 5, 120), (10_000, 12, 14), (250_000, 6.5, 360)])
+def test_minimum_duration_matches_the_table(amount, rate, duration):
+    payment = calculate_payments(amount, rate, duration)
+    table = AmortizationTable("test", amount, rate, duration, payment)
+    assert minimum_duration(amount, rate, payment) == len(table.amortization_df)
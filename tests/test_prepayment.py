@@ -0,0 +1,40 @@
+from debt_repayment.analysis.prepayment import project_pools, psa_cpr, smm_from_cpr
+from debt_repayment.amortization_table.batch import amortize
+import numpy as np
+import pytest
+
+
+def test_psa_100_reaches_6_percent_at_month_30():
+    cpr = psa_cpr(100, 60)[0, 0]
+    #0.2% a month for the first 30 months, then flat at 6%:
+    np.testing.assert_allclose(cpr[:30], 0.2 * np.arange(1, 31))
+    np.testing.assert_allclose(cpr[29:], 6.0)
+
+
+def test_psa_scales_with_speed_and_age():
+    cpr = psa_cpr([50, 100, 200], 12, ages=[0, 24])
+    assert cpr.shape == (3, 2, 12)
+    np.testing.assert_allclose(cpr[2], 2 * cpr[1])
+    np.testing.assert_allclose(cpr[0], cpr[1] / 2)
+    #Pools 24 months old start at month 25 of the ramp and are flat from their 6th month:
+    np.testing.assert_allclose(cpr[1, 1, :6], 0.2 * np.arange(25, 31))
+    np.testing.assert_allclose(cpr[1, 1, 5:], 6.0)
+
+
+def test_smm_compounds_back_to_the_cpr():
+    smm = smm_from_cpr([0, 6, 100])
+    np.testing.assert_allclose(1 - (1 - smm) ** 12, [0, 0.06, 1])
+    assert smm[1] == pytest.approx(0.005143, abs=1e-6)
+
+
+def test_projection_without_prepayments_is_the_contract():
+    contract = amortize([100_000], [6], [360])
+    projection = project_pools([100_000], [6], [360], [0, 6])
+    np.testing.assert_allclose(projection.balance[0, 0], contract.balance[0])
+    assert (projection.prepaid_principal[0] == 0).all()
+
+    #Prepayments return the principal sooner, so less interest is paid:
+    totals = projection.totals()
+    principal = totals[:, :, 0].sum(axis=1) + totals[:, :, 1].sum(axis=1)
+    np.testing.assert_allclose(principal, 100_000)
+    assert totals[1, :, 2].sum() < totals[0, :, 2].sum()
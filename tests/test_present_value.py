@@ -0,0 +1,49 @@
+from debt_repayment.amortization_table.history import ScenarioHistory
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.analysis.present_value import cost_scenarios, present_values, combined_rates, table_cash_flows
+from debt_repayment.tools.payments_utils import calculate_payments
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def table():
+    table = AmortizationTable("test", 30_000, 5, 120, calculate_payments(30_000, 5, 120))
+    table.create_table()
+    return table
+
+
+def test_combined_rates():
+    np.testing.assert_allclose(combined_rates([0, 5], [0, 2, 5]), [[0, 2, 5], [5, 7.1, 10.25]])
+
+
+def test_every_pair_of_rates_is_one_scenario(table):
+    paid, balance = table_cash_flows(table.amortization_df)
+    costs = cost_scenarios(paid, balance, discount_rates=(0, 3, 7), inflation_rates=(0, 3))
+
+    assert len(costs) == 6
+    assert not costs.duplicated(["Discount_rate", "Inflation_rate"]).any()
+    nominal = costs[costs["Inflation_rate"] == 0]
+    np.testing.assert_allclose(nominal["Present_value"], np.round(present_values(paid, [0, 3, 7]), 2))
+    assert costs.loc[(costs["Discount_rate"] == 3) & (costs["Inflation_rate"] == 3), "Combined_rate"].item() == 6.09
+    assert nominal["Cost"].iloc[0] == pytest.approx(table.amortization_df["Interest_paid"].sum(), abs=0.01)
+
+    #Fixed payments are worth less in today's dollars the higher the inflation:
+    for _, scenario in costs.groupby("Discount_rate"):
+        assert (np.diff(scenario["Present_value"]) < 0).all()
+    assert (costs["Present_value"] <= paid.sum()).all()
+
+
+def test_table_cash_flows_take_the_balance_from_the_table(table):
+    paid, balance = table_cash_flows(table.amortization_df)
+    assert balance == pytest.approx(30_000)
+    assert paid.sum() == pytest.approx(30_000 + table.amortization_df["Interest_paid"].sum())
+
+    history = ScenarioHistory(table.loan_balance, table.interest_rate, table.monthly_payments,
+                              table.amortization_df)
+    history.apply(lump_sum=5_000, start_month=12)
+    df = history.to_frame()
+    paid, balance = table_cash_flows(df)
+    assert balance == pytest.approx(30_000)
+    assert paid[11] == pytest.approx(5_000 + table.monthly_payments, abs=0.01)
+    assert paid.sum() == pytest.approx(30_000 + df["Interest_paid"].sum())
@@ -0,0 +1,28 @@
+from debt_repayment.analysis.refinance import compare_refinance
+import numpy as np
+import pytest
+
+
+def test_break_even_month_checked_by_hand():
+    #12% on $10,000 over 12 months pays $888.49 a month. Interest is $100.00 in month 1 and
+    #$92.12 in month 2 on the remaining $9,211.51, so a 0% offer with a $150 fee breaks even in month 2:
+    comparison = compare_refinance(10_000, 12, 12, [0], [12], [150])
+    np.testing.assert_allclose(comparison.current_cost[:2], [100.00, 192.12], atol=0.01)
+    np.testing.assert_allclose(comparison.offer_costs[0], 150)
+    assert comparison.break_even_month[0] == 2
+    assert comparison.monthly_payments[0] == 833.33
+    assert comparison.lifetime_savings[0] == pytest.approx(comparison.current_cost[-1] - 150)
+
+
+@pytest.mark.parametrize("rate, term", [(15, 12), (6, 60)])
+def test_offers_that_never_break_even(rate, term):
+    #A higher rate always costs more; a longer term is cheaper at first but costs more in the end:
+    comparison = compare_refinance(10_000, 12, 12, [rate], [term])
+    assert comparison.break_even_month[0] == -1
+    assert comparison.lifetime_savings[0] < 0
+
+
+def test_ranking_sorts_by_lifetime_savings():
+    ranking = compare_refinance(10_000, 12, 12, [15, 0, 6], [12, 12, 12], [0, 150, 0]).ranking()
+    assert ranking["Offer"].tolist() == [1, 2, 0]
+    assert ranking["Break_even_month"].tolist()[-1] == -1
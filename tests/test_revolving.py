@@ -0,0 +1,36 @@
+from debt_repayment.amortization_table.revolving import revolving_schedules, revolving_table
+import numpy as np
+import pytest
+
+
+def test_interest_free_card_pays_the_floor():
+    #1% of $1,000 is $10, below the $25 floor, so the card is paid off in 40 months:
+    df = revolving_table(1_000, 0)
+    assert len(df) == 40
+    assert (df["Payment_amount"] == 25).all()
+    assert df["Remaining_balance"].iloc[-1] == 0
+
+
+def test_fixed_payment_checked_by_hand():
+    #$1,000 at 12% with $100 a month: interest is $10.00 in month 1 and $9.10 in month 2,
+    #and log(1 / (1 - 0.01 * 10)) / log(1.01) = 10.6, so the 11th payment clears it:
+    df = revolving_table(1_000, 12, fixed_payment=100)
+    assert len(df) == 11
+    np.testing.assert_allclose(df["Interest_paid"][:2], [10.00, 9.10])
+    assert df["Payment_amount"].iloc[-1] < 100
+    assert df["Principal_paid"].sum() == pytest.approx(1_000)
+
+
+def test_minimum_payments_take_longer_than_fixed_ones():
+    schedule, paid_off = revolving_schedules([5_000, 5_000, 5_000], 18, fixed_payments=[np.nan, 150, 250])
+    assert paid_off.all()
+    assert schedule.num_periods[0] > schedule.num_periods[1] > schedule.num_periods[2]
+    assert (schedule.interest.sum(axis=1)[:-1] > schedule.interest.sum(axis=1)[1:]).all()
+
+
+def test_cards_that_are_never_paid_off():
+    #Charges larger than the payment keep the balance growing until max_months:
+    schedule, paid_off = revolving_schedules([1_000, 0], 12, charges=[200, 0], max_months=24)
+    assert not paid_off[0] and paid_off[1]
+    assert schedule.num_periods.tolist() == [24, 0]
+    assert (np.diff(schedule.balance[0]) > 0).all()
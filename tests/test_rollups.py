@@ -0,0 +1,49 @@
+from debt_repayment.amortization_table.batch import amortize
+from debt_repayment.amortization_table.dates import due_dates
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.analysis.rollups import yearly_rollups, table_rollup
+from debt_repayment.tools.payments_utils import calculate_payments
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _table(schedule, start, frequency):
+    """Table of the first loan of a schedule with its real due dates."""
+    payment, principal, interest, balance = schedule.loan(0)
+    return pd.DataFrame({
+        "Due date": due_dates(start, len(payment), frequency),
+        "Payment_amount": payment,
+        "Principal_paid": principal,
+        "Interest_paid": interest,
+        "Remaining_balance": balance
+    })
+
+
+@pytest.mark.parametrize("frequency", ["monthly", "semi-monthly", "biweekly", "weekly"])
+@pytest.mark.parametrize("start", [datetime.date(2026, 12, 15), datetime.date(2027, 1, 1), datetime.date(2024, 2, 29)])
+@pytest.mark.parametrize("fiscal_start", [1, 10])
+def test_yearly_rollups_match_table_rollup(frequency, start, fiscal_start):
+    schedule = amortize(12_000, 6, 24, frequency)
+    batch = yearly_rollups(schedule, [start], frequency, fiscal_start).loan(0)
+    table = table_rollup(_table(schedule, start, frequency), fiscal_start)
+    pd.testing.assert_frame_equal(batch, table)
+
+
+def test_first_payment_after_start_month():
+    schedule = amortize(12_000, 6, 24)
+    rollup = yearly_rollups(schedule, [datetime.date(2026, 12, 15)]).loan(0)
+    assert list(rollup.index) == [2027, 2028]
+    assert rollup["Remaining_balance"].iloc[-1] == pytest.approx(0)
+
+
+def test_table_rollup_of_amortization_table():
+    payment = calculate_payments(100_000, 6, 120)
+    table = AmortizationTable("test", 100_000, 6, 120, payment)
+    start = table.amortization_df["Due date"].iloc[0].date()
+
+    rollup = table_rollup(table.amortization_df)
+    assert rollup["Interest_paid"].sum() == pytest.approx(table.amortization_df["Interest_paid"].sum())
+    assert rollup.index[0] == start.year
+    assert rollup["Payment_amount"].sum() == pytest.approx(table.amortization_df["Payment_amount"].sum())
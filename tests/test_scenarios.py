@@ -0,0 +1,45 @@
+from debt_repayment.amortization_table.constants import FORBEARANCE
+from debt_repayment.amortization_table.deferment import payment_status
+from debt_repayment.amortization_table.scenarios import compare_scenarios
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.tools.payments_utils import calculate_payments
+import numpy as np
+import pytest
+
+
+def _table(**kwargs):
+    table = AmortizationTable("test", 30_000, 5, 120, calculate_payments(30_000, 5, 120), **kwargs)
+    table.create_table()
+    return table
+
+
+def test_scenarios_match_update_payments():
+    lump_sums, extra_payments = [0, 0, 5_000, 12_345.67], [0, 100, 0, 37.5]
+    scenarios = compare_scenarios(_table(), lump_sums, extra_payments)
+
+    for lump_sum, extra_payment, row in zip(lump_sums, extra_payments, scenarios.itertuples()):
+        table = _table()
+        table.update_payments(lump_sum, extra_payment)
+        assert row.Months == len(table.amortization_df)
+        assert row.Total_interest == pytest.approx(table.amortization_df["Interest_paid"].sum(), abs=0.005)
+    assert scenarios["Months_saved"].iloc[0] == 0
+    assert scenarios["Interest_saved"].iloc[0] == 0
+
+
+def test_grid_takes_every_combination():
+    scenarios = compare_scenarios(_table(), [0, 1_000], [0, 50, 100], grid=True)
+    assert len(scenarios) == 6
+    assert (np.diff(scenarios["Months"].to_numpy().reshape(2, 3), axis=1) <= 0).all()
+
+
+@pytest.mark.parametrize("lump_sums, extra_payments", [([40_000], [0]), ([30_000], [0]), ([-1], [0]),
+                                                        ([0, 40_000], [0, 0]), ([0], [-10])])
+def test_invalid_scenarios_are_rejected(lump_sums, extra_payments):
+    with pytest.raises(ValueError):
+        compare_scenarios(_table(), lump_sums, extra_payments)
+
+
+def test_tables_with_payment_holidays_are_rejected():
+    status = payment_status(120, [[13]], [[12]], [[FORBEARANCE]])[0]
+    with pytest.raises(ValueError):
+        compare_scenarios(_table(payment_status=status), [0], [0])
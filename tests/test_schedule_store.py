@@ -0,0 +1,51 @@
+from debt_repayment.amortization_table.batch import amortize
+from debt_repayment.storage.schedule_store import ScheduleStore, ScheduleStoreWriter, save_schedules
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def schedule():
+    return amortize([10_000, 25_000, 5_000, 40_000], [5, 0, 7.5, 3], [12, 36, 6, 60])
+
+
+def _loan(schedule, index):
+    return dict(zip(("payment", "principal", "interest", "balance"), schedule.loan(index)))
+
+
+def test_save_and_load_round_trip(schedule):
+    loan_ids = [907, 12, 450, 33]
+    save_schedules("book", schedule, loan_ids, root="stores")
+    store = ScheduleStore("book", root="stores")
+
+    assert len(store) == 4
+    np.testing.assert_array_equal(np.diff(store.offsets), schedule.num_periods)
+    for position, loan_id in enumerate(loan_ids):
+        assert loan_id in store
+        for rows in (store.get(loan_id), store.rows(position)):
+            for column, values in _loan(schedule, position).items():
+                np.testing.assert_array_equal(rows[column], values)
+
+
+def test_random_access_to_a_single_loan(schedule):
+    save_schedules("book", schedule, root="stores")
+    store = ScheduleStore("book", root="stores")
+    rows = store.get(2)
+
+    assert len(rows["balance"]) == 6
+    assert isinstance(rows["balance"], np.memmap)
+    assert rows["balance"][-1] == pytest.approx(0)
+    assert 4 not in store
+    with pytest.raises(KeyError):
+        store.get(4)
+
+
+def test_writer_fills_the_store_chunk_by_chunk(schedule):
+    first, second = amortize([10_000, 25_000], [5, 0], [12, 36]), amortize([5_000, 40_000], [7.5, 3], [6, 60])
+    with ScheduleStoreWriter("chunked", schedule.num_periods, root="stores") as writer:
+        writer.write(2, second)
+        writer.write(0, first)
+
+    store = ScheduleStore("chunked", root="stores")
+    for position in range(4):
+        np.testing.assert_array_equal(store.rows(position)["interest"], _loan(schedule, position)["interest"])
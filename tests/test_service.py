@@ -0,0 +1,72 @@
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.service.load_generator import _read_response
+from debt_repayment.service.server import PaymentServer
+from debt_repayment.tools.payments_utils import calculate_payments
+import asyncio
+import json
+import numpy as np
+import pytest
+
+
+LOAN = {"loan_balance": 30000.0, "interest_rate": 4.3, "num_months": 120}
+
+
+async def _exchange(requests):
+    """Sends raw requests to a PaymentServer on one connection and returns the (status, body) responses."""
+    service = PaymentServer("127.0.0.1", 0, max_workers=1)
+    server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        responses = []
+        for request in requests:
+            writer.write(request)
+            await writer.drain()
+            responses.append(await _read_response(reader))
+        writer.close()
+        return responses
+    finally:
+        server.close()
+        await server.wait_closed()
+        service.executor.shutdown()
+
+
+def _post(path, body, headers=""):
+    content = body if isinstance(body, bytes) else json.dumps(body).encode()
+    return (f"POST {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(content)}\r\n{headers}\r\n".encode()
+            + content)
+
+
+def test_payments_and_schedule_round_trip():
+    (payments_status, payments), (schedule_status, schedule) = asyncio.run(_exchange([
+        _post("/payments", LOAN), _post("/schedule", LOAN, "Connection: close\r\n")
+    ]))
+
+    assert payments_status == schedule_status == 200
+    metrics = json.loads(payments)
+    assert metrics["monthly_payment"] == pytest.approx(calculate_payments(30000.0, 4.3, 120))
+
+    rows = json.loads(schedule)
+    table = AmortizationTable("test", 30000.0, 4.3, 120, metrics["monthly_payment"])
+    table.create_table()
+    assert len(rows) == len(table.amortization_df)
+    for column in ("Principal_paid", "Interest_paid", "Remaining_balance"):
+        np.testing.assert_allclose([row[column] for row in rows], table.amortization_df[column], atol=0.005)
+
+
+@pytest.mark.parametrize("request_bytes", [
+    _post("/payments", {"loan_balance": 30000.0, "interest_rate": 4.3}),
+    _post("/payments", {**LOAN, "num_months": 0}),
+    _post("/schedule", b"{not json"),
+    _post("/payments", b"[1, 2]"),
+    b"POST /payments HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+])
+def test_bad_requests_get_400(request_bytes):
+    [(status, body)] = asyncio.run(_exchange([request_bytes]))
+    assert status == 400
+    assert "error" in json.loads(body)
+
+
+def test_zero_rate_loans_are_served():
+    [(status, body)] = asyncio.run(_exchange([_post("/payments", {**LOAN, "interest_rate": 0})]))
+    assert status == 200
+    assert json.loads(body)["monthly_payment"] == 250
@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+from debt_repayment.amortization_table.batch import amortize
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.storage.sqlite_store import TableCatalog
+import datetime
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def catalog():
+    with TableCatalog("catalog/tables.db") as catalog:
+        yield catalog
+
+
+def test_save_and_load_table(catalog):
+    table = AmortizationTable("Car", 20_000, 6, 48, 469.70)
+    loan_id = catalog.save_table(table)
+    df = catalog.load_table(loan_id)
+
+    columns = ["Pmt #", "Payment_amount", "Principal_paid", "Interest_paid", "Remaining_balance"]
+    np.testing.assert_array_equal(df[columns].to_numpy(), table.amortization_df[columns].to_numpy(dtype=float))
+    assert (df["Due date"] == table.amortization_df["Due date"]).all()
+    [loan] = catalog.find(loan_type="Car")
+    assert (loan["id"], loan["loan_balance"], loan["num_months"]) == (loan_id, 20_000, 48)
+
+
+def test_save_batch_and_load_a_single_loan(catalog):
+    schedule = amortize([10_000, 25_000, 5_000], [5, 0, 7.5], [12, 36, 6])
+    ids = catalog.save_batch(["A", "B", "C"], [10_000, 25_000, 5_000], [5, 0, 7.5], schedule,
+                             start=datetime.date(2026, 1, 1))
+
+    df = catalog.load_table(ids[1])
+    assert len(df) == 36
+    np.testing.assert_allclose(df["Remaining_balance"], np.round(schedule.loan(1)[3], 2))
+    assert df["Due date"].iloc[0].strftime("%Y-%m-%d") == "2026-01-01"
+    assert [loan["id"] for loan in catalog.find(min_rate=5)] == [ids[2], ids[0]]
+    with pytest.raises(KeyError):
+        catalog.load_table(ids[-1] + 1)
+
+
+def test_concurrent_writes_get_distinct_ids(catalog):
+    schedule = amortize([10_000], [5], [12])
+    with ThreadPoolExecutor(8) as executor:
+        ids = list(executor.map(lambda _: int(catalog.save_batch("T", 10_000, 5, schedule)[0]), range(40)))
+    assert sorted(ids) == list(range(1, 41))
+    assert len(catalog.find(loan_type="T")) == 40
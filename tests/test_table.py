@@ -0,0 +1,63 @@
+from debt_repayment.amortization_table.constants import DEFERMENT, FORBEARANCE, INTEREST_ONLY
+from debt_repayment.amortization_table.deferment import payment_status
+from debt_repayment.amortization_table.table import AmortizationTable
+from debt_repayment.tools.payments_utils import calculate_payments
+import numpy as np
+import pytest
+
+
+RATE_PATH = np.r_[np.full(24, 5.0), np.full(36, 7.0), np.full(60, 6.0)]
+
+
+def _check_balances(df, balance):
+    """Every payment but the last reduces the balance by its principal."""
+    previous = np.r_[balance, df["Remaining_balance"].to_numpy()[:-1]]
+    np.testing.assert_allclose((previous - df["Principal_paid"])[:-1], df["Remaining_balance"][:-1], atol=1e-9)
+    assert df["Remaining_balance"].iloc[-1] == 0
+
+
+def test_update_payments_keeps_fixed_rate_behavior():
+    table = AmortizationTable("test", 30_000, 5, 120, calculate_payments(30_000, 5, 120))
+    table.update_payments(1_000, 100)
+    df = table.amortization_df
+    assert len(df) == table.num_months < 120
+    assert (df["Payment_amount"].iloc[:-1] == table.monthly_payments).all()
+    _check_balances(df, 29_000)
+
+
+def test_update_payments_with_rate_path_keeps_the_new_payment():
+    payment = calculate_payments(30_000, 5, 120)
+    table = AmortizationTable("test", 30_000, 5, 120, payment, rate_path=RATE_PATH)
+    table.update_payments(0, 100)
+    df = table.amortization_df
+
+    assert table.monthly_payments == pytest.approx(payment + 100)
+    np.testing.assert_allclose(df["Payment_amount"].iloc[:-1], payment + 100)
+    assert len(df) < 120
+    assert df["Interest_paid"].iloc[30] == round(df["Remaining_balance"].iloc[29] * 7 / 1200, 2)
+    _check_balances(df, 30_000)
+
+
+def test_update_payments_with_payment_status_applies_the_holidays():
+    status = payment_status(120, [[1, 30, 50]], [[6, 4, 3]], [[DEFERMENT, FORBEARANCE, INTEREST_ONLY]])[0]
+    payment = calculate_payments(30_000, 5, 114)
+    table = AmortizationTable("test", 30_000, 5, 120, payment, payment_status=status)
+    table.create_table()
+    table.update_payments(1_000, 50)
+    df = table.amortization_df
+
+    assert (df["Payment_amount"].iloc[:6] == 0).all() and (df["Remaining_balance"].iloc[:6] == 29_000).all()
+    forborne = df["Remaining_balance"].iloc[28]
+    assert (df["Payment_amount"].iloc[29:33] == 0).all()
+    assert df["Remaining_balance"].iloc[32] == round(forborne + 4 * round(forborne * 5 / 1200, 2), 2)
+    np.testing.assert_allclose(df["Payment_amount"].iloc[49:52], df["Interest_paid"].iloc[49:52])
+    np.testing.assert_allclose(df["Payment_amount"].iloc[52:-1], payment + 50)
+    assert len(df) == table.num_months < 120
+    assert df["Remaining_balance"].iloc[-1] == 0
+
+
+def test_update_payments_rejects_payments_below_the_interest():
+    table = AmortizationTable("test", 30_000, 5, 120, calculate_payments(30_000, 5, 120),
+                              rate_path=np.r_[5, np.full(10, 30.0)])
+    with pytest.raises(ValueError):
+        table.update_payments(0, -200)